@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Azure Client Reuse Benchmark
+
+Measures Text Analytics call latency when a new credential and client are
+built for every call (the old analyze_sentiment behaviour) versus reusing
+the shared objects from examples/azure_clients.py.
+
+Usage:
+    export AZURE_TEXT_ANALYTICS_ENDPOINT="https://your-resource.cognitiveservices.azure.com/"
+    python benchmarks/bench_azure_client_reuse.py --calls 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'examples'))
+
+import azure_clients
+
+
+DOCUMENTS = ["I love working with Azure AI services! They're amazing."]
+
+
+def fresh_client(endpoint: str, key: str):
+    """Build a client from scratch, as analyze_sentiment used to."""
+    from azure.ai.textanalytics import TextAnalyticsClient
+
+    if key:
+        from azure.core.credentials import AzureKeyCredential
+        credential = AzureKeyCredential(key)
+    else:
+        from azure.identity import DefaultAzureCredential
+        credential = DefaultAzureCredential()
+    return TextAnalyticsClient(endpoint=endpoint, credential=credential)
+
+
+def measure(get_client, calls: int) -> list:
+    """Return the latency in milliseconds of each call, client setup included."""
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        get_client().analyze_sentiment(documents=DOCUMENTS)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies: list) -> None:
+    later = latencies[1:] or latencies
+    print(f"{label:<8} first: {latencies[0]:8.1f} ms   later (median): {statistics.median(later):8.1f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Azure client reuse")
+    parser.add_argument('--endpoint', default=os.getenv("AZURE_TEXT_ANALYTICS_ENDPOINT"))
+    parser.add_argument('--key', default=os.getenv("AZURE_TEXT_ANALYTICS_KEY"))
+    parser.add_argument('--calls', type=int, default=5)
+    args = parser.parse_args()
+
+    if not args.endpoint:
+        print("⚠️  Set AZURE_TEXT_ANALYTICS_ENDPOINT or pass --endpoint")
+        return 1
+
+    fresh = measure(lambda: fresh_client(args.endpoint, args.key), args.calls)
+    azure_clients.reset()
+    shared = measure(lambda: azure_clients.get_text_analytics_client(args.endpoint, args.key), args.calls)
+
+    print(f"Text Analytics latency over {args.calls} calls")
+    print("-" * 60)
+    summarize("fresh", fresh)
+    summarize("shared", shared)
+    saved = statistics.median(fresh[1:] or fresh) - statistics.median(shared[1:] or shared)
+    print(f"\nSaved per call after the first: {saved:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
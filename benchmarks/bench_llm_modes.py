@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+LLM Client Mode Benchmark
+
+Compares per-prompt latency of the in-process llm client against one `llm`
+process per prompt, using a local stub model so no API calls are made.
+
+The stub CLI is a bare Python script, so the CLI numbers are a lower bound:
+the real `llm` CLI also pays for plugin discovery and key loading on every
+start.
+
+Usage:
+    python benchmarks/bench_llm_modes.py --prompts 20
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'examples'))
+
+from llm_example import LLMClient
+
+
+STUB_CLI = """#!{python}
+import sys
+print("stub reply to: " + sys.argv[-1])
+"""
+
+
+class StubResponse:
+    def __init__(self, text: str):
+        self._text = text
+
+    def text(self) -> str:
+        return self._text
+
+
+class StubModel:
+    """Local stand-in for an llm model object."""
+
+    def prompt(self, prompt: str, system: str = None) -> StubResponse:
+        return StubResponse(f"stub reply to: {prompt}")
+
+
+def measure(client: LLMClient, prompts: int) -> list:
+    """Return the latency in milliseconds of each prompt."""
+    latencies = []
+    for index in range(prompts):
+        start = time.perf_counter()
+        client.prompt(f"prompt {index}", system="You are a stub")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies: list) -> None:
+    print(f"{label:<12} first: {latencies[0]:8.2f} ms   "
+          f"median: {statistics.median(latencies):8.2f} ms   "
+          f"mean: {statistics.mean(latencies):8.2f} ms")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark llm client modes")
+    parser.add_argument('--prompts', type=int, default=20, help="prompts per mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stub_cli = Path(tmp) / 'llm'
+        stub_cli.write_text(STUB_CLI.format(python=sys.executable))
+        stub_cli.chmod(0o755)
+
+        in_process = LLMClient(mode="python", model_loader=lambda name: StubModel())
+        subprocess_mode = LLMClient(mode="cli", executable=str(stub_cli))
+
+        print(f"Per-prompt latency over {args.prompts} prompts (stub model)")
+        print("-" * 70)
+        summarize("in-process", measure(in_process, args.prompts))
+        summarize("subprocess", measure(subprocess_mode, args.prompts))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+RAG Splitter Memory Benchmark
+
+Measures peak Python memory while chunking a generated text file, loading
+it whole (read_text + split_text) versus streaming it (iter_chunks). The
+streaming peak should stay flat as the file grows.
+
+Usage:
+    python benchmarks/bench_rag_splitter.py --sizes 1 8 32
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'examples'))
+
+from rag_pipeline import iter_chunks, split_text
+
+
+PARAGRAPH = ("Azure AI services expose sentiment analysis, language detection and "
+             "key phrase extraction behind one endpoint. ") * 6 + "\n\n"
+
+
+def write_corpus(path: Path, megabytes: int) -> None:
+    with open(path, 'w', encoding='utf-8') as stream:
+        for _ in range(megabytes * 1024 * 1024 // len(PARAGRAPH)):
+            stream.write(PARAGRAPH)
+
+
+def measure(func) -> tuple:
+    """Return (chunks, peak MiB, seconds) for func()."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, peak / (1024 * 1024), elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark RAG splitter memory")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 8, 32], help="file sizes in MiB")
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'mode':<8} {'chunks':>8} {'peak MiB':>9} {'seconds':>8}")
+    print("-" * 44)
+    with tempfile.TemporaryDirectory() as tmp:
+        for megabytes in args.sizes:
+            path = Path(tmp) / f'corpus_{megabytes}.txt'
+            write_corpus(path, megabytes)
+
+            for mode, func in (
+                ("whole", lambda: len(split_text(path.read_text(encoding='utf-8')))),
+                ("stream", lambda: sum(1 for _ in iter_chunks(path))),
+            ):
+                count, peak, elapsed = measure(func)
+                print(f"{megabytes:>4}MB {mode:<8} {count:>8} {peak:>9.1f} {elapsed:>8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Result Writer Benchmark
+
+Measures the cost of printing sentiment results with one print() call per
+field (the old analyze_sentiment loop) versus the buffered writers in
+examples/result_writers.py. Output goes to /dev/null so only formatting and
+write overhead is measured.
+
+Usage:
+    python benchmarks/bench_result_writers.py --results 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'examples'))
+
+from result_writers import FORMATS, get_writer
+
+
+def make_results(count: int) -> list:
+    return [{"index": i, "text": f"Sample review number {i}", "sentiment": "positive",
+             "positive": 0.91, "neutral": 0.06, "negative": 0.03} for i in range(count)]
+
+
+def print_per_field(results: list, stream) -> None:
+    """The original per-field print() loop."""
+    for result in results:
+        print(f"\nText {result['index'] + 1}: {result['text'][:50]}...", file=stream)
+        print(f"Sentiment: {result['sentiment']}", file=stream)
+        print(f"Confidence Scores:", file=stream)
+        print(f"  Positive: {result['positive']:.2f}", file=stream)
+        print(f"  Neutral: {result['neutral']:.2f}", file=stream)
+        print(f"  Negative: {result['negative']:.2f}", file=stream)
+
+
+def write_buffered(output_format: str, results: list, stream) -> None:
+    with get_writer(output_format, stream) as writer:
+        for result in results:
+            writer.write(result)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark result output")
+    parser.add_argument('--results', type=int, default=100000)
+    args = parser.parse_args()
+
+    results = make_results(args.results)
+    print(f"Writing {args.results} results to {os.devnull}")
+    print("-" * 50)
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        start = time.perf_counter()
+        print_per_field(results, devnull)
+        print(f"{'print':<8} {time.perf_counter() - start:8.3f} s")
+
+        for output_format in FORMATS:
+            start = time.perf_counter()
+            write_buffered(output_format, results, devnull)
+            print(f"{output_format:<8} {time.perf_counter() - start:8.3f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark
+
+Imports each example entry point in a fresh interpreter under
+`python -X importtime` and checks two things:
+
+- the cumulative import time of the module stays within its budget
+- no heavy third-party SDK (Azure, LangChain, OpenAI, ...) is imported at
+  module level; those belong inside the function that uses them
+
+Heavy imports are caught even when the package is not installed: the child
+interpreter records every attempt to import one. Import times are the
+minimum over --repeat runs, so noise only ever makes a run look faster.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --scale 2   # slow machine
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Entry point (relative to the repository root) -> import budget in ms
+ENTRY_POINTS: Dict[str, float] = {
+    'examples/agent_executor.py': 60,
+    'examples/azure_ai_async_example.py': 120,
+    'examples/azure_ai_example.py': 60,
+    'examples/azure_bulk_sentiment.py': 60,
+    'examples/chain_runner.py': 60,
+    'examples/langchain_example.py': 30,
+    'examples/llm_batch.py': 80,
+    'examples/llm_example.py': 60,
+    'examples/rag_pipeline.py': 100,
+    'samples/azure_ai_example.py': 100,
+}
+
+# Top-level packages that must not be imported at module level
+HEAVY_MODULES = frozenset({
+    'aiohttp', 'azure', 'dotenv', 'faiss', 'httpx', 'langchain', 'langchain_community',
+    'langchain_core', 'langchain_openai', 'llm', 'numpy', 'openai', 'requests',
+    'tiktoken', 'transformers', 'yaml',
+})
+
+# Run in the child: record heavy import attempts, then import the entry point
+CHILD = """
+import json, sys
+attempted = set()
+class Recorder:
+    def find_spec(self, name, path=None, target=None):
+        top = name.partition('.')[0]
+        if top in {heavy!r}:
+            attempted.add(top)
+        return None
+sys.meta_path.insert(0, Recorder())
+sys.path.insert(0, {directory!r})
+import {module}
+print(json.dumps(sorted(attempted)))
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)")
+
+
+def import_time(stderr: str, module: str) -> Optional[float]:
+    """Cumulative import time in ms of a top-level module from -X importtime output."""
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and match.group(4) == module and len(match.group(3)) == 1:
+            return int(match.group(2)) / 1000
+    return None
+
+
+def measure(entry_point: str) -> Tuple[Optional[float], List[str]]:
+    """
+    Import an entry point once in a fresh interpreter.
+
+    Returns:
+        Tuple of (import time in ms or None if the import failed, heavy
+        modules whose import was attempted)
+    """
+    path = ROOT / entry_point
+    code = CHILD.format(heavy=set(HEAVY_MODULES), directory=str(path.parent), module=path.stem)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True,
+        text=True,
+        cwd=str(ROOT)
+    )
+    if result.returncode != 0:
+        return None, []
+    heavy = json.loads(result.stdout.strip().splitlines()[-1])
+    return import_time(result.stderr, path.stem), heavy
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Check the import time of each entry point")
+    parser.add_argument('--repeat', type=int, default=5, help="imports per entry point (minimum is kept)")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every budget (slow machines)")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    print(f"{'entry point':<38} {'import':>9} {'budget':>9}")
+    print("-" * 70)
+    for entry_point, budget in ENTRY_POINTS.items():
+        budget *= args.scale
+        times = []
+        heavy: List[str] = []
+        for _ in range(args.repeat):
+            elapsed, attempted = measure(entry_point)
+            if elapsed is None:
+                break
+            times.append(elapsed)
+            heavy = sorted(set(heavy) | set(attempted))
+
+        if not times:
+            print(f"❌ {entry_point:<35} import failed")
+            failures += 1
+            continue
+
+        best = min(times)
+        problems = []
+        if best > budget:
+            problems.append("over budget")
+        if heavy:
+            problems.append(f"imports {', '.join(heavy)}")
+        status = "❌" if problems else "✅"
+        failures += bool(problems)
+        print(f"{status} {entry_point:<35} {best:7.1f}ms {budget:7.0f}ms  {'; '.join(problems)}".rstrip())
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,325 @@
+"""
+Agent Executor
+
+This script runs the tool-using agent sketched in langchain_example.py. The
+chat model is bound to the tools; whenever it asks for several tool calls
+in one turn they are independent by construction, so they are dispatched
+concurrently on a worker pool and their results are returned in the order
+they were requested. Per-tool latency is recorded for every call.
+
+The calculator tool evaluates arithmetic with a small AST interpreter
+instead of eval(), so model output can never run arbitrary code.
+
+Usage:
+    python examples/agent_executor.py "What is 25 * 4 + 10, and what is 2 ** 10?"
+    python examples/agent_executor.py --fake "What is 25 * 4 + 10?"   # offline
+"""
+
+import argparse
+import ast
+import json
+import math
+import operator
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+# Guards keeping the calculator fast on hostile input
+MAX_EXPRESSION_LENGTH = 1000
+MAX_EXPONENT = 1000
+MAX_MAGNITUDE = 1e100
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+_FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "log": math.log,
+    "exp": math.exp,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+}
+_CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+
+def _evaluate(node: ast.AST) -> float:
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.Name) and node.id in _CONSTANTS:
+        return _CONSTANTS[node.id]
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        return _UNARY_OPERATORS[type(node.op)](_evaluate(node.operand))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        left = _evaluate(node.left)
+        right = _evaluate(node.right)
+        if isinstance(node.op, ast.Pow) and abs(right) > MAX_EXPONENT:
+            raise ValueError(f"Exponent too large: {right}")
+        result = _BINARY_OPERATORS[type(node.op)](left, right)
+        if isinstance(result, complex) or abs(result) > MAX_MAGNITUDE:
+            raise ValueError("Result out of range")
+        return result
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in _FUNCTIONS and not node.keywords):
+        return _FUNCTIONS[node.func.id](*(_evaluate(arg) for arg in node.args))
+    raise ValueError(f"Unsupported expression: {ast.dump(node)[:60]}")
+
+
+def safe_eval(expression: str) -> float:
+    """
+    Evaluate an arithmetic expression without eval().
+
+    Supports numbers, + - * / // % **, parentheses, pi and e, and the
+    functions abs, round, min, max, sqrt, log, exp, sin, cos and tan.
+
+    Raises:
+        ValueError: If the expression is not plain arithmetic, or too large
+        ZeroDivisionError: On division by zero
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ValueError("Expression too long")
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression: {e.msg}") from None
+    return _evaluate(tree)
+
+
+def calculate(expression: str) -> str:
+    """Calculator tool: evaluate an arithmetic expression."""
+    result = safe_eval(expression)
+    if isinstance(result, float) and result.is_integer():
+        result = int(result)
+    return str(result)
+
+
+def current_time() -> str:
+    """Clock tool: the current UTC time in ISO 8601."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+class Tool:
+    """A function the model can call, with its JSON schema."""
+
+    def __init__(self, name: str, func: Callable[..., str], description: str,
+                 parameters: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: Tool name the model refers to
+            func: Called with the model's arguments as keyword arguments
+            description: What the tool is for (shown to the model)
+            parameters: JSON schema of the arguments
+        """
+        self.name = name
+        self.func = func
+        self.description = description
+        self.parameters = parameters or {"type": "object", "properties": {}}
+
+    def schema(self) -> Dict[str, Any]:
+        """OpenAI function-calling schema, accepted by bind_tools()."""
+        return {"type": "function", "function": {
+            "name": self.name, "description": self.description, "parameters": self.parameters}}
+
+
+DEFAULT_TOOLS = [
+    Tool("calculator", calculate, "Evaluate an arithmetic expression, e.g. '25 * 4 + 10'",
+         {"type": "object", "properties": {"expression": {"type": "string"}},
+          "required": ["expression"]}),
+    Tool("current_time", current_time, "Get the current UTC date and time"),
+]
+
+
+class ToolStats:
+    """Per-tool call counts, errors and latency."""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0})
+            stats["calls"] += 1
+            stats["errors"] += not ok
+            stats["total"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Calls, errors, and mean/max latency in milliseconds per tool."""
+        with self._lock:
+            return {
+                name: {"calls": stats["calls"], "errors": stats["errors"],
+                       "mean_ms": round(stats["total"] / stats["calls"] * 1000, 2),
+                       "max_ms": round(stats["max"] * 1000, 2)}
+                for name, stats in self._stats.items()
+            }
+
+
+class AgentExecutor:
+    """
+    Tool-calling loop with concurrent dispatch of each turn's tool calls.
+
+    The model is called with the conversation so far. If its reply has
+    tool_calls they are run (concurrently), their results are appended as
+    tool messages and the model is called again; a reply without tool calls
+    is the final answer. Tool errors are reported back to the model rather
+    than raised.
+    """
+
+    def __init__(self, llm: Any, tools: Sequence[Tool] = DEFAULT_TOOLS,
+                 max_workers: int = 4, max_iterations: int = 8):
+        """
+        Args:
+            llm: Chat model bound to the tools (invoke(messages) returning a
+                message with .content and .tool_calls)
+            tools: Tools the model may call
+            max_workers: Tool calls run at once
+            max_iterations: Model turns before giving up
+        """
+        self.llm = llm
+        self.tools = {tool.name: tool for tool in tools}
+        self.max_workers = max(1, max_workers)
+        self.max_iterations = max_iterations
+        self.stats = ToolStats()
+
+    def _run_tool(self, call: Dict[str, Any]) -> str:
+        tool = self.tools.get(call["name"])
+        start = time.perf_counter()
+        ok = False
+        try:
+            if tool is None:
+                return f"Error: unknown tool {call['name']}"
+            result = tool.func(**(call.get("args") or {}))
+            ok = True
+            return result
+        except Exception as e:
+            return f"Error: {type(e).__name__}: {e}"
+        finally:
+            self.stats.record(call["name"], time.perf_counter() - start, ok)
+
+    def invoke(self, user_input: str) -> Dict[str, Any]:
+        """
+        Answer user_input, calling tools as the model requests.
+
+        Returns:
+            Dict with the final "output" and the "steps" taken (one list of
+            {tool, args, result} per model turn that called tools)
+
+        Raises:
+            RuntimeError: If the model keeps calling tools past max_iterations
+        """
+        messages: List[Any] = [{"role": "user", "content": user_input}]
+        steps = []
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for _ in range(self.max_iterations):
+                reply = self.llm.invoke(messages)
+                tool_calls = getattr(reply, "tool_calls", None) or []
+                if not tool_calls:
+                    return {"output": reply.content, "steps": steps}
+
+                messages.append(reply)
+                results = list(executor.map(self._run_tool, tool_calls))
+                steps.append([{"tool": call["name"], "args": call.get("args"), "result": result}
+                              for call, result in zip(tool_calls, results)])
+                messages.extend({"role": "tool", "content": result, "tool_call_id": call.get("id")}
+                                for call, result in zip(tool_calls, results))
+
+        raise RuntimeError(f"Agent did not finish within {self.max_iterations} iterations")
+
+
+class ScriptedReply:
+    """Chat model reply used by ScriptedChatModel."""
+
+    def __init__(self, content: str = "", tool_calls: Optional[List[Dict[str, Any]]] = None):
+        self.content = content
+        self.tool_calls = tool_calls or []
+
+
+class ScriptedChatModel:
+    """
+    Offline stand-in for a tool-calling chat model.
+
+    Replies are taken from a script in order; a callable entry is called
+    with the messages so far, so replies can depend on tool results.
+    """
+
+    def __init__(self, script: Sequence[Any]):
+        self.script = list(script)
+        self.calls: List[List[Any]] = []
+
+    def invoke(self, messages: List[Any]) -> ScriptedReply:
+        self.calls.append(list(messages))
+        reply = self.script[len(self.calls) - 1]
+        return reply(messages) if callable(reply) else reply
+
+
+def _offline_model(question: str) -> ScriptedChatModel:
+    """Scripted model that sends each arithmetic expression in the question to the calculator."""
+    expressions = [e.strip() for e in re.findall(r"[\d\.\s\+\-\*/%\(\)]*\d[\d\.\s\+\-\*/%\(\)]*", question)
+                   if re.search(r"[\+\-\*/%]", e)]
+    calls = [{"name": "calculator", "args": {"expression": e}, "id": f"call_{i}"}
+             for i, e in enumerate(expressions)]
+
+    def answer(messages: List[Any]) -> ScriptedReply:
+        results = [m["content"] for m in messages if isinstance(m, dict) and m.get("role") == "tool"]
+        return ScriptedReply(", ".join(f"{e} = {r}" for e, r in zip(expressions, results)) or "No arithmetic found.")
+
+    return ScriptedChatModel([ScriptedReply(tool_calls=calls), answer] if calls else [answer])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the tool-calling agent")
+    parser.add_argument('question')
+    parser.add_argument('--model', default="gpt-4o-mini")
+    parser.add_argument('--fake', action='store_true', help="use an offline scripted model")
+    parser.add_argument('--workers', type=int, default=4, help="tool calls run at once")
+    args = parser.parse_args(argv)
+
+    if args.fake:
+        llm = _offline_model(args.question)
+    else:
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError as e:
+            print(f"⚠️  Missing dependency: {e}")
+            return 1
+        llm = ChatOpenAI(model=args.model, temperature=0).bind_tools([tool.schema() for tool in DEFAULT_TOOLS])
+
+    agent = AgentExecutor(llm, max_workers=args.workers)
+    result = agent.invoke(args.question)
+    for turn, step in enumerate(result["steps"], start=1):
+        for call in step:
+            print(f"🔧 [{turn}] {call['tool']}({json.dumps(call['args'])}) → {call['result']}")
+    print(f"\n{result['output']}")
+    for name, stats in agent.stats.summary().items():
+        print(f"⏱️  {name}: {stats['calls']} calls, mean {stats['mean_ms']} ms, max {stats['max_ms']} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
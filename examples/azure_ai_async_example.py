@@ -0,0 +1,187 @@
+"""
+Azure AI Services Async Example
+
+This script analyzes sentiment with the asyncio Text Analytics client
+(azure.ai.textanalytics.aio). One client and one aiohttp session are shared
+by all requests, and a semaphore caps how many requests are in flight, so a
+single process can keep the provisioned throughput busy.
+
+Usage:
+    export AZURE_TEXT_ANALYTICS_ENDPOINT="https://your-resource.cognitiveservices.azure.com/"
+    python examples/azure_ai_async_example.py reviews.txt --concurrency 16
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from azure_bulk_sentiment import (
+    MAX_DOCUMENTS_PER_REQUEST,
+    label_results,
+    read_documents,
+    request_documents,
+    sentiment_results,
+    truncate_documents
+)
+from iter_utils import batched
+from result_writers import FORMATS, get_writer
+
+
+AsyncAnalyzeBatch = Callable[[List[str]], Awaitable[List[Dict[str, Any]]]]
+
+
+def make_async_analyze_batch(client: Any, language: Optional[str] = None) -> AsyncAnalyzeBatch:
+    """
+    Build an async batch analyzer on top of an aio TextAnalyticsClient.
+
+    Args:
+        client: azure.ai.textanalytics.aio.TextAnalyticsClient
+        language: Optional language hint (e.g. 'en')
+
+    Returns:
+        Coroutine function analyzing one request's worth of texts
+    """
+    async def analyze(texts: List[str]) -> List[Dict[str, Any]]:
+        kwargs = {"language": language} if language else {}
+        response = await client.analyze_sentiment(documents=request_documents(texts), **kwargs)
+        return sentiment_results(response)
+
+    return analyze
+
+
+async def analyze_bulk_async(
+    documents: Iterable[str],
+    analyze_batch: AsyncAnalyzeBatch,
+    concurrency: int = 8,
+    batch_size: int = MAX_DOCUMENTS_PER_REQUEST
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Fan documents out over concurrent requests and yield results in order.
+
+    Args:
+        documents: Document texts
+        analyze_batch: Coroutine function analyzing one request's texts
+        concurrency: Maximum number of requests in flight
+        batch_size: Documents per request
+
+    Yields:
+        One result dict per document, with its input "index"
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(start: int, texts: List[str]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                results = await analyze_batch(truncate_documents(texts))
+            except Exception as e:
+                results = [{"error": str(e)} for _ in texts]
+        return label_results(start, texts, results)
+
+    window = max(1, concurrency) * 2
+    pending: deque = deque()
+    start = 0
+    try:
+        for texts in batched(documents, batch_size):
+            pending.append(asyncio.ensure_future(run(start, texts)))
+            start += len(texts)
+            while len(pending) >= window:
+                for result in await pending.popleft():
+                    yield result
+        while pending:
+            for result in await pending.popleft():
+                yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def analyze_sentiment_async(
+    endpoint: str,
+    texts: Iterable[str],
+    concurrency: int = 8,
+    key: Optional[str] = None,
+    language: Optional[str] = None,
+    api_version: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Analyze sentiment of texts using the async Azure Text Analytics client.
+
+    Args:
+        endpoint: Your Azure Cognitive Services endpoint
+        texts: Texts to analyze
+        concurrency: Maximum number of requests in flight
+        key: Optional API key; Azure AD (DefaultAzureCredential) is used
+            when omitted
+        language: Optional language hint (e.g. 'en')
+        api_version: Text Analytics API version (defaults to the SDK's)
+
+    Yields:
+        One result dict per text, in input order
+    """
+    import aiohttp
+    from azure.ai.textanalytics.aio import TextAnalyticsClient
+    from azure.core.pipeline.transport import AioHttpTransport
+
+    if key:
+        from azure.core.credentials import AzureKeyCredential
+        credential = AzureKeyCredential(key)
+    else:
+        from azure.identity.aio import DefaultAzureCredential
+        credential = DefaultAzureCredential()
+
+    try:
+        # One keep-alive session sized to the fan-out, shared by every request
+        connector = aiohttp.TCPConnector(limit=max(1, concurrency))
+        async with aiohttp.ClientSession(connector=connector) as session:
+            transport = AioHttpTransport(session=session, session_owner=False)
+            client_kwargs = {"api_version": api_version} if api_version else {}
+            async with TextAnalyticsClient(endpoint, credential, transport=transport, **client_kwargs) as client:
+                analyze = make_async_analyze_batch(client, language)
+                async for result in analyze_bulk_async(texts, analyze, concurrency):
+                    yield result
+    finally:
+        if not key:
+            await credential.close()
+
+
+async def run_cli(args: argparse.Namespace) -> int:
+    writer = get_writer(args.format)
+    start = time.perf_counter()
+    count = errors = 0
+    async for result in analyze_sentiment_async(
+        args.endpoint, read_documents(args.inputs), args.concurrency,
+        key=os.getenv("AZURE_TEXT_ANALYTICS_KEY"), language=args.language
+    ):
+        writer.write(result)
+        count += 1
+        errors += "error" in result
+    writer.close()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"✅ {count} documents ({errors} errors) in {elapsed:.1f}s: {rate:.1f} documents/sec",
+          file=sys.stderr)
+    return 1 if errors else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Async sentiment analysis with Azure Text Analytics")
+    parser.add_argument('inputs', nargs='*', default=['-'], help="files with one document per line ('-' for stdin)")
+    parser.add_argument('--endpoint', default=os.getenv("AZURE_TEXT_ANALYTICS_ENDPOINT"))
+    parser.add_argument('--concurrency', type=int, default=8, help="requests in flight")
+    parser.add_argument('--language', default=None, help="language hint, e.g. 'en'")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='ndjson', help="output format")
+    args = parser.parse_args()
+
+    if not args.endpoint:
+        print("⚠️  Please set AZURE_TEXT_ANALYTICS_ENDPOINT or pass --endpoint", file=sys.stderr)
+        return 1
+    return asyncio.run(run_cli(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
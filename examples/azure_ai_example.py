@@ -5,40 +5,48 @@ This script demonstrates how to use Azure AI services in the devcontainer.
 Make sure to set your Azure credentials before running.
 """
 
-from azure.identity import DefaultAzureCredential
-from azure.ai.textanalytics import TextAnalyticsClient
 import os
+from typing import Optional, TextIO
 
+from azure_clients import get_text_analytics_client
+from result_writers import get_writer
 
-def analyze_sentiment(endpoint: str, texts: list[str]):
+
+def analyze_sentiment(endpoint: str, texts: list[str], output_format: str = "human",
+                      stream: Optional[TextIO] = None):
     """
     Analyze sentiment of text using Azure Text Analytics.
     
+    The client (and its credential and connection pool) is shared across
+    calls, so only the first call pays for authentication and TLS setup.
+    Results go through a buffered writer (see result_writers.py).
+    
     Args:
         endpoint: Your Azure Cognitive Services endpoint
         texts: List of texts to analyze
+        output_format: 'human', 'ndjson' or 'csv'
+        stream: Output stream (defaults to stdout)
     """
     try:
-        # Authenticate using default Azure credential
-        credential = DefaultAzureCredential()
-        client = TextAnalyticsClient(endpoint=endpoint, credential=credential)
+        # Authenticate using the shared default Azure credential
+        client = get_text_analytics_client(endpoint, os.getenv("AZURE_TEXT_ANALYTICS_KEY"))
         
         # Analyze sentiment
         response = client.analyze_sentiment(documents=texts, show_opinion_mining=True)
         
-        print("Sentiment Analysis Results:")
-        print("-" * 50)
-        
-        for idx, doc in enumerate(response):
-            if not doc.is_error:
-                print(f"\nText {idx + 1}: {texts[idx][:50]}...")
-                print(f"Sentiment: {doc.sentiment}")
-                print(f"Confidence Scores:")
-                print(f"  Positive: {doc.confidence_scores.positive:.2f}")
-                print(f"  Neutral: {doc.confidence_scores.neutral:.2f}")
-                print(f"  Negative: {doc.confidence_scores.negative:.2f}")
-            else:
-                print(f"\nText {idx + 1}: Error - {doc.error}")
+        with get_writer(output_format, stream) as writer:
+            for idx, doc in enumerate(response):
+                if not doc.is_error:
+                    writer.write({
+                        "index": idx,
+                        "text": texts[idx],
+                        "sentiment": doc.sentiment,
+                        "positive": doc.confidence_scores.positive,
+                        "neutral": doc.confidence_scores.neutral,
+                        "negative": doc.confidence_scores.negative,
+                    })
+                else:
+                    writer.write({"index": idx, "text": texts[idx], "error": str(doc.error)})
                 
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,256 @@
+"""
+Azure Bulk Sentiment Analysis
+
+This script analyzes large corpora with Azure Text Analytics. Documents
+are streamed from files or stdin (one document per line), grouped into
+requests that respect the service limits, sent concurrently under a rate
+limit, and written out in input order.
+
+Usage:
+    export AZURE_TEXT_ANALYTICS_ENDPOINT="https://your-resource.cognitiveservices.azure.com/"
+    python examples/azure_bulk_sentiment.py reviews.txt --concurrency 8 --rate 10
+    cat reviews.txt | python examples/azure_bulk_sentiment.py -
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from iter_utils import batched
+from result_writers import FORMATS, get_writer
+
+
+# Service limits for synchronous sentiment analysis requests
+MAX_DOCUMENTS_PER_REQUEST = 10
+MAX_DOCUMENT_CHARS = 5120
+
+# A function that analyzes one request's worth of texts and returns one
+# result dict per text, in the same order
+AnalyzeBatch = Callable[[List[str]], List[Dict[str, Any]]]
+
+
+def read_documents(paths: Sequence[str]) -> Iterator[str]:
+    """
+    Lazily read documents, one per non-empty line.
+
+    Args:
+        paths: Files to read; '-' reads stdin
+
+    Yields:
+        Document texts
+    """
+    for path in paths:
+        stream = sys.stdin if path == '-' else open(path, encoding='utf-8')
+        try:
+            for line in stream:
+                line = line.strip()
+                if line:
+                    yield line
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+
+class RateLimiter:
+    """Token bucket limiting how many requests start per second."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Requests per second
+            burst: Requests that may start back to back
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a request may start."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def truncate_documents(texts: List[str]) -> List[str]:
+    """Cut each text to the service's document size limit."""
+    return [text[:MAX_DOCUMENT_CHARS] for text in texts]
+
+
+def request_documents(texts: List[str]) -> List[Dict[str, str]]:
+    """
+    Build the documents of one analyze_sentiment request.
+
+    Args:
+        texts: Document texts of one request
+
+    Returns:
+        Documents with their position in the request as "id"
+    """
+    return [{"id": str(index), "text": text} for index, text in enumerate(texts)]
+
+
+def sentiment_results(response: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert an analyze_sentiment response into result dicts.
+
+    Documents the service rejected get an "error" entry instead of scores,
+    so one bad document does not fail the rest of its request.
+
+    Args:
+        response: Sentiment results (or document errors), in request order
+
+    Returns:
+        One result dict per document
+    """
+    results = []
+    for doc in response:
+        if doc.is_error:
+            results.append({"error": str(doc.error)})
+        else:
+            results.append({
+                "sentiment": doc.sentiment,
+                "positive": doc.confidence_scores.positive,
+                "neutral": doc.confidence_scores.neutral,
+                "negative": doc.confidence_scores.negative,
+            })
+    return results
+
+
+def label_results(start: int, texts: List[str], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Add the input "index" to a request's results and flag truncated documents.
+
+    Args:
+        start: Input index of the request's first document
+        texts: Original (untruncated) texts of the request
+        results: One result dict per text, updated in place
+
+    Returns:
+        The results
+    """
+    for offset, (text, result) in enumerate(zip(texts, results)):
+        result["index"] = start + offset
+        if len(text) > MAX_DOCUMENT_CHARS:
+            result["truncated"] = True
+    return results
+
+
+def make_analyze_batch(client: Any, language: Optional[str] = None) -> AnalyzeBatch:
+    """
+    Build an AnalyzeBatch function on top of a TextAnalyticsClient.
+
+    Args:
+        client: TextAnalyticsClient to send requests with
+        language: Optional language hint (e.g. 'en')
+
+    Returns:
+        Function analyzing one request's worth of texts
+    """
+    def analyze(texts: List[str]) -> List[Dict[str, Any]]:
+        kwargs = {"language": language} if language else {}
+        response = client.analyze_sentiment(documents=request_documents(texts), **kwargs)
+        return sentiment_results(response)
+
+    return analyze
+
+
+def analyze_bulk(
+    documents: Iterable[str],
+    analyze_batch: AnalyzeBatch,
+    batch_size: int = MAX_DOCUMENTS_PER_REQUEST,
+    concurrency: int = 4,
+    rate: Optional[float] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze documents concurrently and yield their results in input order.
+
+    Documents longer than the service limit are truncated (and flagged).
+    Only about 2 * concurrency requests are held at a time, so the input
+    can be arbitrarily large.
+
+    Args:
+        documents: Document texts
+        analyze_batch: Function analyzing one request's worth of texts
+        batch_size: Documents per request
+        concurrency: Requests in flight at once
+        rate: Optional limit on requests started per second
+
+    Yields:
+        One result dict per document, with its input "index"
+    """
+    limiter = RateLimiter(rate, burst=concurrency) if rate else None
+
+    def run(start: int, texts: List[str]) -> List[Dict[str, Any]]:
+        if limiter:
+            limiter.acquire()
+        try:
+            results = analyze_batch(truncate_documents(texts))
+        except Exception as e:
+            results = [{"error": str(e)} for _ in texts]
+        return label_results(start, texts, results)
+
+    window = max(1, concurrency) * 2
+    pending: deque = deque()
+    start = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for texts in batched(documents, batch_size):
+            pending.append(executor.submit(run, start, texts))
+            start += len(texts)
+            # Results are released strictly in submission order
+            while len(pending) >= window:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk sentiment analysis with Azure Text Analytics")
+    parser.add_argument('inputs', nargs='*', default=['-'], help="files with one document per line ('-' for stdin)")
+    parser.add_argument('--endpoint', default=os.getenv("AZURE_TEXT_ANALYTICS_ENDPOINT"))
+    parser.add_argument('--concurrency', type=int, default=4, help="requests in flight")
+    parser.add_argument('--rate', type=float, default=None, help="maximum requests per second")
+    parser.add_argument('--language', default=None, help="language hint, e.g. 'en'")
+    parser.add_argument('--format', choices=sorted(FORMATS), default='ndjson', help="output format")
+    args = parser.parse_args()
+
+    if not args.endpoint:
+        print("⚠️  Please set AZURE_TEXT_ANALYTICS_ENDPOINT or pass --endpoint", file=sys.stderr)
+        return 1
+
+    from azure_clients import get_text_analytics_client
+
+    client = get_text_analytics_client(args.endpoint, os.getenv("AZURE_TEXT_ANALYTICS_KEY"))
+    analyze = make_analyze_batch(client, args.language)
+
+    writer = get_writer(args.format)
+    start = time.perf_counter()
+    count = errors = 0
+    for result in analyze_bulk(read_documents(args.inputs), analyze,
+                               concurrency=args.concurrency, rate=args.rate):
+        writer.write(result)
+        count += 1
+        errors += "error" in result
+    writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {count} documents ({errors} errors) in {elapsed:.1f}s", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""
+Azure Client Factory
+
+This module hands out long-lived Azure SDK objects shared by the examples:
+one credential (so the credential chain is discovered and tokens are
+acquired once, then served from its in-memory token cache), one pooled
+HTTP transport (so connections are kept alive between calls) and one
+client per endpoint.
+
+Azure OpenAI chat models (LangChain's AzureChatOpenAI) are registered the
+same way, one per deployment and API version, all sharing one pooled
+httpx client; warm_up_azure_openai() opens a connection ahead of the first
+request.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+# Connections kept per host in the shared pool; sized for the concurrent
+# bulk examples
+POOL_MAXSIZE = int(os.getenv("AZURE_HTTP_POOL_SIZE", "32"))
+
+# Seconds an idle connection of the shared httpx pool is kept alive
+KEEPALIVE_EXPIRY = 60.0
+
+DEFAULT_AZURE_OPENAI_API_VERSION = "2024-02-01"
+
+_lock = threading.Lock()
+_credential = None
+_transport = None
+_http_client = None
+_clients: Dict[Tuple[Any, ...], Any] = {}
+
+
+def get_credential() -> Any:
+    """
+    Return the shared DefaultAzureCredential.
+
+    The credential caches the tokens it acquires, so only the first call
+    pays for credential-chain discovery and token acquisition.
+    """
+    global _credential
+    with _lock:
+        if _credential is None:
+            from azure.identity import DefaultAzureCredential
+
+            _credential = DefaultAzureCredential()
+        return _credential
+
+
+def get_transport() -> Any:
+    """
+    Return the shared HTTP transport with a keep-alive connection pool.
+    """
+    global _transport
+    with _lock:
+        if _transport is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from azure.core.pipeline.transport import RequestsTransport
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            # session_owner=False keeps the session open when a client closes
+            _transport = RequestsTransport(session=session, session_owner=False)
+        return _transport
+
+
+def get_text_analytics_client(endpoint: str, key: Optional[str] = None) -> Any:
+    """
+    Return the shared Text Analytics client for an endpoint.
+
+    Args:
+        endpoint: Your Azure Cognitive Services endpoint
+        key: Optional API key; Azure AD (DefaultAzureCredential) is used
+            when omitted
+
+    Returns:
+        A TextAnalyticsClient reusing the shared credential and transport
+    """
+    cache_key = ("textanalytics", endpoint, key)
+    with _lock:
+        client = _clients.get(cache_key)
+    if client is not None:
+        return client
+
+    from azure.ai.textanalytics import TextAnalyticsClient
+
+    if key:
+        from azure.core.credentials import AzureKeyCredential
+
+        credential = AzureKeyCredential(key)
+    else:
+        credential = get_credential()
+
+    client = TextAnalyticsClient(endpoint=endpoint, credential=credential, transport=get_transport())
+    with _lock:
+        return _clients.setdefault(cache_key, client)
+
+
+def get_http_client() -> Any:
+    """
+    Return the shared httpx client used by the Azure OpenAI chat models.
+    """
+    global _http_client
+    with _lock:
+        if _http_client is None:
+            import httpx
+
+            limits = httpx.Limits(max_connections=POOL_MAXSIZE,
+                                  max_keepalive_connections=POOL_MAXSIZE,
+                                  keepalive_expiry=KEEPALIVE_EXPIRY)
+            _http_client = httpx.Client(limits=limits, timeout=httpx.Timeout(60.0, connect=10.0))
+        return _http_client
+
+
+def get_azure_chat_model(
+    deployment: Optional[str] = None,
+    api_version: Optional[str] = None,
+    **kwargs: Any
+) -> Any:
+    """
+    Return the shared AzureChatOpenAI model for a deployment and API version.
+
+    Endpoint and key are read from the environment by AzureChatOpenAI
+    (AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY).
+
+    Args:
+        deployment: Deployment name (defaults to AZURE_OPENAI_DEPLOYMENT_NAME)
+        api_version: API version (defaults to AZURE_OPENAI_API_VERSION)
+        **kwargs: Further AzureChatOpenAI settings, e.g. temperature; they
+            are part of the registry key
+
+    Returns:
+        An AzureChatOpenAI instance using the shared httpx client
+    """
+    deployment = deployment or os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+    api_version = api_version or os.getenv("AZURE_OPENAI_API_VERSION", DEFAULT_AZURE_OPENAI_API_VERSION)
+    # Settings may be unhashable (e.g. stop=[...]), so the key holds their
+    # canonical JSON form
+    settings = json.dumps(kwargs, sort_keys=True, default=repr)
+    cache_key = ("azure_chat", deployment, api_version, settings)
+    with _lock:
+        model = _clients.get(cache_key)
+    if model is not None:
+        return model
+
+    from langchain_openai import AzureChatOpenAI
+
+    model = AzureChatOpenAI(azure_deployment=deployment, api_version=api_version,
+                            http_client=get_http_client(), **kwargs)
+    with _lock:
+        return _clients.setdefault(cache_key, model)
+
+
+def warm_up_azure_openai(endpoint: Optional[str] = None, timeout: float = 10.0) -> Optional[float]:
+    """
+    Open a keep-alive connection to the Azure OpenAI endpoint.
+
+    Any HTTP response counts (an unauthenticated request is answered with
+    401/404): the point is that DNS, TCP and TLS setup happen now, and the
+    first real request reuses the pooled connection.
+
+    Args:
+        endpoint: Resource endpoint (defaults to AZURE_OPENAI_ENDPOINT)
+        timeout: Seconds to wait for the endpoint
+
+    Returns:
+        Seconds the warm-up took, or None if there is no endpoint or it
+        could not be reached
+    """
+    endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
+    if not endpoint:
+        return None
+    client = get_http_client()
+    start = time.perf_counter()
+    try:
+        client.get(endpoint, timeout=timeout)
+    except Exception:
+        # Warm-up is an optimization only
+        return None
+    return time.perf_counter() - start
+
+
+def reset() -> None:
+    """Drop all shared objects (the next call creates fresh ones)."""
+    global _credential, _transport, _http_client
+    with _lock:
+        if _http_client is not None:
+            _http_client.close()
+        _credential = None
+        _transport = None
+        _http_client = None
+        _clients.clear()
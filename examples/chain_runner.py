@@ -0,0 +1,243 @@
+"""
+LangChain Chain Runner
+
+This script runs the LCEL chain from langchain_example.py in two modes:
+
+    stream  Print tokens as they arrive (chain.stream / chain.astream) and
+            report time-to-first-token and total latency
+    batch   Run a JSONL file of inputs through chain.batch / chain.abatch
+            with bounded concurrency, recording per-item errors instead of
+            aborting, and report throughput
+
+The functions work with any LangChain Runnable.
+
+Usage:
+    python examples/chain_runner.py stream --adjective funny --topic programming
+    python examples/chain_runner.py batch inputs.jsonl -o outputs.jsonl --max-concurrency 8
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Union
+
+from iter_utils import batched
+
+
+# Inputs handed to one chain.batch call; results are written after each
+BATCH_WINDOW = 256
+
+# A chain input, or the error of an input line that could not be read
+ChainInput = Union[Dict[str, Any], ValueError]
+
+
+def build_joke_chain(model: str = "gpt-3.5-turbo", temperature: float = 0.7) -> Any:
+    """
+    Build the prompt | llm | parser chain of langchain_basic_example().
+
+    Raises:
+        ImportError: If langchain-openai is not installed
+    """
+    from langchain_core.output_parsers import StrOutputParser
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_openai import ChatOpenAI
+
+    prompt = ChatPromptTemplate.from_template("Tell me a {adjective} joke about {topic}")
+    return prompt | ChatOpenAI(model=model, temperature=temperature) | StrOutputParser()
+
+
+class _StreamRecorder:
+    """Writes streamed chunks as they arrive and times them."""
+
+    def __init__(self, write: Optional[Callable[[str], Any]]):
+        self.write = write or sys.stdout.write
+        # Tokens only show up as they arrive if stdout is flushed per chunk
+        self.flush = sys.stdout.flush if write is None else None
+        self.parts: List[str] = []
+        self.ttft: Optional[float] = None
+        self.start = time.perf_counter()
+
+    def add(self, chunk: str) -> None:
+        if self.ttft is None:
+            self.ttft = time.perf_counter() - self.start
+        self.parts.append(chunk)
+        self.write(chunk)
+        if self.flush is not None:
+            self.flush()
+
+    def result(self) -> Dict[str, Any]:
+        total = time.perf_counter() - self.start
+        return {"output": "".join(self.parts), "ttft": self.ttft if self.ttft is not None else total,
+                "total": total, "chunks": len(self.parts)}
+
+
+def stream_chain(chain: Any, inputs: Dict[str, Any],
+                 write: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+    """
+    Stream a chain's output, writing each token as it arrives.
+
+    Args:
+        chain: LangChain Runnable producing text chunks
+        inputs: Chain input
+        write: Called with each chunk (default: stdout, flushed per chunk)
+
+    Returns:
+        Dict with the full "output", "ttft" (seconds to the first chunk),
+        "total" (seconds to the last) and "chunks"
+    """
+    recorder = _StreamRecorder(write)
+    for chunk in chain.stream(inputs):
+        recorder.add(chunk)
+    return recorder.result()
+
+
+async def astream_chain(chain: Any, inputs: Dict[str, Any],
+                        write: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+    """Async version of stream_chain() using chain.astream."""
+    recorder = _StreamRecorder(write)
+    async for chunk in chain.astream(inputs):
+        recorder.add(chunk)
+    return recorder.result()
+
+
+def read_inputs(stream: TextIO) -> Iterator[ChainInput]:
+    """
+    Lazily read chain inputs from a JSONL stream (one JSON object per line).
+
+    A line that is not a JSON object yields a ValueError in its place, so
+    the batch runner can record it and carry on with the other lines.
+    """
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ValueError(f"line {number}: invalid JSON: {e.msg}")
+            continue
+        if not isinstance(item, dict):
+            yield ValueError(f"line {number}: expected a JSON object")
+            continue
+        yield item
+
+
+def _item(index: int, inputs: Optional[Dict[str, Any]], outcome: Any) -> Dict[str, Any]:
+    if isinstance(outcome, Exception):
+        return {"index": index, "input": inputs, "error": f"{type(outcome).__name__}: {outcome}"}
+    return {"index": index, "input": inputs, "output": outcome}
+
+
+def _merge(start: int, items: List[Any], outcomes: List[Any]) -> Iterator[Dict[str, Any]]:
+    """Result dicts of a window, with unreadable input lines in their place."""
+    outcomes_iter = iter(outcomes)
+    for index, item in enumerate(items, start=start):
+        if isinstance(item, Exception):
+            yield _item(index, None, item)
+        else:
+            yield _item(index, item, next(outcomes_iter))
+
+
+def run_chain_batch(chain: Any, inputs: Iterable[ChainInput], max_concurrency: int = 4,
+                    window: int = BATCH_WINDOW) -> Iterator[Dict[str, Any]]:
+    """
+    Run inputs through chain.batch, window by window.
+
+    Failed items, and unreadable input lines (ValueError items from
+    read_inputs), are returned as {"error": ...} entries and do not abort
+    the batch.
+
+    Args:
+        chain: LangChain Runnable
+        inputs: Chain inputs; consumed one window at a time
+        max_concurrency: Items of a window processed at once
+        window: Inputs per chain.batch call
+
+    Yields:
+        One result dict per input, in input order, with "index", "input"
+        and "output" or "error"
+    """
+    index = 0
+    for items in batched(inputs, window):
+        valid = [item for item in items if not isinstance(item, Exception)]
+        outcomes = chain.batch(valid, config={"max_concurrency": max_concurrency},
+                               return_exceptions=True) if valid else []
+        yield from _merge(index, items, outcomes)
+        index += len(items)
+
+
+async def arun_chain_batch(chain: Any, inputs: Iterable[ChainInput], max_concurrency: int = 4,
+                           window: int = BATCH_WINDOW) -> List[Dict[str, Any]]:
+    """Async version of run_chain_batch() using chain.abatch; returns a list."""
+    results: List[Dict[str, Any]] = []
+    for items in batched(inputs, window):
+        valid = [item for item in items if not isinstance(item, Exception)]
+        outcomes = await chain.abatch(valid, config={"max_concurrency": max_concurrency},
+                                      return_exceptions=True) if valid else []
+        results.extend(_merge(len(results), items, outcomes))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream or batch the LangChain example chain")
+    parser.add_argument('--model', default="gpt-3.5-turbo")
+    parser.add_argument('--use-async', action='store_true', help="use astream/abatch")
+    modes = parser.add_subparsers(dest='mode', required=True)
+
+    stream_mode = modes.add_parser('stream', help="print tokens as they arrive")
+    stream_mode.add_argument('--adjective', default="funny")
+    stream_mode.add_argument('--topic', default="programming")
+
+    batch_mode = modes.add_parser('batch', help="run a JSONL file of inputs")
+    batch_mode.add_argument('input', help="JSONL file of {adjective, topic} objects ('-' for stdin)")
+    batch_mode.add_argument('-o', '--output', default='-', help="JSONL results file ('-' for stdout)")
+    batch_mode.add_argument('--max-concurrency', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    try:
+        chain = build_joke_chain(args.model)
+    except ImportError as e:
+        print(f"⚠️  Missing dependency: {e}", file=sys.stderr)
+        return 1
+
+    if args.mode == 'stream':
+        inputs = {"adjective": args.adjective, "topic": args.topic}
+        if args.use_async:
+            import asyncio
+            timing = asyncio.run(astream_chain(chain, inputs))
+        else:
+            timing = stream_chain(chain, inputs)
+        print(f"\n\n⏱️  time to first token: {timing['ttft'] * 1000:.0f} ms, "
+              f"total: {timing['total'] * 1000:.0f} ms ({timing['chunks']} chunks)", file=sys.stderr)
+        return 0
+
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    start = time.perf_counter()
+    count = errors = 0
+    try:
+        if args.use_async:
+            import asyncio
+            results: Iterable[Dict[str, Any]] = asyncio.run(
+                arun_chain_batch(chain, read_inputs(source), args.max_concurrency))
+        else:
+            results = run_chain_batch(chain, read_inputs(source), args.max_concurrency)
+        for result in results:
+            sink.write(json.dumps(result, ensure_ascii=False) + "\n")
+            count += 1
+            errors += "error" in result
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"✅ {count} inputs ({errors} errors) in {elapsed:.1f}s: {rate:.2f} items/sec", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
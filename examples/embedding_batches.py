@@ -0,0 +1,263 @@
+"""
+Batched Embedding Requests
+
+This module wraps a LangChain embeddings model so large inputs are sent as
+token-budgeted batches, several at a time. The batch budget shrinks when
+the provider answers with a rate limit (429) or a payload error (400/413)
+and grows back after a run of successful batches, and throughput is recorded in chunks/sec and tokens/sec so the budget and
+concurrency can be tuned against a quota.
+
+Example:
+    from langchain_openai import OpenAIEmbeddings
+    embeddings = BatchedEmbeddings(OpenAIEmbeddings(), max_tokens=8000, concurrency=4)
+    vectors = embeddings.embed_documents(texts)
+    print(embeddings.metrics.summary())
+"""
+
+import functools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_MAX_TOKENS = 8000
+DEFAULT_MAX_ITEMS = 256
+MIN_TOKENS = 256
+# Successful batches in a row after which the budget grows by one step,
+# and the step as a fraction of max_tokens (additive increase)
+GROW_AFTER = 4
+GROW_FRACTION = 8
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding() -> Optional[Any]:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        # Not installed, or the encoding could not be downloaded
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Count tokens with tiktoken when available, else about 4 characters per token."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, (len(text) + 3) // 4)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limit(error: BaseException) -> bool:
+    """Whether an error means the provider is throttling us."""
+    return _status_code(error) == 429 or 'RateLimit' in type(error).__name__
+
+
+def is_payload_error(error: BaseException) -> bool:
+    """Whether an error means the request was too large."""
+    return _status_code(error) in (400, 413)
+
+
+class EmbeddingMetrics:
+    """Throughput counters of a BatchedEmbeddings instance."""
+
+    def __init__(self):
+        self.chunks = 0
+        self.tokens = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.payload_errors = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, chunks: int, tokens: int) -> None:
+        with self._lock:
+            self.chunks += chunks
+            self.tokens += tokens
+            self.requests += 1
+
+    @property
+    def chunks_per_sec(self) -> float:
+        return self.chunks / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def tokens_per_sec(self) -> float:
+        return self.tokens / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters for reporting."""
+        return {
+            "chunks": self.chunks,
+            "tokens": self.tokens,
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "payload_errors": self.payload_errors,
+            "seconds": round(self.elapsed, 3),
+            "chunks_per_sec": round(self.chunks_per_sec, 1),
+            "tokens_per_sec": round(self.tokens_per_sec, 1),
+        }
+
+
+class BatchedEmbeddings:
+    """
+    Embeddings wrapper sending token-budgeted batches concurrently.
+
+    Workers take texts off a shared queue until the current token budget
+    (or the item limit) is reached and send them as one request. A rate
+    limit halves the budget, puts the batch back and backs off; a payload
+    error halves the budget and puts the batch back to be re-split. A
+    single text that still fails, or a batch rate limited more than
+    `retries` times, raise; the retry budget is counted per batch, so
+    concurrent workers hitting the same 429 wave do not use up each
+    other's retries. Rate limits never shrink the budget below MIN_TOKENS.
+
+    After GROW_AFTER successful batches in a row the budget grows by
+    max_tokens / GROW_FRACTION, back up to max_tokens, so one 429 wave
+    does not slow down the rest of a long run. Growth stops below the
+    size of any batch that failed with a payload error, since that limit
+    does not go away. Implements the LangChain Embeddings interface.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        concurrency: int = 4,
+        retries: int = 5,
+        backoff: float = 1.0,
+        count_tokens: Callable[[str], int] = estimate_tokens,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Args:
+            embeddings: LangChain Embeddings (embed_documents/embed_query)
+            max_tokens: Largest token budget of one request; the current
+                budget (`budget`) adapts below it
+            max_items: Texts per request
+            concurrency: Requests in flight at once
+            retries: Rate limits tolerated per batch before giving up
+            backoff: Base delay in seconds after a rate limit (doubles each time)
+            count_tokens: Token counter for budgeting
+            sleep: Sleep function (replaceable in tests)
+        """
+        self.embeddings = embeddings
+        self.max_tokens = max_tokens
+        self.budget = max_tokens
+        self.max_items = max_items
+        self.concurrency = max(1, concurrency)
+        self.retries = retries
+        self.backoff = backoff
+        self.count_tokens = count_tokens
+        self.sleep = sleep
+        self.metrics = EmbeddingMetrics()
+        self._ceiling = max_tokens
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def _take_batch(self, pending: deque) -> List[Tuple[int, str, int, int]]:
+        batch: List[Tuple[int, str, int, int]] = []
+        budget = 0
+        with self._lock:
+            while pending and len(batch) < self.max_items:
+                tokens = pending[0][2]
+                # A text over the whole budget is sent on its own
+                if batch and budget + tokens > self.budget:
+                    break
+                batch.append(pending.popleft())
+                budget += tokens
+        return batch
+
+    def _put_back(self, pending: deque, batch: List[Tuple[int, str, int, int]]) -> None:
+        with self._lock:
+            pending.extendleft(reversed(batch))
+
+    def _shrink(self, batch_tokens: int, floor: int, payload: bool = False) -> None:
+        with self._lock:
+            # The floor never raises a budget that is already below it
+            floor = min(floor, self.budget)
+            self.budget = max(floor, min(self.budget, batch_tokens) // 2)
+            self._successes = 0
+            if payload:
+                self._ceiling = min(self._ceiling, self.budget)
+
+    def _grow(self) -> None:
+        with self._lock:
+            self._successes += 1
+            if self._successes >= GROW_AFTER and self.budget < self._ceiling:
+                self._successes = 0
+                step = max(1, self.max_tokens // GROW_FRACTION)
+                self.budget = min(self._ceiling, self.budget + step)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        # (index, text, tokens, rate limits the text's batches have hit)
+        pending = deque((index, text, self.count_tokens(text), 0) for index, text in enumerate(texts))
+        start = time.perf_counter()
+
+        def run() -> None:
+            try:
+                worker()
+            except BaseException:
+                # Stop the other workers from taking more work
+                with self._lock:
+                    pending.clear()
+                raise
+
+        def worker() -> None:
+            while True:
+                batch = self._take_batch(pending)
+                if not batch:
+                    return
+                batch_tokens = sum(tokens for _, _, tokens, _ in batch)
+                try:
+                    result = self.embeddings.embed_documents([text for _, text, _, _ in batch])
+                except Exception as e:
+                    if is_rate_limit(e):
+                        with self._lock:
+                            self.metrics.rate_limited += 1
+                        attempt = max(limits for _, _, _, limits in batch) + 1
+                        if attempt > self.retries:
+                            raise
+                        self._shrink(batch_tokens, MIN_TOKENS)
+                        self._put_back(pending, [(index, text, tokens, attempt)
+                                                 for index, text, tokens, _ in batch])
+                        self.sleep(self.backoff * 2 ** (attempt - 1))
+                        continue
+                    if is_payload_error(e) and len(batch) > 1:
+                        with self._lock:
+                            self.metrics.payload_errors += 1
+                        # Always below the failed batch, so it gets re-split
+                        self._shrink(batch_tokens, 1, payload=True)
+                        self._put_back(pending, batch)
+                        continue
+                    raise
+
+                self.metrics.record(len(batch), batch_tokens)
+                self._grow()
+                for (index, _, _, _), vector in zip(batch, result):
+                    vectors[index] = vector
+
+        workers = min(self.concurrency, len(texts)) or 1
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run) for _ in range(workers)]
+                for future in futures:
+                    future.result()
+        finally:
+            with self._lock:
+                self.metrics.elapsed += time.perf_counter() - start
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
@@ -0,0 +1,18 @@
+"""
+Iteration Helpers
+
+Small iterator utilities shared by the example scripts.
+"""
+
+from itertools import islice
+from typing import Any, Iterable, Iterator, List
+
+
+def batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -5,10 +5,6 @@ This script demonstrates how to use LangChain with various LLM providers.
 """
 
 import os
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 
 def langchain_basic_example():
@@ -17,9 +13,7 @@ def langchain_basic_example():
     print("-" * 50)
     
     try:
-        from langchain_openai import ChatOpenAI
-        from langchain.prompts import ChatPromptTemplate
-        from langchain.schema.output_parser import StrOutputParser
+        from chain_runner import build_joke_chain
         
         # Check if API key is set
         if not os.getenv("OPENAI_API_KEY"):
@@ -27,21 +21,30 @@ def langchain_basic_example():
             print("   Set it in .env file or environment")
             return
         
-        # Create a simple chain
-        llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7)
-        prompt = ChatPromptTemplate.from_template(
-            "Tell me a {adjective} joke about {topic}"
-        )
-        output_parser = StrOutputParser()
+        # Create a simple chain using LCEL (LangChain Expression Language):
+        # prompt | ChatOpenAI | StrOutputParser
+        chain = build_joke_chain("gpt-3.5-turbo", temperature=0.7)
+        
+        # Serve repeated prompts from the response cache selected by
+        # LE2_LLM_CACHE (off unless set, as for run_llm_command)
+        from llm_example import get_response_cache
         
-        # Combine into a chain using LCEL (LangChain Expression Language)
-        chain = prompt | llm | output_parser
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            from langchain_core.globals import set_llm_cache
+            from llm_cache import langchain_cache
+            
+            set_llm_cache(langchain_cache(response_cache))
+            print(f"Response cache: {getattr(response_cache.backend, 'path', 'in memory')}")
         
         # Invoke the chain
         print("\nChain structure: Prompt → LLM → Parser")
         print("Input: adjective='funny', topic='programming'")
         print("\n(Skipping actual API call to avoid usage)")
         print("Expected output: A funny programming joke")
+        print("\nStream tokens (with time-to-first-token) or run a file of inputs:")
+        print("  python examples/chain_runner.py stream --adjective funny --topic programming")
+        print("  python examples/chain_runner.py batch inputs.jsonl --max-concurrency 8")
         
     except ImportError as e:
         print(f"⚠️  Missing dependency: {e}")
@@ -55,7 +58,7 @@ def langchain_azure_example():
     print("-" * 50)
     
     try:
-        from langchain_openai import AzureChatOpenAI
+        from azure_clients import get_azure_chat_model, warm_up_azure_openai
         
         # Check for Azure credentials
         required_vars = [
@@ -74,14 +77,15 @@ def langchain_azure_example():
             print("AZURE_OPENAI_DEPLOYMENT_NAME=gpt-4")
             return
         
-        llm = AzureChatOpenAI(
-            azure_deployment=os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-01"),
-            temperature=0.7
-        )
+        # One model per deployment/API version, sharing a pooled HTTP client;
+        # warming up opens the connection before the first real request
+        llm = get_azure_chat_model(temperature=0.7)
+        warm_up = warm_up_azure_openai()
         
         print("✅ Azure OpenAI configured")
-        print("(Skipping actual API call)")
+        if warm_up is not None:
+            print(f"   Connection warmed up in {warm_up * 1000:.0f} ms")
+        print("(Skipping the chat completion call)")
         
     except ImportError as e:
         print(f"⚠️  Missing dependency: {e}")
@@ -109,10 +113,13 @@ RAG (Retrieval-Augmented Generation) pattern:
 
 3. Create embeddings and vector store
    from langchain_openai import OpenAIEmbeddings
-   from langchain.vectorstores import FAISS
+   from rag_pipeline import CachedEmbeddings, EmbeddingCache, update_index
    
-   embeddings = OpenAIEmbeddings()
-   vectorstore = FAISS.from_documents(chunks, embeddings)
+   # Vectors are cached by chunk hash and the FAISS index lives on disk,
+   # so a re-run only embeds new or changed chunks
+   embeddings = CachedEmbeddings(OpenAIEmbeddings(model="text-embedding-3-small"),
+                                 EmbeddingCache(), "text-embedding-3-small")
+   vectorstore = update_index(chunks, embeddings)["store"]
 
 4. Create retrieval chain
    from langchain.chains import RetrievalQA
@@ -124,6 +131,9 @@ RAG (Retrieval-Augmented Generation) pattern:
 
 5. Query your documents
    result = qa_chain.invoke("What is this document about?")
+
+Steps 1-3 are implemented in examples/rag_pipeline.py:
+   python examples/rag_pipeline.py docs/*.md --query "What is this about?"
     """)
 
 
@@ -139,9 +149,11 @@ from langchain.agents import create_openai_functions_agent, AgentExecutor
 from langchain_openai import ChatOpenAI
 from langchain.tools import Tool
 
-# Define tools
+# Define tools (safe_eval parses arithmetic with ast; never eval() model output)
+from agent_executor import safe_eval
+
 def calculate(expression: str) -> str:
-    return str(eval(expression))
+    return str(safe_eval(expression))
 
 tools = [
     Tool(
@@ -158,10 +170,26 @@ agent_executor = AgentExecutor(agent=agent, tools=tools)
 
 # Use agent
 result = agent_executor.invoke({"input": "What is 25 * 4 + 10?"})
+
+examples/agent_executor.py runs a working version that dispatches a turn's
+independent tool calls concurrently and reports per-tool latency:
+   python examples/agent_executor.py "What is 25 * 4 + 10, and 2 ** 10?"
+   python examples/agent_executor.py --fake "What is 25 * 4 + 10?"   # offline
     """)
 
 
+def load_env_file():
+    """Load a .env file when python-dotenv is installed."""
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
 def main():
+    load_env_file()
+
     print("LangChain Examples")
     print("=" * 50)
     
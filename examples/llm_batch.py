@@ -0,0 +1,207 @@
+"""
+LLM Batch Prompt Runner
+
+This script runs many prompts through the LLM tool with bounded
+concurrency, retrying failed prompts with exponential backoff and writing
+each result to a JSONL file as soon as it finishes.
+
+Input is JSONL: one prompt per line, either a JSON string or an object with
+"prompt" and optional "id" and "system" keys. Prompts are read lazily and
+only a small window is in flight at a time, so inputs with hundreds of
+thousands of lines run in constant memory.
+
+Usage:
+    python examples/llm_batch.py prompts.jsonl -o results.jsonl --concurrency 8
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+from llm_example import LLMClient
+
+
+def read_prompts(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily read prompts from a JSONL stream.
+
+    Args:
+        stream: Text stream with one JSON prompt per line
+
+    Yields:
+        Dicts with "id", "prompt" and "system" keys; the id defaults to the
+        line number. A line without a usable prompt yields {"id", "error"}
+        instead, which run_batch() reports as a failed prompt
+    """
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"id": line_number, "error": f"Invalid JSON on line {line_number}: {e.msg}"}
+            continue
+        if isinstance(item, str):
+            item = {"prompt": item}
+        if not isinstance(item, dict) or not isinstance(item.get("prompt"), str):
+            yield {"id": line_number, "error": f"No prompt on line {line_number}"}
+            continue
+        yield {
+            "id": item.get("id", line_number),
+            "prompt": item["prompt"],
+            "system": item.get("system"),
+        }
+
+
+class BatchStats:
+    """Counters for a batch run."""
+
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.retries = 0
+        self.elapsed = 0.0
+
+    @property
+    def total(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def rate(self) -> float:
+        """Prompts completed per second."""
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+def run_batch(
+    prompts: Iterable[Dict[str, Any]],
+    sink: TextIO,
+    client: Optional[LLMClient] = None,
+    concurrency: int = 4,
+    timeout: float = 30,
+    retries: int = 2,
+    backoff: float = 1.0
+) -> BatchStats:
+    """
+    Run prompts concurrently and stream their results to a JSONL sink.
+
+    At most 2 * concurrency prompts are read ahead of the workers, so memory
+    use does not depend on the number of prompts. Results are written in
+    completion order and carry the prompt's id.
+
+    Attempts are bounded by the client's own timeout (the subprocess
+    timeout in cli mode, an abandoned call in python mode). The default
+    client also limits provider calls to concurrency, counting calls that
+    timed out but are still running, so retries never push the number of
+    requests in flight past the limit.
+
+    Args:
+        prompts: Iterable of {"id", "prompt", "system"} dicts; items with
+            an "error" key (unreadable input lines) are reported as failed
+        sink: Text stream the JSONL results are written to
+        client: LLM client to use (defaults to LLMClient())
+        concurrency: Maximum number of prompts in flight
+        timeout: Seconds allowed for each attempt by the default client
+        retries: Extra attempts for a failed prompt
+        backoff: Base delay in seconds; doubled after every failed attempt
+
+    Returns:
+        Counters for the run
+    """
+    client = client or LLMClient(timeout=timeout, max_calls=concurrency)
+    stats = BatchStats()
+    stats_lock = threading.Lock()
+    start = time.perf_counter()
+
+    def run_one(item: Dict[str, Any]) -> Dict[str, Any]:
+        item_start = time.perf_counter()
+        for attempt in range(1, retries + 2):
+            try:
+                response = client.prompt(item["prompt"], system=item["system"])
+                return {"id": item["id"], "response": response, "attempts": attempt,
+                        "elapsed": round(time.perf_counter() - item_start, 3)}
+            except Exception as e:
+                error = str(e)
+                if attempt <= retries:
+                    with stats_lock:
+                        stats.retries += 1
+                    # Exponential backoff with jitter to avoid retry storms
+                    time.sleep(backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+        return {"id": item["id"], "error": error, "attempts": retries + 1,
+                "elapsed": round(time.perf_counter() - item_start, 3)}
+
+    def write(result: Dict[str, Any]) -> None:
+        sink.write(json.dumps(result) + "\n")
+        sink.flush()
+        if "error" in result:
+            stats.failed += 1
+        else:
+            stats.succeeded += 1
+
+    iterator = iter(prompts)
+    in_flight = set()
+    window = max(1, concurrency) * 2
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        exhausted = False
+        while in_flight or not exhausted:
+            while not exhausted and len(in_flight) < window:
+                item = next(iterator, None)
+                if item is None:
+                    exhausted = True
+                elif "error" in item:
+                    write({"id": item["id"], "error": item["error"], "attempts": 0, "elapsed": 0.0})
+                else:
+                    in_flight.add(executor.submit(run_one, item))
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                write(future.result())
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a batch of prompts through the LLM tool")
+    parser.add_argument('input', help="JSONL file of prompts ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="JSONL results file ('-' for stdout)")
+    parser.add_argument('-m', '--model', help="model name (e.g., 'gpt-4')")
+    parser.add_argument('--concurrency', type=int, default=4, help="prompts in flight")
+    parser.add_argument('--timeout', type=float, default=30, help="seconds per attempt")
+    parser.add_argument('--retries', type=int, default=2, help="retries per prompt")
+    parser.add_argument('--backoff', type=float, default=1.0, help="base retry delay in seconds")
+    args = parser.parse_args()
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    sink = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        stats = run_batch(
+            read_prompts(source),
+            sink,
+            client=LLMClient(args.model, timeout=args.timeout, max_calls=args.concurrency),
+            concurrency=args.concurrency,
+            timeout=args.timeout,
+            retries=args.retries,
+            backoff=args.backoff
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(f"✅ {stats.succeeded} succeeded, ❌ {stats.failed} failed, "
+          f"{stats.retries} retries in {stats.elapsed:.1f}s ({stats.rate:.1f} prompts/sec)",
+          file=sys.stderr)
+    return 1 if stats.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
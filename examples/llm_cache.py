@@ -0,0 +1,263 @@
+"""
+LLM Response Cache
+
+This module caches LLM responses keyed by a hash of the model, system
+prompt, prompt and temperature, so repeated development and regression runs
+do not call the provider again for prompts it has already answered.
+
+Two backends are provided: an in-memory LRU for a single process, and an
+SQLite file shared between runs. Both evict least recently used entries
+once a maximum entry count or total size is exceeded.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parent.parent / 'workspace' / '.cache' / 'llm_responses.sqlite'
+
+
+def cache_key(model: Optional[str], system: Optional[str], prompt: str,
+              temperature: Optional[float] = None) -> str:
+    """
+    Build the content-addressed key for a request.
+
+    Returns:
+        Hex SHA-256 digest of the request fields
+    """
+    payload = json.dumps([model, system, prompt, temperature], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU store with entry count and size limits."""
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+            self._entries[key] = value
+            self._size += len(value)
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or self._size > self.max_bytes):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    SQLite store with LRU eviction, shared between runs.
+
+    Access times of cache hits are buffered in memory and written in
+    batches, so a hit is a single indexed read. The entry count and total
+    size are kept as running totals (read once when the file is opened),
+    and eviction deletes the oldest entries through the last_access index,
+    so an insert does not scan the table.
+    """
+
+    TOUCH_FLUSH_SIZE = 256
+    # Oldest entries looked at per eviction step
+    EVICT_BATCH = 64
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_CACHE_PATH,
+                 max_entries: int = 100000, max_bytes: int = 512 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._touched: Dict[str, float] = {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._db.commit()
+        self._count, self._size = self._db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+
+    def _flush_touches(self) -> None:
+        if self._touched:
+            self._db.executemany(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self) -> None:
+        while self._count > self.max_entries or self._size > self.max_bytes:
+            limit = max(self._count - self.max_entries, self.EVICT_BATCH)
+            sizes = self._db.execute(
+                "SELECT size FROM responses ORDER BY last_access LIMIT ?", (limit,)
+            ).fetchall()
+            if not sizes:
+                self._count = self._size = 0
+                return
+            count, size, evicted = self._count, self._size, 0
+            for (entry_size,) in sizes:
+                if count <= self.max_entries and size <= self.max_bytes:
+                    break
+                count -= 1
+                size -= entry_size
+                evicted += 1
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY last_access LIMIT ?)",
+                (evicted,)
+            )
+            self._count, self._size = count, size
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.TOUCH_FLUSH_SIZE:
+                self._flush_touches()
+                self._db.commit()
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._flush_touches()
+            size = len(value.encode('utf-8'))
+            previous = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, size, time.time())
+            )
+            if previous is None:
+                self._count += 1
+                self._size += size
+            else:
+                self._size += size - previous[0]
+            self._evict()
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._touched.clear()
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._count = self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_touches()
+            self._db.commit()
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    """Response cache with hit/miss counters over a storage backend."""
+
+    def __init__(self, backend: Optional[Union[MemoryBackend, SQLiteBackend]] = None):
+        """
+        Args:
+            backend: Storage backend (defaults to an in-memory LRU)
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for a key, counting the hit or miss."""
+        value = self.backend.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value."""
+        self.backend.set(key, value)
+
+    def get_or_call(self, key: str, func: Callable[[], str]) -> str:
+        """Return the cached value, or call func and cache its result."""
+        value = self.get(key)
+        if value is None:
+            value = func()
+            self.set(key, value)
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for reporting."""
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hit_rate, 3), "entries": len(self.backend)}
+
+
+def langchain_cache(cache: ResponseCache) -> Any:
+    """
+    Wrap a ResponseCache as a LangChain LLM cache.
+
+    Use it with `set_llm_cache(langchain_cache(cache))`; LangChain then
+    serves repeated chain invocations (same prompt and model settings)
+    from the cache. LangChain's llm_string already encodes the model name
+    and temperature.
+
+    Raises:
+        ImportError: If langchain-core is not installed
+    """
+    from langchain_core.caches import BaseCache
+    from langchain_core.load import dumps, loads
+
+    class LangChainResponseCache(BaseCache):
+        def lookup(self, prompt: str, llm_string: str):
+            value = cache.get(cache_key(llm_string, None, prompt))
+            return loads(value) if value is not None else None
+
+        def update(self, prompt: str, llm_string: str, return_val) -> None:
+            cache.set(cache_key(llm_string, None, prompt), dumps(return_val))
+
+        def clear(self, **kwargs) -> None:
+            cache.backend.clear()
+
+    return LangChainResponseCache()
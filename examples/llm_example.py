@@ -4,14 +4,261 @@ LLM (Simon Willison's tool) Example
 This script demonstrates how to use the LLM CLI tool programmatically.
 """
 
+import importlib.util
+import queue
 import subprocess
 import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from llm_cache import ResponseCache
+
+
+class LLMError(Exception):
+    """Raised when a prompt cannot be answered."""
+
+
+def _load_llm_model(model: Optional[str]) -> Any:
+    """Load a model through the llm Python API (plugins and keys included)."""
+    import llm
+    
+    return llm.get_model(model or llm.get_default_model())
+
+
+class LLMClient:
+    """
+    Client that answers prompts with the LLM tool.
+    
+    In "python" mode the llm package is used in-process: the model (and
+    with it plugin discovery and key loading) is loaded once and reused for
+    every prompt. "cli" mode starts one `llm` process per prompt and is
+    only used when the package cannot be imported. "auto" picks between
+    the two.
+    """
+    
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        mode: str = "auto",
+        timeout: float = 30,
+        executable: str = "llm",
+        model_loader: Callable[[Optional[str]], Any] = _load_llm_model,
+        cache: Optional["ResponseCache"] = None,
+        max_calls: Optional[int] = None
+    ):
+        """
+        Args:
+            model: Optional model name (e.g., 'gpt-4', 'claude-3-opus')
+            mode: "auto", "python" or "cli"
+            timeout: Seconds to wait for a response; in python mode a call
+                that runs longer is abandoned and LLMError is raised
+            executable: Path of the llm CLI (cli mode only)
+            model_loader: Function returning the model object for a name
+            cache: Optional response cache; hits skip the provider entirely
+            max_calls: Provider calls allowed in flight at once (python
+                mode). A call abandoned after its timeout keeps its slot
+                until it really returns, so the limit also covers calls
+                that are still running in the background
+        """
+        if mode == "auto":
+            mode = "python" if importlib.util.find_spec("llm") else "cli"
+        if mode not in ("python", "cli"):
+            raise ValueError(f"Unknown mode: {mode}")
+        
+        self.model = model
+        self.mode = mode
+        self.timeout = timeout
+        self.executable = executable
+        self._model_loader = model_loader
+        self.cache = cache
+        self._model_object = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_calls) if max_calls else None
+        self._model_id: Optional[str] = None
+    
+    def _get_model(self) -> Any:
+        if self._model_object is None:
+            with self._lock:
+                if self._model_object is None:
+                    self._model_object = self._model_loader(self.model)
+        return self._model_object
+    
+    def model_id(self) -> Optional[str]:
+        """
+        Return the id of the model that answers prompts.
+        
+        The default model (model=None) is resolved to its actual id, so
+        cached responses are not served again after the default changes.
+        """
+        if self._model_id is None:
+            if self.mode == "python":
+                try:
+                    model = self._get_model()
+                except Exception as e:
+                    raise LLMError(str(e)) from e
+                self._model_id = getattr(model, "model_id", None) or self.model
+            elif self.model:
+                self._model_id = self.model
+            else:
+                try:
+                    result = subprocess.run(
+                        [self.executable, "models", "default"],
+                        capture_output=True,
+                        text=True,
+                        timeout=self.timeout
+                    )
+                except (OSError, subprocess.TimeoutExpired) as e:
+                    raise LLMError(f"Could not resolve the default model: {e}") from e
+                if result.returncode != 0 or not result.stdout.strip():
+                    raise LLMError(f"Could not resolve the default model: {result.stderr.strip()}")
+                self._model_id = result.stdout.strip()
+        return self._model_id
+    
+    def prompt(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+        temperature: Optional[float] = None
+    ) -> str:
+        """
+        Send a prompt and return the response text.
+        
+        Args:
+            prompt: The prompt to send to the LLM
+            system: Optional system prompt
+            temperature: Optional sampling temperature
+            
+        Returns:
+            The LLM response as a string
+            
+        Raises:
+            LLMError: If the prompt could not be answered
+        """
+        if self.cache is None:
+            return self._prompt(prompt, system, temperature)
+        
+        from llm_cache import cache_key
+
+        key = cache_key(self.model_id(), system, prompt, temperature)
+        return self.cache.get_or_call(key, lambda: self._prompt(prompt, system, temperature))
+    
+    def _prompt(self, prompt: str, system: Optional[str], temperature: Optional[float]) -> str:
+        if self.mode == "python":
+            return self._prompt_python(prompt, system, temperature)
+        return self._prompt_cli(prompt, system, temperature)
+    
+    def _prompt_python(self, prompt: str, system: Optional[str], temperature: Optional[float]) -> str:
+        options = {} if temperature is None else {"temperature": temperature}
+        deadline = time.monotonic() + self.timeout
+        outcome: "queue.Queue[tuple]" = queue.Queue(maxsize=1)
+        
+        if self._slots is not None and not self._slots.acquire(timeout=self.timeout):
+            raise LLMError(f"Timed out after {self.timeout:g}s waiting for a free slot")
+        
+        # The llm API has no timeout of its own, so the call runs on a
+        # daemon thread and is abandoned if it does not finish in time
+        def call() -> None:
+            try:
+                outcome.put((True, self._get_model().prompt(prompt, system=system, **options).text()))
+            except BaseException as e:
+                outcome.put((False, e))
+            finally:
+                if self._slots is not None:
+                    self._slots.release()
+        
+        threading.Thread(target=call, daemon=True).start()
+        try:
+            ok, value = outcome.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            raise LLMError(f"Timed out after {self.timeout:g}s") from None
+        if not ok:
+            raise LLMError(str(value)) from value
+        return value.strip()
+    
+    def _prompt_cli(self, prompt: str, system: Optional[str], temperature: Optional[float]) -> str:
+        cmd = [self.executable]
+        
+        if self.model:
+            cmd.extend(["-m", self.model])
+        
+        if system:
+            cmd.extend(["-s", system])
+        
+        if temperature is not None:
+            cmd.extend(["-o", "temperature", str(temperature)])
+        
+        cmd.append(prompt)
+        
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                timeout=self.timeout
+            )
+        except subprocess.TimeoutExpired as e:
+            raise LLMError("Command timed out") from e
+        except FileNotFoundError as e:
+            raise LLMError("LLM command not found. Make sure it's installed.") from e
+        
+        if result.returncode != 0:
+            raise LLMError(result.stderr)
+        return result.stdout.strip()
+
+
+_clients: Dict[Optional[str], LLMClient] = {}
+_clients_lock = threading.Lock()
+_response_cache: Optional["ResponseCache"] = None
+
+
+def get_response_cache() -> Optional["ResponseCache"]:
+    """
+    Return the response cache selected by the LE2_LLM_CACHE variable.
+    
+    Unset disables caching, "memory" keeps responses for this process only,
+    "1" uses workspace/.cache/llm_responses.sqlite and any other value is
+    taken as the path of an SQLite cache file.
+    """
+    global _response_cache
+    setting = os.getenv("LE2_LLM_CACHE")
+    if not setting:
+        return None
+    if _response_cache is None:
+        from llm_cache import DEFAULT_CACHE_PATH, MemoryBackend, ResponseCache, SQLiteBackend
+
+        if setting == "memory":
+            _response_cache = ResponseCache(MemoryBackend())
+        else:
+            path = DEFAULT_CACHE_PATH if setting == "1" else setting
+            _response_cache = ResponseCache(SQLiteBackend(path))
+    return _response_cache
+
+
+def get_client(model: Optional[str] = None) -> LLMClient:
+    """
+    Return the shared client for a model, creating it on first use.
+    
+    Args:
+        model: Optional model name
+        
+    Returns:
+        A client whose loaded model is reused across calls
+    """
+    with _clients_lock:
+        if model not in _clients:
+            _clients[model] = LLMClient(model, cache=get_response_cache())
+        return _clients[model]
 
 
 def run_llm_command(prompt: str, model: str = None, system: str = None) -> str:
     """
     Run an LLM command and return the output.
     
+    Uses the llm Python API in-process when it is installed, falling back
+    to the `llm` CLI otherwise.
+    
     Args:
         prompt: The prompt to send to the LLM
         model: Optional model name (e.g., 'gpt-4', 'claude-3-opus')
@@ -20,33 +267,8 @@ def run_llm_command(prompt: str, model: str = None, system: str = None) -> str:
     Returns:
         The LLM response as a string
     """
-    cmd = ["llm"]
-    
-    if model:
-        cmd.extend(["-m", model])
-    
-    if system:
-        cmd.extend(["-s", system])
-    
-    cmd.append(prompt)
-    
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
-            return result.stdout.strip()
-        else:
-            return f"Error: {result.stderr}"
-            
-    except subprocess.TimeoutExpired:
-        return "Error: Command timed out"
-    except FileNotFoundError:
-        return "Error: LLM command not found. Make sure it's installed."
+        return get_client(model).prompt(prompt, system=system)
     except Exception as e:
         return f"Error: {e}"
 
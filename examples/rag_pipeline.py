@@ -0,0 +1,610 @@
+"""
+RAG Indexing Pipeline
+
+This script turns the RAG pattern from langchain_example.py into a working
+pipeline: documents are split into chunks, embedded, and stored in a FAISS
+index on disk.
+
+Embeddings are cached in SQLite keyed by a hash of the chunk text, and the
+index is updated in place rather than rebuilt, so a re-run only embeds
+chunks that are new or have changed.
+
+A manifest next to the index records each file's size, mtime, content hash
+and chunk ids. Files whose size and mtime are unchanged are not even read,
+changed files are re-split and re-indexed, and the vectors of removed files
+are deleted.
+
+Usage:
+    python examples/rag_pipeline.py docs/ --query "How do I log in to Azure?"
+    python examples/rag_pipeline.py docs/*.md --fake-embeddings   # offline
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from embedding_batches import DEFAULT_MAX_TOKENS, BatchedEmbeddings
+from iter_utils import batched
+
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / 'workspace' / '.cache'
+DEFAULT_EMBEDDING_CACHE = CACHE_DIR / 'embeddings.sqlite'
+DEFAULT_INDEX_DIR = CACHE_DIR / 'rag_index'
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+
+# Characters read from a file at a time, and chunks handed to the embedding
+# stage at a time (it splits them into token-budgeted concurrent requests)
+READ_BLOCK_SIZE = 64 * 1024
+EMBED_BATCH_SIZE = 512
+
+# Files picked up when a directory is given
+TEXT_SUFFIXES = ('.md', '.txt', '.rst')
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+class Chunk(NamedTuple):
+    """A piece of a source document."""
+
+    source: str
+    start: int
+    text: str
+
+    @property
+    def id(self) -> str:
+        """Stable id of this chunk within the index."""
+        return content_hash(f"{self.source}\0{self.start}\0{self.text}")
+
+
+def content_hash(text: str) -> str:
+    """Hex SHA-256 digest of a text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def iter_split(blocks: Iterable[str], chunk_size: int = CHUNK_SIZE,
+               overlap: int = CHUNK_OVERLAP) -> Iterator[tuple]:
+    """
+    Split a stream of text blocks into overlapping chunks, preferring
+    paragraph, line and word boundaries.
+
+    Only about one chunk plus one block of text is held at a time, and the
+    chunks are identical to splitting the concatenated text in one go.
+
+    Yields:
+        (start offset, chunk text) pairs; offsets are in characters
+    """
+    blocks = iter(blocks)
+    buffer = ""
+    base = 0        # offset of buffer[0] in the whole text
+    position = 0    # start of the next chunk within buffer
+    eof = False
+
+    while True:
+        # Buffer more than one chunk so "is there text after end" is known
+        while not eof and len(buffer) - position <= chunk_size:
+            block = next(blocks, None)
+            if block is None:
+                eof = True
+            else:
+                # Drop consumed text before growing the buffer
+                buffer = buffer[position:] + block
+                base += position
+                position = 0
+        if position >= len(buffer):
+            return
+
+        end = min(len(buffer), position + chunk_size)
+        if end < len(buffer):
+            for separator in ("\n\n", "\n", " "):
+                cut = buffer.rfind(separator, position + overlap + 1, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        piece = buffer[position:end]
+        if piece.strip():
+            yield base + position, piece
+        if end >= len(buffer) and eof:
+            return
+        position = max(position + 1, end - overlap)
+
+
+def split_text(text: str, chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> List[tuple]:
+    """
+    Split text into overlapping chunks (see iter_split).
+
+    Returns:
+        (start offset, chunk text) pairs
+    """
+    return list(iter_split([text], chunk_size, overlap))
+
+
+def read_blocks(path: Union[str, Path], block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """Read a UTF-8 text file in blocks of block_size characters."""
+    with open(path, encoding='utf-8', newline='') as stream:
+        while True:
+            block = stream.read(block_size)
+            if not block:
+                return
+            yield block
+
+
+def file_hash(path: Union[str, Path], block_size: int = READ_BLOCK_SIZE) -> str:
+    """Content hash of a text file, equal to content_hash() of its text."""
+    digest = hashlib.sha256()
+    for block in read_blocks(path, block_size):
+        digest.update(block.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def iter_chunks(path: Union[str, Path], source: Optional[str] = None,
+                chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> Iterator[Chunk]:
+    """Stream the chunks of a text file without loading it whole."""
+    source = str(path) if source is None else source
+    for start, piece in iter_split(read_blocks(path), chunk_size, overlap):
+        yield Chunk(source, start, piece)
+
+
+def load_chunks(paths: Sequence[Union[str, Path]], chunk_size: int = CHUNK_SIZE,
+                overlap: int = CHUNK_OVERLAP) -> List[Chunk]:
+    """Read and split text files into a list of chunks."""
+    return [chunk for path in paths for chunk in iter_chunks(path, None, chunk_size, overlap)]
+
+
+def iter_files(paths: Sequence[Union[str, Path]], suffixes: Sequence[str] = TEXT_SUFFIXES) -> Iterator[Path]:
+    """Yield files, expanding directories recursively to their text files."""
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(p for p in path.rglob('*') if p.is_file() and p.suffix in suffixes)
+        else:
+            yield path
+
+
+class FakeEmbeddings:
+    """
+    Deterministic embedding model for tests and offline runs.
+
+    Vectors are derived from a hash of the text, so equal texts always get
+    equal vectors. Implements the LangChain Embeddings interface.
+    """
+
+    def __init__(self, dimensions: int = 64):
+        self.dimensions = dimensions
+        self.embedded = 0
+
+    def _vector(self, text: str) -> List[float]:
+        digest = b''
+        counter = 0
+        while len(digest) < self.dimensions:
+            digest += hashlib.sha256(f"{counter}\0{text}".encode('utf-8')).digest()
+            counter += 1
+        vector = [byte / 127.5 - 1.0 for byte in digest[:self.dimensions]]
+        norm = sum(value * value for value in vector) ** 0.5 or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded += len(texts)
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+class EmbeddingCache:
+    """
+    SQLite store of embedding vectors keyed by model and chunk text hash.
+
+    Vectors are stored as packed float32, the precision FAISS indexes them
+    with.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_EMBEDDING_CACHE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, hash))"
+        )
+        self._db.commit()
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, List[float]]:
+        """Return the cached vectors among hashes."""
+        found = {}
+        hashes = list(dict.fromkeys(hashes))
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for offset in range(0, len(hashes), 500):
+                batch = hashes[offset:offset + 500]
+                rows = self._db.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch]
+                )
+                for digest, blob in rows:
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    found[digest] = vector.tolist()
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, Sequence[float]]) -> None:
+        """Store vectors by hash."""
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)",
+                [(model, digest, array('f', vector).tobytes()) for digest, vector in vectors.items()]
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+class CachedEmbeddings:
+    """
+    Embeddings wrapper serving repeated texts from an EmbeddingCache.
+
+    Only texts missing from the cache reach the wrapped model, in one
+    embed_documents call. Implements the LangChain Embeddings interface;
+    wrap it with as_langchain_embeddings() before handing it to a vector
+    store.
+    """
+
+    def __init__(self, embeddings: Any, cache: EmbeddingCache, model: str):
+        """
+        Args:
+            embeddings: LangChain Embeddings (embed_documents/embed_query)
+            cache: Vector store
+            model: Cache namespace; change it whenever the model changes
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        hashes = [content_hash(text) for text in texts]
+        vectors = self.cache.get_many(self.model, hashes)
+
+        missing = {digest: text for digest, text in zip(hashes, texts) if digest not in vectors}
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            computed = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            self.cache.put_many(self.model, computed)
+            vectors.update(computed)
+
+        return [vectors[digest] for digest in hashes]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+
+
+@functools.lru_cache(maxsize=1)
+def _embeddings_adapter() -> type:
+    """Define the LangChain Embeddings adapter on first use (keeps imports light)."""
+    from langchain_core.embeddings import Embeddings
+
+    class EmbeddingsAdapter(Embeddings):
+        """Forwards to any object with embed_documents/embed_query."""
+
+        def __init__(self, embeddings: Any):
+            self.embeddings = embeddings
+
+        def embed_documents(self, texts: List[str]) -> List[List[float]]:
+            return self.embeddings.embed_documents(texts)
+
+        def embed_query(self, text: str) -> List[float]:
+            return self.embeddings.embed_query(text)
+
+    return EmbeddingsAdapter
+
+
+def as_langchain_embeddings(embeddings: Any) -> Any:
+    """
+    Return embeddings as a langchain_core Embeddings instance.
+
+    Vector stores such as FAISS treat anything else as a plain embedding
+    function and call it directly, which the duck-typed wrappers in this
+    module do not support.
+    """
+    from langchain_core.embeddings import Embeddings
+
+    if isinstance(embeddings, Embeddings):
+        return embeddings
+    return _embeddings_adapter()(embeddings)
+
+
+def load_index(index_dir: Union[str, Path], embeddings: Any) -> Optional[Any]:
+    """
+    Load a FAISS index saved by update_index().
+
+    Returns:
+        The FAISS vector store, or None if there is no index yet
+    """
+    from langchain_community.vectorstores import FAISS
+
+    index_dir = Path(index_dir)
+    if not (index_dir / 'index.faiss').exists():
+        return None
+    # The pickle next to the index was written by this pipeline
+    return FAISS.load_local(str(index_dir), as_langchain_embeddings(embeddings),
+                            allow_dangerous_deserialization=True)
+
+
+def _apply_changes(store: Optional[Any], new: Iterable[Chunk], stale: Sequence[str],
+                   embeddings: CachedEmbeddings, index_dir: Union[str, Path],
+                   batch_size: int = EMBED_BATCH_SIZE) -> tuple:
+    """
+    Delete stale ids from the index, stream new chunks into it in embedding
+    batches, then save it.
+
+    Returns:
+        (store, number of chunks added)
+    """
+    from langchain_community.vectorstores import FAISS
+
+    if store is not None and stale:
+        store.delete(list(stale))
+    added = 0
+    for batch in batched(new, batch_size):
+        texts = [chunk.text for chunk in batch]
+        pairs = list(zip(texts, embeddings.embed_documents(texts)))
+        metadatas = [{"source": chunk.source, "start": chunk.start} for chunk in batch]
+        ids = [chunk.id for chunk in batch]
+        if store is None:
+            store = FAISS.from_embeddings(pairs, as_langchain_embeddings(embeddings),
+                                          metadatas=metadatas, ids=ids)
+        else:
+            store.add_embeddings(pairs, metadatas=metadatas, ids=ids)
+        added += len(batch)
+    if store is not None and (added or stale):
+        Path(index_dir).mkdir(parents=True, exist_ok=True)
+        store.save_local(str(index_dir))
+    return store, added
+
+
+def update_index(chunks: Sequence[Chunk], embeddings: CachedEmbeddings,
+                 index_dir: Union[str, Path] = DEFAULT_INDEX_DIR) -> Dict[str, Any]:
+    """
+    Bring the on-disk FAISS index in line with chunks.
+
+    Chunks already in the index are kept as they are, chunks no longer
+    present are deleted, and new chunks are embedded (through the cache)
+    and added.
+
+    Returns:
+        The vector store and counts of added, removed and kept chunks
+    """
+    wanted = {chunk.id: chunk for chunk in chunks}
+    store = load_index(index_dir, embeddings)
+    existing = set(store.index_to_docstore_id.values()) if store else set()
+
+    stale = sorted(existing - set(wanted))
+    new = [chunk for chunk_id, chunk in wanted.items() if chunk_id not in existing]
+    store, _ = _apply_changes(store, new, stale, embeddings, index_dir)
+
+    return {"store": store, "added": len(new), "removed": len(stale),
+            "kept": len(wanted) - len(new)}
+
+
+def load_manifest(index_dir: Union[str, Path]) -> Dict[str, Dict[str, Any]]:
+    """Return the file manifest saved with an index ({} if there is none)."""
+    try:
+        data = json.loads((Path(index_dir) / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != MANIFEST_VERSION:
+        return {}
+    return data.get('files', {})
+
+
+def save_manifest(index_dir: Union[str, Path], files: Dict[str, Dict[str, Any]]) -> None:
+    """Atomically write the file manifest."""
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=index_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as tmp_file:
+        json.dump({'version': MANIFEST_VERSION, 'files': files}, tmp_file)
+    os.replace(tmp_name, index_dir / MANIFEST_NAME)
+
+
+class IngestPlan(NamedTuple):
+    """What an ingestion run has to change."""
+
+    files: Dict[str, Dict[str, Any]]
+    to_index: List[Path]
+    stale_ids: List[str]
+    counts: Dict[str, int]
+
+
+def plan_ingest(paths: Sequence[Union[str, Path]], previous: Dict[str, Dict[str, Any]]) -> IngestPlan:
+    """
+    Compare files against a manifest and work out the index changes.
+
+    A file is unchanged if its size and mtime match the manifest, or if its
+    content hash does (e.g. after a checkout touched it). New and changed
+    files are listed in to_index; the old chunk ids of changed files and
+    the chunk ids of files missing from paths are listed in stale_ids.
+
+    Args:
+        paths: Files and directories making up the knowledge base
+        previous: Manifest of the last run
+
+    Returns:
+        The new manifest (entries of files to index have no chunks yet),
+        files to index, chunk ids to delete, and counts of new, changed,
+        unchanged and removed files
+    """
+    files: Dict[str, Dict[str, Any]] = {}
+    counts = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0}
+    to_index: List[Path] = []
+    stale_ids: List[str] = []
+
+    for path in iter_files(paths):
+        key = str(path.resolve())
+        if key in files:
+            continue
+        stat = path.stat()
+        entry = previous.get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime_ns:
+            files[key] = entry
+            counts["unchanged"] += 1
+            continue
+
+        digest = file_hash(path)
+        if entry and entry['hash'] == digest:
+            files[key] = {**entry, 'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+            counts["unchanged"] += 1
+            continue
+
+        to_index.append(path)
+        if entry:
+            stale_ids.extend(entry['chunks'])
+            counts["changed"] += 1
+        else:
+            counts["new"] += 1
+        files[key] = {'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'hash': digest, 'chunks': []}
+
+    for key, entry in previous.items():
+        if key not in files:
+            stale_ids.extend(entry['chunks'])
+            counts["removed"] += 1
+
+    return IngestPlan(files, to_index, stale_ids, counts)
+
+
+def ingest(paths: Sequence[Union[str, Path]], embeddings: CachedEmbeddings,
+           index_dir: Union[str, Path] = DEFAULT_INDEX_DIR,
+           chunk_size: int = CHUNK_SIZE, overlap: int = CHUNK_OVERLAP) -> Dict[str, Any]:
+    """
+    Incrementally index files, using the manifest to skip unchanged ones.
+
+    Chunks of new and changed files are streamed straight into embedding
+    batches, so memory use does not grow with file or corpus size.
+
+    Args:
+        paths: Files and directories making up the knowledge base
+        embeddings: Cached embeddings used for new chunks
+        index_dir: Directory of the FAISS index and manifest
+
+    Returns:
+        The vector store plus counts of new, changed, unchanged and removed
+        files, added and removed chunks, and the elapsed time
+    """
+    start = time.perf_counter()
+    store = load_index(index_dir, embeddings)
+    # A manifest without its index describes nothing; start over
+    previous = load_manifest(index_dir) if store is not None else {}
+    plan = plan_ingest(paths, previous)
+
+    # The index is saved before the manifest, so after an interruption (or
+    # with the manifest lost) the two disagree: delete only ids the index
+    # holds, plus any it holds that the manifest does not know about; the
+    # files owning the latter are re-indexed as new
+    indexed = set(store.index_to_docstore_id.values()) if store is not None else set()
+    known = {chunk_id for entry in previous.values() for chunk_id in entry['chunks']}
+    stale = sorted((indexed & set(plan.stale_ids)) | (indexed - known))
+
+    def new_chunks() -> Iterator[Chunk]:
+        for path in plan.to_index:
+            key = str(path.resolve())
+            chunk_ids = plan.files[key]['chunks']
+            for chunk in iter_chunks(path, key, chunk_size, overlap):
+                chunk_ids.append(chunk.id)
+                yield chunk
+
+    store, added = _apply_changes(store, new_chunks(), stale, embeddings, index_dir)
+    save_manifest(index_dir, plan.files)
+
+    return {**plan.counts, "store": store, "chunks_added": added,
+            "chunks_removed": len(stale), "elapsed": time.perf_counter() - start}
+
+
+def default_embeddings(fake: bool = False) -> tuple:
+    """
+    Return (embeddings, cache namespace) for the CLI.
+
+    Raises:
+        ImportError: If langchain-openai is needed but not installed
+    """
+    if fake:
+        return FakeEmbeddings(), "fake-64"
+    from langchain_openai import OpenAIEmbeddings
+
+    model = "text-embedding-3-small"
+    # Retries and backoff are handled by BatchedEmbeddings
+    return OpenAIEmbeddings(model=model, max_retries=0), model
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Build or refresh a local RAG index")
+    parser.add_argument('paths', nargs='+', help="text files or directories to index")
+    parser.add_argument('--index', default=str(DEFAULT_INDEX_DIR), help="FAISS index directory")
+    parser.add_argument('--cache', default=str(DEFAULT_EMBEDDING_CACHE), help="embedding cache file")
+    parser.add_argument('--fake-embeddings', action='store_true', help="use deterministic offline embeddings")
+    parser.add_argument('--max-tokens', type=int, default=DEFAULT_MAX_TOKENS, help="token budget per embedding request")
+    parser.add_argument('--concurrency', type=int, default=4, help="embedding requests in flight")
+    parser.add_argument('--query', help="search the index after updating it")
+    args = parser.parse_args()
+
+    try:
+        model, namespace = default_embeddings(args.fake_embeddings)
+    except ImportError as e:
+        print(f"⚠️  Missing dependency: {e}")
+        return 1
+
+    batcher = BatchedEmbeddings(model, max_tokens=args.max_tokens, concurrency=args.concurrency)
+    cache = EmbeddingCache(args.cache)
+    embeddings = CachedEmbeddings(batcher, cache, namespace)
+
+    try:
+        report = ingest(args.paths, embeddings, args.index)
+    except ImportError as e:
+        print(f"⚠️  Missing dependency: {e}")
+        print("   pip install langchain-community faiss-cpu")
+        return 1
+    finally:
+        cache.close()
+
+    print(f"✅ Files: {report['new']} new, {report['changed']} changed, "
+          f"{report['unchanged']} unchanged, {report['removed']} removed "
+          f"({report['elapsed']:.1f}s)")
+    print(f"   Chunks: {report['chunks_added']} added, {report['chunks_removed']} removed")
+    print(f"   Embeddings: {embeddings.misses} computed, {embeddings.hits} from cache")
+    metrics = batcher.metrics
+    if metrics.requests:
+        print(f"   Throughput: {metrics.chunks_per_sec:.1f} chunks/sec, {metrics.tokens_per_sec:.0f} tokens/sec "
+              f"({metrics.requests} requests, {metrics.rate_limited} rate limited, "
+              f"budget {batcher.budget} tokens)")
+
+    if args.query and report["store"] is not None:
+        for doc in report["store"].similarity_search(args.query, k=3):
+            print(f"\n[{doc.metadata['source']}:{doc.metadata['start']}]\n{doc.page_content[:200]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
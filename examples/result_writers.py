@@ -0,0 +1,145 @@
+"""
+Result Writers
+
+This module renders sentiment results for the Azure examples. A writer
+formats each result into an in-memory buffer and writes it to the output
+stream in batches, so even very large runs pay for one write call per
+batch instead of several print() calls per document.
+
+Formats:
+    human   Readable blocks, as printed by analyze_sentiment()
+    ndjson  One JSON object per line
+    csv     Header plus one row per result
+"""
+
+import csv
+import io
+import json
+import sys
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+
+
+# Columns written in CSV mode; other result keys are ignored
+CSV_FIELDS = ("index", "sentiment", "positive", "neutral", "negative", "truncated", "error")
+
+
+class ResultWriter:
+    """Base writer buffering formatted results and flushing them in batches."""
+
+    def __init__(self, stream: Optional[TextIO] = None, flush_every: int = 1000):
+        """
+        Args:
+            stream: Output stream (defaults to stdout)
+            flush_every: Results buffered before they are written out
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._buffer: List[str] = []
+
+    def format(self, result: Dict[str, Any]) -> str:
+        """Render one result, including its trailing newline."""
+        raise NotImplementedError
+
+    def write(self, result: Dict[str, Any]) -> None:
+        """Buffer one result, flushing once the batch is full."""
+        self._buffer.append(self.format(result))
+        self.count += 1
+        if len(self._buffer) >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered results to the stream."""
+        if self._buffer:
+            self.stream.write(''.join(self._buffer))
+            self._buffer.clear()
+        self.stream.flush()
+
+    def close(self) -> None:
+        """Flush remaining results (the stream itself is left open)."""
+        self.flush()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class HumanWriter(ResultWriter):
+    """Readable output matching the original analyze_sentiment() layout."""
+
+    def __init__(self, stream: Optional[TextIO] = None, flush_every: int = 1000,
+                 header: bool = True):
+        super().__init__(stream, flush_every)
+        if header:
+            self._buffer.append("Sentiment Analysis Results:\n" + "-" * 50 + "\n")
+
+    def format(self, result: Dict[str, Any]) -> str:
+        number = result.get("index", self.count) + 1
+        if "error" in result:
+            return f"\nText {number}: Error - {result['error']}\n"
+        text = result.get("text")
+        return (
+            (f"\nText {number}: {text[:50]}...\n" if text else f"\nText {number}:\n") +
+            f"Sentiment: {result['sentiment']}\n"
+            f"Confidence Scores:\n"
+            f"  Positive: {result['positive']:.2f}\n"
+            f"  Neutral: {result['neutral']:.2f}\n"
+            f"  Negative: {result['negative']:.2f}\n"
+        )
+
+
+class NDJSONWriter(ResultWriter):
+    """One JSON object per line."""
+
+    def format(self, result: Dict[str, Any]) -> str:
+        return json.dumps(result, ensure_ascii=False) + "\n"
+
+
+class CSVWriter(ResultWriter):
+    """CSV with a header row and a fixed set of columns."""
+
+    def __init__(self, stream: Optional[TextIO] = None, flush_every: int = 1000,
+                 fields: Sequence[str] = CSV_FIELDS):
+        super().__init__(stream, flush_every)
+        self._row = io.StringIO()
+        self._csv = csv.DictWriter(self._row, fieldnames=list(fields),
+                                   extrasaction="ignore", lineterminator="\n")
+        self._csv.writeheader()
+        self._buffer.append(self._take_row())
+
+    def _take_row(self) -> str:
+        row = self._row.getvalue()
+        self._row.seek(0)
+        self._row.truncate()
+        return row
+
+    def format(self, result: Dict[str, Any]) -> str:
+        self._csv.writerow(result)
+        return self._take_row()
+
+
+FORMATS = {
+    "human": HumanWriter,
+    "ndjson": NDJSONWriter,
+    "csv": CSVWriter,
+}
+
+
+def get_writer(output_format: str, stream: Optional[TextIO] = None, **kwargs) -> ResultWriter:
+    """
+    Create the writer for an output format.
+
+    Args:
+        output_format: One of FORMATS ('human', 'ndjson', 'csv')
+        stream: Output stream (defaults to stdout)
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        writer_class = FORMATS[output_format]
+    except KeyError:
+        raise ValueError(f"Unknown output format: {output_format} (expected one of {', '.join(FORMATS)})")
+    return writer_class(stream, **kwargs)
@@ -5,8 +5,11 @@ This demonstrates using Azure AI services after authentication.
 """
 
 import os
-import subprocess
-from typing import Optional
+import sys
+from pathlib import Path
+
+# Reuse the authentication probes (and their result cache) from scripts/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
 
 
 def check_azure_credentials() -> bool:
@@ -29,18 +32,15 @@ def check_azure_credentials() -> bool:
         print("✅ Azure credentials found in environment")
         return True
     
-    # Check if Azure CLI is authenticated
-    try:
-        result = subprocess.run(
-            ['az', 'account', 'show'],
-            capture_output=True,
-            timeout=5
-        )
-        if result.returncode == 0:
-            print("✅ Authenticated with Azure CLI")
-            return True
-    except (FileNotFoundError, subprocess.TimeoutExpired, Exception):
-        pass
+    # Check if Azure CLI is authenticated (served from the probe cache when
+    # a recent result exists and the Azure credential files are unchanged)
+    from check_authentication import probe_azure_auth
+    from probe_cache import ProbeCache
+
+    is_authenticated, _, _ = ProbeCache().cached('azure', probe_azure_auth)()
+    if is_authenticated:
+        print("✅ Authenticated with Azure CLI")
+        return True
     
     print("⚠️  No Azure credentials found")
     print("Please authenticate with: az login")
@@ -4,19 +4,53 @@ Authentication Check Script
 This script checks if the user is authenticated with various services.
 """
 
+import argparse
+import functools
+import re
 import subprocess
 import sys
 import json
-from typing import Dict, Tuple
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+from credential_files import read_azure_profile, read_gh_hosts, read_gitconfig
+from git_config import read_git_config
+from probe_cache import FAST_SUFFIX, TRANSIENT, ProbeCache
 
-def check_azure_auth() -> Tuple[bool, str]:
+
+# Upper bound on how long main() waits for any single probe. Each probe
+# already applies its own subprocess timeout; this only guards against a
+# probe that hangs outside of subprocess.run.
+CHECK_TIMEOUT = 15
+
+GH_LOGIN_RE = re.compile(r'Logged in to github\.com (?:account|as) (\S+)')
+
+# (is_ok, message, details) as returned by the probe_* functions
+ProbeResult = Tuple[bool, str, Dict[str, Any]]
+
+
+def _transient(message: str) -> ProbeResult:
+    """Failed result that says nothing about the login state; not cached."""
+    return False, message, {TRANSIENT: True}
+
+
+def probe_azure_auth(fast: bool = False) -> ProbeResult:
     """
-    Check if user is authenticated with Azure CLI.
+    Probe Azure CLI authentication and return the current account.
+    
+    Args:
+        fast: Read ~/.azure/azureProfile.json in-process instead of running
+            the az CLI, when the file gives a definite answer
     
     Returns:
-        Tuple of (is_authenticated, message)
+        Tuple of (is_authenticated, message, account); account is the
+        `az account show` payload, or empty if not authenticated
     """
+    if fast:
+        result = read_azure_profile()
+        if result is not None:
+            return result
+    
     try:
         result = subprocess.run(
             ['az', 'account', 'show'],
@@ -28,26 +62,52 @@ def check_azure_auth() -> Tuple[bool, str]:
         if result.returncode == 0:
             account_info = json.loads(result.stdout)
             user = account_info.get('user', {}).get('name', 'Unknown')
-            return True, f"Authenticated as: {user}"
+            return True, f"Authenticated as: {user}", account_info
         else:
-            return False, "Not authenticated. Run 'az login' to authenticate."
+            return False, "Not authenticated. Run 'az login' to authenticate.", {}
     except FileNotFoundError:
-        return False, "Azure CLI not installed"
+        return _transient("Azure CLI not installed")
     except subprocess.TimeoutExpired:
-        return False, "Authentication check timed out"
+        return _transient("Authentication check timed out")
     except json.JSONDecodeError:
-        return False, "Could not parse Azure CLI output"
+        return _transient("Could not parse Azure CLI output")
     except Exception as e:
-        return False, f"Error checking authentication: {str(e)}"
+        return _transient(f"Error checking authentication: {str(e)}")
 
 
-def check_github_auth() -> Tuple[bool, str]:
+def check_azure_auth(fast: bool = False) -> Tuple[bool, str]:
     """
-    Check if user is authenticated with GitHub CLI.
+    Check if user is authenticated with Azure CLI.
+    
+    Args:
+        fast: Read ~/.azure/azureProfile.json in-process instead of running
+            the az CLI, when the file gives a definite answer
     
     Returns:
         Tuple of (is_authenticated, message)
     """
+    is_ok, message, _ = probe_azure_auth(fast)
+    return is_ok, message
+
+
+def probe_github_auth(fast: bool = False) -> ProbeResult:
+    """
+    Probe GitHub CLI authentication and return the logged in user.
+    
+    Args:
+        fast: Read ~/.config/gh/hosts.yml in-process instead of running the
+            gh CLI, when the file gives a definite answer. Unlike
+            `gh auth status`, this does not validate the token online.
+    
+    Returns:
+        Tuple of (is_authenticated, message, details); details holds the
+        'login' when it could be determined
+    """
+    if fast:
+        result = read_gh_hosts()
+        if result is not None:
+            return result
+    
     try:
         result = subprocess.run(
             ['gh', 'auth', 'status'],
@@ -60,93 +120,261 @@ def check_github_auth() -> Tuple[bool, str]:
             # Parse the output to get username
             output = result.stdout + result.stderr
             if "Logged in to github.com" in output:
+                match = GH_LOGIN_RE.search(output)
+                details = {'login': match.group(1)} if match else {}
                 # Extract username from output
                 for line in output.split('\n'):
                     if 'account' in line.lower():
-                        return True, f"Authenticated: {line.strip()}"
-                return True, "Authenticated with GitHub"
+                        return True, f"Authenticated: {line.strip()}", details
+                return True, "Authenticated with GitHub", details
             else:
-                return False, "Not authenticated. Run 'gh auth login' to authenticate."
+                return False, "Not authenticated. Run 'gh auth login' to authenticate.", {}
         else:
-            return False, "Not authenticated. Run 'gh auth login' to authenticate."
+            return False, "Not authenticated. Run 'gh auth login' to authenticate.", {}
     except FileNotFoundError:
-        return False, "GitHub CLI not installed"
+        return _transient("GitHub CLI not installed")
     except subprocess.TimeoutExpired:
-        return False, "Authentication check timed out"
+        return _transient("Authentication check timed out")
     except Exception as e:
-        return False, f"Error checking authentication: {str(e)}"
+        return _transient(f"Error checking authentication: {str(e)}")
 
 
-def check_git_config() -> Tuple[bool, str]:
+def check_github_auth(fast: bool = False) -> Tuple[bool, str]:
     """
-    Check if Git is configured with user information.
+    Check if user is authenticated with GitHub CLI.
+    
+    Args:
+        fast: Read ~/.config/gh/hosts.yml in-process instead of running the
+            gh CLI, when the file gives a definite answer. Unlike
+            `gh auth status`, this does not validate the token online.
     
+    Returns:
+        Tuple of (is_authenticated, message)
+    """
+    is_ok, message, _ = probe_github_auth(fast)
+    return is_ok, message
+
+
+def git_identity_status(name: str, email: str) -> Tuple[bool, str]:
+    """
+    Build the Git configuration status from the configured identity.
+    
+    Args:
+        name: Value of user.name (empty if unset)
+        email: Value of user.email (empty if unset)
+        
     Returns:
         Tuple of (is_configured, message)
     """
+    if name and email:
+        return True, f"Configured as: {name} <{email}>"
+    elif name:
+        return False, "Git email not configured. Set with: git config --global user.email 'you@example.com'"
+    elif email:
+        return False, "Git name not configured. Set with: git config --global user.name 'Your Name'"
+    else:
+        return False, "Git not configured. Set with: git config --global user.name/user.email"
+
+
+def probe_git_config(fast: bool = False) -> ProbeResult:
+    """
+    Probe the Git identity configuration.
+    
+    Args:
+        fast: Parse ~/.gitconfig in-process instead of running git config,
+            when the file can be read without ambiguity
+    
+    Returns:
+        Tuple of (is_configured, message, details); details holds the
+        configured 'name' and 'email'
+    """
     try:
-        name_result = subprocess.run(
-            ['git', 'config', '--global', 'user.name'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        email_result = subprocess.run(
-            ['git', 'config', '--global', 'user.email'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        name = name_result.stdout.strip()
-        email = email_result.stdout.strip()
+        config = read_gitconfig() if fast else None
+        if config is None:
+            config = read_git_config('global')
         
-        if name and email:
-            return True, f"Configured as: {name} <{email}>"
-        elif name:
-            return False, "Git email not configured. Set with: git config --global user.email 'you@example.com'"
-        elif email:
-            return False, "Git name not configured. Set with: git config --global user.name 'Your Name'"
-        else:
-            return False, "Git not configured. Set with: git config --global user.name/user.email"
+        name = config.value('user.name')
+        email = config.value('user.email')
+        is_ok, message = git_identity_status(name, email)
+        return is_ok, message, {'name': name, 'email': email}
     except FileNotFoundError:
-        return False, "Git not installed"
+        return _transient("Git not installed")
     except Exception as e:
-        return False, f"Error checking Git config: {str(e)}"
+        return _transient(f"Error checking Git config: {str(e)}")
 
 
-def main() -> int:
+def check_git_config(fast: bool = False) -> Tuple[bool, str]:
     """
-    Main function to check all authentication statuses.
+    Check if Git is configured with user information.
+    
+    Args:
+        fast: Parse ~/.gitconfig in-process instead of running git config,
+            when the file can be read without ambiguity
     
     Returns:
-        Exit code (0 if all checks pass, 1 otherwise)
+        Tuple of (is_configured, message)
     """
-    print("🔐 Checking Authentication Status...\n")
+    is_ok, message, _ = probe_git_config(fast)
+    return is_ok, message
+
+
+def run_checks(
+    checks: Dict[str, Callable[[], tuple]],
+    timeout: Optional[float] = CHECK_TIMEOUT
+) -> Dict[str, tuple]:
+    """
+    Run all checks concurrently and collect their results.
+    
+    Every check is started at once on its own worker thread, so the total
+    time is bounded by the slowest check rather than the sum of all of them.
+    
+    Args:
+        checks: Mapping of service name to check function
+        timeout: Seconds to wait for the checks before reporting a timeout
+        
+    Returns:
+        Mapping of service name to the check's result tuple, in the order
+        of checks. Checks that time out or raise yield (False, message).
+    """
+    results: Dict[str, tuple] = {}
+    if not checks:
+        return results
+    
+    executor = ThreadPoolExecutor(max_workers=len(checks))
+    try:
+        futures = {
+            service: executor.submit(check_func)
+            for service, check_func in checks.items()
+        }
+        wait(futures.values(), timeout=timeout)
+        
+        for service, future in futures.items():
+            if not future.done():
+                results[service] = (False, "Authentication check timed out")
+                continue
+            try:
+                results[service] = future.result()
+            except Exception as e:
+                results[service] = (False, f"Error running check: {str(e)}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return results
+
+
+class AuthResults:
+    """
+    Results of the authentication probes, shared with the setup tasks.
+    
+    Besides the pass/fail status of every service, this keeps the identity
+    data the probes already fetched (Azure account, GitHub login, Git
+    identity) so later steps do not need to ask the CLIs again.
+    """
+    
+    def __init__(self, results: Dict[str, tuple]):
+        """
+        Args:
+            results: Mapping of service name to a probe result tuple
+        """
+        self.statuses: Dict[str, Tuple[bool, str]] = {}
+        self.details: Dict[str, Dict[str, Any]] = {}
+        for service, (is_ok, message, *extra) in results.items():
+            self.statuses[service] = (is_ok, message)
+            details = dict(extra[0]) if extra else {}
+            details.pop(TRANSIENT, None)
+            self.details[service] = details
     
-    checks = {
-        "Azure CLI": check_azure_auth,
-        "GitHub CLI": check_github_auth,
-        "Git Configuration": check_git_config
+    @property
+    def all_passed(self) -> bool:
+        """True if every probe succeeded."""
+        return all(is_ok for is_ok, _ in self.statuses.values())
+    
+    @property
+    def azure_account(self) -> Dict[str, Any]:
+        """The `az account show` payload, or empty if unknown."""
+        return self.details.get("Azure CLI", {})
+    
+    @property
+    def github_login(self) -> Optional[str]:
+        """The authenticated GitHub login, or None if unknown."""
+        return self.details.get("GitHub CLI", {}).get('login')
+
+
+def collect_auth_results(
+    cache: Optional[ProbeCache] = None,
+    fast: bool = False
+) -> AuthResults:
+    """
+    Run every authentication probe concurrently.
+    
+    Args:
+        cache: Probe result cache to read from and update (None disables it)
+        fast: Read credential files in-process where possible
+        
+    Returns:
+        Results of all probes
+    """
+    probes = {
+        "Azure CLI": ('azure', probe_azure_auth),
+        "GitHub CLI": ('github', probe_github_auth),
+        "Git Configuration": ('git', probe_git_config)
     }
     
-    results: Dict[str, Tuple[bool, str]] = {}
-    all_passed = True
+    checks = {}
+    for service, (name, probe) in probes.items():
+        check_func = functools.partial(probe, fast=fast)
+        key = name + FAST_SUFFIX if fast else name
+        checks[service] = cache.cached(key, check_func) if cache else check_func
+    
+    return AuthResults(run_checks(checks))
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Check authentication status")
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help="ignore cached results and run every probe again"
+    )
+    parser.add_argument(
+        '--ttl',
+        type=float,
+        default=None,
+        help="seconds to reuse cached probe results (0 disables the cache)"
+    )
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help="read credential files directly and only fall back to az/gh/git when needed"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main function to check all authentication statuses.
     
-    for service, check_func in checks.items():
-        is_ok, message = check_func()
-        results[service] = (is_ok, message)
+    Args:
+        argv: Command line arguments (defaults to sys.argv)
         
+    Returns:
+        Exit code (0 if all checks pass, 1 otherwise)
+    """
+    args = parse_args(argv)
+    cache = ProbeCache(ttl=args.ttl, refresh=args.refresh)
+    
+    print("🔐 Checking Authentication Status...\n")
+    
+    results = collect_auth_results(cache, fast=args.fast)
+    
+    for service, (is_ok, message) in results.statuses.items():
         status_icon = "✅" if is_ok else "❌"
         print(f"{status_icon} {service}: {message}")
-        
-        if not is_ok:
-            all_passed = False
     
     print("\n" + "="*60)
     
-    if all_passed:
+    if results.all_passed:
         print("✅ All authentication checks passed!")
         print("You are ready to use the development environment.")
         return 0
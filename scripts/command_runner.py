@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Command Runner
+This module runs shell commands with asyncio, streaming their output line
+by line as it arrives instead of buffering it until the command exits.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+
+# Lines longer than this are split, so a command that never prints a
+# newline cannot grow the read buffer without bound
+MAX_LINE_LENGTH = 8192
+READ_CHUNK_SIZE = 65536
+
+
+class CommandResult:
+    """Outcome of a command: exit code, wall time and the tail of its output."""
+
+    def __init__(self, command: List[str], returncode: Optional[int], elapsed: float,
+                 stdout_tail: List[str], stderr_tail: List[str],
+                 timed_out: bool = False, error: Optional[str] = None):
+        self.command = command
+        self.returncode = returncode
+        self.elapsed = elapsed
+        self.stdout_tail = stdout_tail
+        self.stderr_tail = stderr_tail
+        self.timed_out = timed_out
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """True if the command ran and exited with status 0."""
+        return self.returncode == 0 and not self.timed_out and self.error is None
+
+
+async def _pump(stream: asyncio.StreamReader, on_line: Callable[[str], None]) -> None:
+    """Read a stream to EOF, calling on_line for every line."""
+    partial = ''
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        partial += chunk.decode(errors='replace')
+        *lines, partial = partial.split('\n')
+        while len(partial) > MAX_LINE_LENGTH:
+            lines.append(partial[:MAX_LINE_LENGTH])
+            partial = partial[MAX_LINE_LENGTH:]
+        for line in lines:
+            on_line(line.rstrip('\r'))
+    if partial:
+        on_line(partial.rstrip('\r'))
+
+
+async def run_command_async(
+    command: List[str],
+    description: str,
+    timeout: float = 30,
+    tail_lines: int = 20,
+    semaphore: Optional[asyncio.Semaphore] = None,
+    echo: bool = True
+) -> CommandResult:
+    """
+    Run a command, streaming its stdout as it arrives.
+
+    Only the last tail_lines lines of stdout and stderr are kept (for error
+    reports), so memory use does not grow with the command's output.
+
+    Args:
+        command: Command to run as list
+        description: Description of what the command does
+        timeout: Seconds before the command is killed
+        tail_lines: Number of trailing lines of each stream to keep
+        semaphore: Shared limit on the number of commands running at once
+        echo: Print progress and stream output lines
+
+    Returns:
+        Result of the command
+    """
+    stdout_tail: Deque[str] = deque(maxlen=tail_lines)
+    stderr_tail: Deque[str] = deque(maxlen=tail_lines)
+
+    def on_stdout(line: str) -> None:
+        stdout_tail.append(line)
+        if echo and line.strip():
+            print(f"  │ {line}", flush=True)
+
+    async def execute() -> CommandResult:
+        if echo:
+            print(f"🔄 {description}...", flush=True)
+        start = time.perf_counter()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except Exception as e:
+            return CommandResult(command, None, time.perf_counter() - start, [], [], error=str(e))
+
+        timed_out = False
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    _pump(process.stdout, on_stdout),
+                    _pump(process.stderr, stderr_tail.append),
+                    process.wait()
+                ),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            timed_out = True
+            process.kill()
+            await process.wait()
+
+        return CommandResult(
+            command, process.returncode, time.perf_counter() - start,
+            list(stdout_tail), list(stderr_tail), timed_out=timed_out
+        )
+
+    if semaphore is None:
+        result = await execute()
+    else:
+        async with semaphore:
+            result = await execute()
+
+    if echo:
+        report(result)
+    return result
+
+
+def report(result: CommandResult) -> None:
+    """Print the outcome of a command in the setup scripts' format."""
+    if result.ok:
+        print(f"  ✅ Success ({result.elapsed:.1f}s)")
+    elif result.timed_out:
+        print(f"  ⏱️  Command timed out")
+    elif result.error is not None:
+        print(f"  ❌ Error: {result.error}")
+    else:
+        details = [line for line in result.stderr_tail if line.strip()]
+        print(f"  ❌ Failed (exit {result.returncode}): {details[0] if details else ''}")
+        for line in details[1:]:
+            print(f"     {line}")
+
+
+async def run_commands(
+    commands: Iterable[Tuple[List[str], str]],
+    limit: int = 4,
+    **kwargs
+) -> List[CommandResult]:
+    """
+    Run many commands concurrently under a shared concurrency limit.
+
+    Args:
+        commands: (command, description) pairs
+        limit: Maximum number of commands running at once
+        **kwargs: Passed on to run_command_async
+
+    Returns:
+        One result per command, in the order given
+    """
+    semaphore = asyncio.Semaphore(limit)
+    return await asyncio.gather(*(
+        run_command_async(command, description, semaphore=semaphore, **kwargs)
+        for command, description in commands
+    ))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Credential File Readers
+This module reads authentication state straight from the Azure CLI, GitHub
+CLI and Git configuration files, without starting the az/gh/git processes.
+
+Every reader returns None when the files are missing or when their content
+is ambiguous, so that callers can fall back to asking the CLI itself.
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from git_config import GitConfig
+from probe_cache import azure_config_dir, gh_config_dir, git_config_files
+
+
+GITHUB_TOKEN_VARS = ['GH_TOKEN', 'GITHUB_TOKEN', 'GH_ENTERPRISE_TOKEN', 'GITHUB_ENTERPRISE_TOKEN']
+
+_SECTION_RE = re.compile(r'^\[\s*([A-Za-z0-9.-]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]\s*(.*)$')
+_UNESCAPE_RE = re.compile(r'\\(.)')
+_ESCAPES = {'n': '\n', 't': '\t', 'b': '\b', '"': '"', '\\': '\\'}
+
+
+def read_azure_profile() -> Optional[Tuple[bool, str, Dict[str, Any]]]:
+    """
+    Read the Azure CLI login state from azureProfile.json.
+
+    Returns:
+        Tuple of (is_authenticated, message, account), or None if
+        undetermined. The account is the default subscription entry, which
+        has the same shape as the `az account show` output.
+    """
+    profile_path = azure_config_dir() / 'azureProfile.json'
+    try:
+        # The Azure CLI writes this file with a UTF-8 byte order mark
+        profile = json.loads(profile_path.read_text(encoding='utf-8-sig'))
+    except (OSError, ValueError):
+        return None
+
+    subscriptions = profile.get('subscriptions') if isinstance(profile, dict) else None
+    if not isinstance(subscriptions, list):
+        return None
+    if not subscriptions:
+        return False, "Not authenticated. Run 'az login' to authenticate.", {}
+
+    defaults = [sub for sub in subscriptions if isinstance(sub, dict) and sub.get('isDefault')]
+    if len(defaults) != 1:
+        return None
+
+    user = defaults[0].get('user')
+    user = user.get('name') if isinstance(user, dict) else None
+    if not user or not isinstance(user, str):
+        return None
+    return True, f"Authenticated as: {user}", defaults[0]
+
+
+def _load_yaml() -> Optional[Any]:
+    """Import PyYAML on first use; it is optional and slow to import."""
+    try:
+        import yaml
+    except ImportError:
+        return None
+    return yaml
+
+
+def read_gh_hosts(host: str = 'github.com') -> Optional[Tuple[bool, str, Dict[str, Any]]]:
+    """
+    Read the GitHub CLI login state from hosts.yml.
+
+    Tokens kept in the system keyring or supplied through environment
+    variables cannot be seen from the file, so those cases are undetermined.
+
+    Args:
+        host: GitHub host to look up
+
+    Returns:
+        Tuple of (is_authenticated, message, details), or None if
+        undetermined. Details hold the 'login' of the authenticated user.
+    """
+    if any(os.getenv(var) for var in GITHUB_TOKEN_VARS):
+        return None
+    yaml = _load_yaml()
+    if yaml is None:
+        return None
+
+    try:
+        hosts = yaml.safe_load((gh_config_dir() / 'hosts.yml').read_text())
+    except (OSError, yaml.YAMLError):
+        return None
+
+    if not isinstance(hosts, dict):
+        return None
+
+    entry = hosts.get(host)
+    if entry is None:
+        return False, "Not authenticated. Run 'gh auth login' to authenticate.", {}
+    if not isinstance(entry, dict):
+        return None
+
+    user = entry.get('user')
+    if not user or not entry.get('oauth_token'):
+        return None
+    return True, f"Authenticated: Logged in to {host} account {user} (hosts.yml)", {'login': user}
+
+
+def _parse_value(raw: str) -> str:
+    """Parse a gitconfig value: strip comments, quotes and escapes."""
+    value = []
+    in_quotes = False
+    index = 0
+    while index < len(raw):
+        char = raw[index]
+        if char == '\\' and index + 1 < len(raw):
+            value.append(_ESCAPES.get(raw[index + 1], raw[index + 1]))
+            index += 2
+            continue
+        if char == '"':
+            in_quotes = not in_quotes
+        elif char in '#;' and not in_quotes:
+            break
+        else:
+            value.append(char)
+        index += 1
+    return ''.join(value).strip()
+
+
+def parse_gitconfig(text: str) -> Optional[Dict[str, List[str]]]:
+    """
+    Parse gitconfig text into a mapping of 'section.key' to its values.
+
+    Section and key names are lower-cased, matching `git config --list`.
+
+    Args:
+        text: Content of a gitconfig file
+
+    Returns:
+        Mapping of key to values, or None if the file uses includes or
+        multi-line values that are not handled here
+    """
+    config: Dict[str, List[str]] = {}
+    section = None
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line[0] in '#;':
+            continue
+
+        if line.startswith('['):
+            match = _SECTION_RE.match(line)
+            if not match:
+                return None
+            name, subsection, line = match.groups()
+            name = name.lower()
+            if name in ('include', 'includeif'):
+                return None
+            if subsection is not None:
+                name += '.' + _UNESCAPE_RE.sub(r'\1', subsection)
+            section = name
+            if not line:
+                continue
+
+        if section is None or line.endswith('\\'):
+            return None
+
+        key, sep, raw_value = line.partition('=')
+        value = _parse_value(raw_value) if sep else 'true'
+        config.setdefault(f"{section}.{key.strip().lower()}", []).append(value)
+
+    return config
+
+
+def read_gitconfig() -> Optional[GitConfig]:
+    """
+    Read the global Git configuration files.
+
+    Returns:
+        Mapping of 'section.key' to its values, or None if undetermined
+    """
+    existing = [path for path in git_config_files() if path.is_file()]
+    if not existing:
+        return None
+
+    config = GitConfig()
+    # git reads the XDG file before ~/.gitconfig, so later values win
+    for path in reversed(existing):
+        try:
+            parsed = parse_gitconfig(path.read_text())
+        except (OSError, UnicodeDecodeError):
+            return None
+        if parsed is None:
+            return None
+        for key, values in parsed.items():
+            config.setdefault(key, []).extend(values)
+    return config
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Git Configuration Reader
+This module reads Git settings in a single `git config --list -z` call, so
+checks that need several keys do not start one git process per key.
+"""
+
+import subprocess
+from typing import Dict, List
+
+
+class GitConfig(Dict[str, List[str]]):
+    """
+    Mapping of 'section.key' (or 'section.subsection.key') to all its values.
+
+    Multi-valued keys such as credential.helper keep every value in the
+    order git reports them; value() returns the effective (last) one.
+    """
+
+    def value(self, key: str, default: str = '') -> str:
+        """
+        Return the effective value of a key.
+
+        Section and key names are case-insensitive, subsection names are
+        not: 'Credential.https://Example.com.Helper' looks up
+        'credential.https://Example.com.helper'.
+
+        Args:
+            key: Config key, e.g. 'user.signingkey'
+            default: Value returned when the key is not set
+
+        Returns:
+            The last value git reports for the key, or default
+        """
+        section, _, rest = key.partition('.')
+        subsection, dot, name = rest.rpartition('.')
+        values = self.get(f"{section.lower()}.{subsection}{dot}{name.lower()}")
+        return values[-1] if values else default
+
+
+def parse_config_list(output: str) -> GitConfig:
+    """
+    Parse the NUL-delimited output of `git config --list -z`.
+
+    Each entry is the key, a newline, then the value; a key without a
+    newline is a boolean set to true.
+
+    Args:
+        output: Raw stdout of git config --list -z
+
+    Returns:
+        Parsed configuration
+    """
+    config = GitConfig()
+    for entry in output.split('\0'):
+        if not entry:
+            continue
+        key, sep, value = entry.partition('\n')
+        config.setdefault(key, []).append(value if sep else 'true')
+    return config
+
+
+def read_git_config(scope: str = 'global', timeout: int = 5) -> GitConfig:
+    """
+    Read every Git setting for a scope with one git invocation.
+
+    Args:
+        scope: Config scope: 'global', 'system' or 'local'
+        timeout: Seconds to wait for git
+
+    Returns:
+        Parsed configuration (empty if the scope has no config file)
+
+    Raises:
+        FileNotFoundError: If git is not installed
+        subprocess.TimeoutExpired: If git does not answer in time
+    """
+    result = subprocess.run(
+        ['git', 'config', f'--{scope}', '--list', '-z'],
+        capture_output=True,
+        text=True,
+        timeout=timeout
+    )
+
+    # git exits non-zero when the scope's config file does not exist
+    if result.returncode != 0:
+        return GitConfig()
+    return parse_config_list(result.stdout)
@@ -4,16 +4,27 @@ Post-Authentication Setup Script
 This script runs after user authentication to set up the environment.
 """
 
+import asyncio
+import json
 import subprocess
 import sys
 import os
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from check_authentication import AuthResults, collect_auth_results
+from command_runner import run_command_async
+from probe_cache import ProbeCache
+from task_scheduler import Task, run_tasks
 
 
 def run_command(command: list, description: str) -> bool:
     """
     Run a shell command and return success status.
     
+    Output is streamed line by line while the command runs; only the last
+    lines are kept in memory for the error report.
+    
     Args:
         command: Command to run as list
         description: Description of what the command does
@@ -21,6 +32,20 @@ def run_command(command: list, description: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
+    return asyncio.run(run_command_async(command, description)).ok
+
+
+def run_json_command(command: list, description: str) -> Optional[Any]:
+    """
+    Run a command that prints JSON and return the parsed output.
+    
+    Args:
+        command: Command to run as list
+        description: Description of what the command does
+        
+    Returns:
+        Parsed JSON output, or None if the command failed
+    """
     print(f"🔄 {description}...")
     try:
         result = subprocess.run(
@@ -31,58 +56,134 @@ def run_command(command: list, description: str) -> bool:
         )
         
         if result.returncode == 0:
-            print(f"  ✅ Success")
-            if result.stdout.strip():
-                print(f"  Output: {result.stdout.strip()[:100]}")
-            return True
+            return json.loads(result.stdout)
         else:
             print(f"  ❌ Failed: {result.stderr.strip()[:100]}")
-            return False
+            return None
     except subprocess.TimeoutExpired:
         print(f"  ⏱️  Command timed out")
-        return False
+        return None
+    except json.JSONDecodeError:
+        print(f"  ❌ Could not parse command output")
+        return None
     except Exception as e:
         print(f"  ❌ Error: {str(e)}")
-        return False
+        return None
 
 
-def setup_azure_resources() -> bool:
+def format_table(rows: List[Dict[str, Any]], columns: List[Tuple[str, str]]) -> str:
+    """
+    Render rows as a plain text table in the style of `az --output table`.
+    
+    Args:
+        rows: Records to render
+        columns: (header, field) pairs; field may be a dotted path
+        
+    Returns:
+        The rendered table
+    """
+    def field_value(row: Dict[str, Any], field: str) -> str:
+        value: Any = row
+        for part in field.split('.'):
+            value = value.get(part) if isinstance(value, dict) else None
+        return "" if value is None else str(value)
+    
+    cells = [[field_value(row, field) for _, field in columns] for row in rows]
+    widths = [
+        max([len(header)] + [len(row[index]) for row in cells])
+        for index, (header, _) in enumerate(columns)
+    ]
+    
+    lines = [
+        "  ".join(header.ljust(width) for (header, _), width in zip(columns, widths)),
+        "  ".join("-" * width for width in widths)
+    ]
+    for row in cells:
+        lines.append("  ".join(value.ljust(width) for value, width in zip(row, widths)))
+    return "\n".join(line.rstrip() for line in lines)
+
+
+# Columns of `az account list --output table` and `az account show --output table`
+SUBSCRIPTION_LIST_COLUMNS = [
+    ("Name", "name"),
+    ("CloudName", "cloudName"),
+    ("SubscriptionId", "id"),
+    ("TenantId", "tenantId"),
+    ("State", "state"),
+    ("IsDefault", "isDefault"),
+]
+SUBSCRIPTION_SHOW_COLUMNS = [
+    ("EnvironmentName", "environmentName"),
+    ("HomeTenantId", "homeTenantId"),
+    ("IsDefault", "isDefault"),
+    ("Name", "name"),
+    ("State", "state"),
+    ("TenantId", "tenantId"),
+]
+
+
+def setup_azure_resources(auth: Optional[AuthResults] = None) -> bool:
     """
     Set up Azure resources after authentication.
     
+    The subscription list is fetched once as JSON; both the subscription
+    table and the current subscription view are rendered from it.
+    
+    Args:
+        auth: Authentication results; the current account is taken from
+            here when the subscription list has no default entry
+    
     Returns:
         True if successful, False otherwise
     """
     print("\n📦 Setting up Azure resources...")
     
     # List Azure subscriptions
-    success = run_command(
-        ['az', 'account', 'list', '--output', 'table'],
+    subscriptions = run_json_command(
+        ['az', 'account', 'list', '--output', 'json'],
         "Listing Azure subscriptions"
     )
     
-    if not success:
+    if not isinstance(subscriptions, list):
         return False
     
+    print(f"  ✅ Success")
+    print(format_table(subscriptions, SUBSCRIPTION_LIST_COLUMNS))
+    
     # Show current subscription
-    run_command(
-        ['az', 'account', 'show', '--output', 'table'],
-        "Showing current Azure subscription"
-    )
+    print("🔄 Showing current Azure subscription...")
+    current = next((sub for sub in subscriptions if sub.get('isDefault')), None)
+    if current is None and auth and auth.azure_account:
+        current = auth.azure_account
+    
+    if current is None:
+        print("  ⚠️  No default subscription set. Use: az account set --subscription <id>")
+    else:
+        print(format_table([current], SUBSCRIPTION_SHOW_COLUMNS))
     
     return True
 
 
-def setup_github_config() -> bool:
+def setup_github_config(auth: Optional[AuthResults] = None) -> bool:
     """
     Set up GitHub configuration after authentication.
     
+    Args:
+        auth: Authentication results; the GitHub login is reused from here
+            instead of asking the GitHub API again
+    
     Returns:
         True if successful, False otherwise
     """
     print("\n🐙 Setting up GitHub configuration...")
     
     # Get current user
+    login = auth.github_login if auth else None
+    if login:
+        print("🔄 Getting GitHub user info...")
+        print(f"  ✅ Logged in as: {login}")
+        return True
+    
     success = run_command(
         ['gh', 'api', 'user', '--jq', '.login'],
         "Getting GitHub user info"
@@ -94,10 +195,13 @@ def setup_github_config() -> bool:
     return True
 
 
-def create_sample_workspace() -> bool:
+def create_sample_workspace(auth: Optional[AuthResults] = None) -> bool:
     """
     Create sample workspace directories and files.
     
+    Args:
+        auth: Authentication results (unused; accepted like the other tasks)
+    
     Returns:
         True if successful, False otherwise
     """
@@ -157,43 +261,43 @@ def main() -> int:
     print("🚀 Post-Authentication Setup\n")
     print("="*60)
     
-    # First, verify authentication
+    # First, verify authentication (in-process, reusing cached probe results)
     print("\n🔐 Verifying authentication...")
-    auth_check = subprocess.run(
-        [sys.executable, 'scripts/check_authentication.py'],
-        capture_output=True
-    )
+    auth = collect_auth_results(ProbeCache())
     
-    if auth_check.returncode != 0:
+    if not auth.all_passed:
         print("⚠️  Authentication verification failed!")
+        for service, (is_ok, message) in auth.statuses.items():
+            if not is_ok:
+                print(f"  ❌ {service}: {message}")
         print("Please run scripts/check_authentication.py for details.")
         return 1
     
     print("✅ Authentication verified!")
     
-    # Run setup tasks
+    # Run setup tasks; independent tasks run concurrently, and a task
+    # listed in depends_on only starts once those tasks have succeeded
     tasks = [
-        ("Azure Resources", setup_azure_resources),
-        ("GitHub Configuration", setup_github_config),
-        ("Sample Workspace", create_sample_workspace)
+        Task("Azure Resources", setup_azure_resources),
+        Task("GitHub Configuration", setup_github_config),
+        Task("Sample Workspace", create_sample_workspace)
     ]
     
-    failed_tasks = []
-    
-    for task_name, task_func in tasks:
-        try:
-            if not task_func():
-                failed_tasks.append(task_name)
-        except Exception as e:
-            print(f"❌ Error in {task_name}: {str(e)}")
-            failed_tasks.append(task_name)
+    results = run_tasks(tasks, args=(auth,))
+    failed_tasks = [result for result in results if not result.ok]
     
     print("\n" + "="*60)
     
+    print("⏱️  Task timings:")
+    for result in results:
+        status_icon = "✅" if result.ok else ("⏭️ " if result.skipped else "❌")
+        print(f"  {status_icon} {result.name}: {result.elapsed:.2f}s")
+    
     if failed_tasks:
         print(f"⚠️  Setup completed with {len(failed_tasks)} failed task(s):")
-        for task in failed_tasks:
-            print(f"  - {task}")
+        for result in failed_tasks:
+            reason = f" ({result.error})" if result.error else ""
+            print(f"  - {result.name}{reason}")
         return 1
     else:
         print("✅ Post-authentication setup completed successfully!")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Authentication Probe Cache
+This module caches authentication probe results on disk so that repeated
+checks in the same container session do not start a new az/gh process.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / 'workspace' / '.cache'
+DEFAULT_TTL = 300
+CACHE_FILE_NAME = 'auth_probes.json'
+# Key set in a probe result's details when the probe could not reach an
+# answer (timeout, CLI not installed, unexpected error); such results are
+# returned but never cached, so the next check tries again
+TRANSIENT = 'transient'
+# Suffix of the cache key of a probe run with fast=True; the in-process and
+# CLI probes can disagree (gh hosts.yml is not validated online), so their
+# results are cached separately against the same credential files
+FAST_SUFFIX = '-fast'
+# Bump when the shape of cached probe results changes
+CACHE_VERSION = 2
+
+
+def azure_config_dir() -> Path:
+    """Return the Azure CLI configuration directory."""
+    return Path(os.getenv('AZURE_CONFIG_DIR') or Path.home() / '.azure')
+
+
+def gh_config_dir() -> Path:
+    """Return the GitHub CLI configuration directory."""
+    if os.getenv('GH_CONFIG_DIR'):
+        return Path(os.environ['GH_CONFIG_DIR'])
+    config_home = os.getenv('XDG_CONFIG_HOME') or Path.home() / '.config'
+    return Path(config_home) / 'gh'
+
+
+def git_config_files() -> List[Path]:
+    """Return the files that make up the global Git configuration."""
+    if os.getenv('GIT_CONFIG_GLOBAL'):
+        return [Path(os.environ['GIT_CONFIG_GLOBAL'])]
+    config_home = os.getenv('XDG_CONFIG_HOME') or Path.home() / '.config'
+    return [Path.home() / '.gitconfig', Path(config_home) / 'git' / 'config']
+
+
+# Credential files whose modification invalidates a cached probe result
+PROBE_FILES: Dict[str, Callable[[], List[Path]]] = {
+    'azure': lambda: [
+        azure_config_dir() / 'azureProfile.json',
+        azure_config_dir() / 'msal_token_cache.json',
+        azure_config_dir() / 'msal_token_cache.bin',
+    ],
+    'github': lambda: [
+        gh_config_dir() / 'hosts.yml',
+        gh_config_dir() / 'config.yml',
+    ],
+    'git': git_config_files,
+}
+
+
+def fingerprint(probe: str) -> List[List[Any]]:
+    """
+    Build a fingerprint of the credential files a probe depends on.
+
+    Args:
+        probe: Probe name (a key of PROBE_FILES, optionally with FAST_SUFFIX)
+
+    Returns:
+        List of [path, mtime_ns, size] entries; missing files have None values
+    """
+    if probe.endswith(FAST_SUFFIX):
+        probe = probe[:-len(FAST_SUFFIX)]
+    entries = []
+    for path in PROBE_FILES.get(probe, lambda: [])():
+        try:
+            stat = path.stat()
+            entries.append([str(path), stat.st_mtime_ns, stat.st_size])
+        except OSError:
+            entries.append([str(path), None, None])
+    return entries
+
+
+class ProbeCache:
+    """
+    On-disk cache of probe results, keyed by probe name.
+
+    An entry is reused while it is younger than the TTL and the credential
+    files it was recorded against have not changed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: Optional[float] = None,
+        refresh: bool = False
+    ):
+        """
+        Args:
+            cache_dir: Directory for the cache file (defaults to workspace/.cache)
+            ttl: Seconds an entry stays valid (0 disables the cache)
+            refresh: Ignore existing entries and record fresh results
+        """
+        if cache_dir is None:
+            cache_dir = os.getenv('LE2_CACHE_DIR') or DEFAULT_CACHE_DIR
+        if ttl is None:
+            ttl = float(os.getenv('LE2_AUTH_CACHE_TTL', DEFAULT_TTL))
+
+        self.path = Path(cache_dir) / CACHE_FILE_NAME
+        self.ttl = ttl
+        self.refresh = refresh
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text())
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, probe: str) -> Optional[List[Any]]:
+        """
+        Return the cached result for a probe, or None if it is missing or stale.
+        """
+        if self.refresh or self.ttl <= 0:
+            return None
+
+        with self._lock:
+            entry = self._load().get(probe)
+
+        if not isinstance(entry, dict) or entry.get('version') != CACHE_VERSION:
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.ttl:
+            return None
+        if entry.get('fingerprint') != fingerprint(probe):
+            return None
+        return entry.get('result')
+
+    def put(self, probe: str, result: List[Any]) -> None:
+        """Record a probe result together with its credential fingerprint."""
+        if self.ttl <= 0:
+            return
+
+        with self._lock:
+            data = self._load()
+            data[probe] = {
+                'version': CACHE_VERSION,
+                'timestamp': time.time(),
+                'fingerprint': fingerprint(probe),
+                'result': result,
+            }
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+                with os.fdopen(fd, 'w') as tmp_file:
+                    json.dump(data, tmp_file)
+                os.replace(tmp_name, self.path)
+            except OSError:
+                # The cache is an optimization only; never fail a check over it
+                pass
+
+    def cached(self, probe: str, func: Callable[[], tuple]) -> Callable[[], tuple]:
+        """
+        Wrap a probe function so its result is served from the cache.
+
+        Only definite results are recorded: results marked TRANSIENT in
+        their details, and exceptions, are passed through uncached.
+
+        Args:
+            probe: Probe name used as the cache key
+            func: Probe function returning a tuple
+
+        Returns:
+            Function with the same signature as func
+        """
+        def wrapper() -> tuple:
+            result = self.get(probe)
+            if result is not None:
+                return tuple(result)
+            result = func()
+            details = result[2] if len(result) > 2 else None
+            if not (isinstance(details, dict) and details.get(TRANSIENT)):
+                self.put(probe, list(result))
+            return result
+
+        wrapper.__name__ = getattr(func, '__name__', probe)
+        wrapper.__doc__ = func.__doc__
+        return wrapper
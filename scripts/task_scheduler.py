@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Task Scheduler
+This module runs setup tasks on a worker pool, starting every task as soon
+as the tasks it depends on have succeeded.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+class Task:
+    """A named unit of setup work with the names of the tasks it depends on."""
+
+    def __init__(self, name: str, func: Callable[..., bool], depends_on: Sequence[str] = ()):
+        """
+        Args:
+            name: Unique task name, used in output and in depends_on
+            func: Function returning True on success
+            depends_on: Names of tasks that must succeed before this one runs
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = list(depends_on)
+
+
+class TaskResult:
+    """Outcome of a task: success flag, wall time and error, if any."""
+
+    def __init__(self, name: str, ok: bool, elapsed: float = 0.0,
+                 error: Optional[str] = None, skipped: bool = False):
+        self.name = name
+        self.ok = ok
+        self.elapsed = elapsed
+        self.error = error
+        self.skipped = skipped
+
+
+class _TaskOutput:
+    """
+    Stand-in for sys.stdout while tasks run concurrently.
+
+    Output written from a task's thread is emitted line by line, prefixed
+    with the task name, so lines from parallel tasks never interleave
+    mid-line and can be told apart.
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def begin(self, label: str) -> None:
+        self._local.label = label
+        self._local.buffer = ''
+
+    def end(self) -> None:
+        if getattr(self._local, 'buffer', ''):
+            self._emit(self._local.buffer)
+        self._local.label = None
+        self._local.buffer = ''
+
+    def _emit(self, line: str) -> None:
+        with self._lock:
+            self._stream.write(f"[{self._local.label}] {line}\n" if line.strip() else "\n")
+            self._stream.flush()
+
+    def write(self, text: str) -> int:
+        if getattr(self._local, 'label', None) is None:
+            with self._lock:
+                return self._stream.write(text)
+
+        self._local.buffer += text
+        *lines, self._local.buffer = self._local.buffer.split('\n')
+        for line in lines:
+            self._emit(line)
+        return len(text)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def _check_graph(tasks: Sequence[Task]) -> None:
+    """Raise ValueError for duplicate names, unknown dependencies or cycles."""
+    by_name: Dict[str, Task] = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise ValueError(f"Duplicate task name: {task.name}")
+        by_name[task.name] = task
+
+    for task in tasks:
+        for dependency in task.depends_on:
+            if dependency not in by_name:
+                raise ValueError(f"Task '{task.name}' depends on unknown task '{dependency}'")
+
+    visiting, done = set(), set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle involving task '{name}'")
+        visiting.add(name)
+        for dependency in by_name[name].depends_on:
+            visit(dependency)
+        visiting.discard(name)
+        done.add(name)
+
+    for task in tasks:
+        visit(task.name)
+
+
+def run_tasks(
+    tasks: Sequence[Task],
+    args: Sequence[Any] = (),
+    max_workers: int = 4
+) -> List[TaskResult]:
+    """
+    Run tasks concurrently while respecting their dependencies.
+
+    A task starts as soon as all of its dependencies have succeeded; if a
+    dependency fails, the task is skipped and reported as failed.
+
+    Args:
+        tasks: Tasks to run
+        args: Positional arguments passed to every task function
+        max_workers: Maximum number of tasks running at once
+
+    Returns:
+        One TaskResult per task, in the order the tasks were given
+
+    Raises:
+        ValueError: If the dependency graph is invalid
+    """
+    _check_graph(tasks)
+
+    results: Dict[str, TaskResult] = {}
+    pending = list(tasks)
+    running: Dict[Future, Task] = {}
+    output = _TaskOutput(sys.stdout)
+
+    def execute(task: Task) -> TaskResult:
+        output.begin(task.name)
+        start = time.perf_counter()
+        try:
+            ok = bool(task.func(*args))
+            error = None
+        except Exception as e:
+            ok = False
+            error = str(e)
+            print(f"❌ Error in {task.name}: {error}")
+        finally:
+            output.end()
+        return TaskResult(task.name, ok, time.perf_counter() - start, error)
+
+    def schedule(executor: ThreadPoolExecutor) -> None:
+        for task in list(pending):
+            states = [results.get(name) for name in task.depends_on]
+            if any(state is not None and not state.ok for state in states):
+                failed = next(name for name, state in zip(task.depends_on, states)
+                              if state is not None and not state.ok)
+                results[task.name] = TaskResult(
+                    task.name, False, error=f"skipped: '{failed}' failed", skipped=True
+                )
+                pending.remove(task)
+            elif all(state is not None for state in states):
+                running[executor.submit(execute, task)] = task
+                pending.remove(task)
+
+    original_stdout = sys.stdout
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Skipping a task can unblock (skip) its dependents, so keep
+            # scheduling until nothing changes
+            while pending or running:
+                before = len(pending)
+                schedule(executor)
+                if len(pending) != before:
+                    continue
+                if not running:
+                    raise RuntimeError("No runnable tasks left")
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = running.pop(future)
+                    results[task.name] = future.result()
+    finally:
+        sys.stdout = original_stdout
+
+    return [results[task.name] for task in tasks]
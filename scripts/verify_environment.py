@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+Environment Verification Script
+This script checks that the command line tools and Python packages the
+devcontainer provides are installed.
+
+Commands are looked up on PATH in-process and their `--version` probes run
+concurrently, each under its own timeout, so slow CLIs such as az and
+dotnet no longer add up. Every package is resolved in this one interpreter
+with importlib.util.find_spec and its version read from the package
+metadata; no package is imported, so the check takes a fraction of a second
+even for packages that are slow to import.
+
+The report is printed in verify_setup.sh's format and can also be written
+as JSON with --json.
+"""
+
+import argparse
+import importlib.util
+import json
+import re
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib import metadata
+from importlib.machinery import ModuleSpec, PathFinder
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+
+GREEN = '\033[0;32m'
+RED = '\033[0;31m'
+NC = '\033[0m'
+
+# (heading, commands) in the order verify_setup.sh reports them
+COMMAND_SECTIONS: List[Tuple[str, List[str]]] = [
+    ("Checking Base System...", ['python', 'pip', 'dotnet', 'git']),
+    ("Checking Azure Tools...", ['az']),
+    ("Checking AI/LLM Tools...", ['llm', 'fabric']),
+]
+
+# Seconds a `--version` probe may take; az loads its extensions and dotnet
+# may run its first-use setup, so they get longer than the rest
+DEFAULT_VERSION_TIMEOUT = 5.0
+VERSION_TIMEOUTS: Dict[str, float] = {
+    'az': 30.0,
+    'dotnet': 15.0,
+}
+
+# (heading, import names) in the order verify_setup.sh reports them
+PACKAGE_SECTIONS: List[Tuple[str, List[str]]] = [
+    ("Checking Python AI Libraries...", [
+        'openai', 'anthropic', 'langchain', 'azure.ai.ml', 'azure.ai.textanalytics', 'azure.identity',
+    ]),
+    ("Checking Data Science Libraries...", [
+        'numpy', 'pandas', 'sklearn', 'matplotlib', 'jupyter',
+    ]),
+    ("Checking Development Tools...", [
+        'black', 'pylint', 'pytest', 'mypy',
+    ]),
+    ("Checking Additional Utilities...", [
+        'requests', 'dotenv', 'yaml',
+    ]),
+]
+
+
+class CommandStatus(NamedTuple):
+    """Result of checking one command."""
+    name: str
+    path: Optional[str]
+    version: Optional[str] = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def installed(self) -> bool:
+        return self.path is not None
+
+
+class PackageStatus(NamedTuple):
+    """Result of checking one importable package."""
+    name: str
+    installed: bool
+    version: Optional[str] = None
+
+
+def probe_version(name: str, path: str, timeout: float = DEFAULT_VERSION_TIMEOUT) -> CommandStatus:
+    """
+    Run `<command> --version` and keep the first line of its output.
+
+    Args:
+        name: Command name
+        path: Resolved executable
+        timeout: Seconds before the probe is abandoned
+
+    Returns:
+        Status of the command; error is set if the probe failed or timed out
+    """
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [path, '--version'],
+            capture_output=True,
+            text=True,
+            stdin=subprocess.DEVNULL,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        return CommandStatus(name, path, error=f"timed out after {timeout:g}s",
+                             seconds=time.perf_counter() - start)
+    except OSError as e:
+        return CommandStatus(name, path, error=str(e), seconds=time.perf_counter() - start)
+
+    # Some tools print their version on stderr
+    lines = (result.stdout + result.stderr).strip().splitlines()
+    return CommandStatus(name, path, version=lines[0].strip() if lines else None,
+                         seconds=time.perf_counter() - start)
+
+
+def start_command_checks(
+    names: List[str],
+    executor: ThreadPoolExecutor,
+    timeouts: Optional[Dict[str, float]] = None
+) -> List[Any]:
+    """
+    Look up commands on PATH and start their version probes.
+
+    Args:
+        names: Command names
+        executor: Pool the probes run on
+        timeouts: Per-command probe timeouts (VERSION_TIMEOUTS by default)
+
+    Returns:
+        One entry per name, in order: a Future of the CommandStatus for
+        commands found on PATH, a CommandStatus for the missing ones
+    """
+    timeouts = VERSION_TIMEOUTS if timeouts is None else timeouts
+    pending: List[Any] = []
+    for name in names:
+        path = shutil.which(name)
+        if path is None:
+            pending.append(CommandStatus(name, None))
+        else:
+            timeout = timeouts.get(name, DEFAULT_VERSION_TIMEOUT)
+            pending.append(executor.submit(probe_version, name, path, timeout))
+    return pending
+
+
+def check_commands(names: List[str], timeouts: Optional[Dict[str, float]] = None) -> List[CommandStatus]:
+    """
+    Check whether each command is on PATH and read its version.
+
+    The version probes run concurrently, so the check takes as long as the
+    slowest probe rather than the sum of all of them.
+
+    Args:
+        names: Command names
+        timeouts: Per-command probe timeouts (VERSION_TIMEOUTS by default)
+
+    Returns:
+        One CommandStatus per name, in order
+    """
+    with ThreadPoolExecutor(max_workers=max(1, len(names))) as executor:
+        pending = start_command_checks(names, executor, timeouts)
+        return [item.result() if isinstance(item, Future) else item for item in pending]
+
+
+def find_spec(name: str) -> Optional[ModuleSpec]:
+    """
+    Locate a module without importing it or its parent packages.
+
+    importlib.util.find_spec() imports the parents of a dotted name; here
+    each level is looked up in the search path of the one above instead.
+
+    Args:
+        name: Import name, e.g. 'azure.ai.textanalytics'
+
+    Returns:
+        The module spec, or None if the module cannot be found
+    """
+    top, *rest = name.split('.')
+    try:
+        spec = importlib.util.find_spec(top)
+    except (ImportError, ValueError):
+        return None
+
+    path = top
+    for part in rest:
+        if spec is None or spec.submodule_search_locations is None:
+            return None
+        path = f"{path}.{part}"
+        spec = PathFinder.find_spec(path, list(spec.submodule_search_locations))
+    return spec
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def package_version(name: str, distributions: Optional[Dict[str, List[str]]] = None) -> Optional[str]:
+    """
+    Read the installed version of the distribution providing an import name.
+
+    Args:
+        name: Import name, e.g. 'sklearn' or 'azure.identity'
+        distributions: importlib.metadata.packages_distributions() result,
+            passed in so the installed distributions are scanned only once
+
+    Returns:
+        The version, or None if no distribution metadata is found (e.g.
+        standard library modules)
+    """
+    if distributions is None:
+        distributions = metadata.packages_distributions()
+
+    # Namespace packages such as azure are shared by many distributions;
+    # prefer the one named after the full import name
+    candidates = distributions.get(name.split('.')[0], [])
+    wanted = _normalize(name)
+    matching = [dist for dist in candidates if _normalize(dist) == wanted]
+    if not matching and len(candidates) == 1:
+        matching = candidates
+
+    for dist in matching or [name.replace('.', '-')]:
+        try:
+            return metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            continue
+    return None
+
+
+def check_packages(names: List[str]) -> List[PackageStatus]:
+    """
+    Check whether each package can be imported, without importing it.
+
+    Args:
+        names: Import names
+
+    Returns:
+        One PackageStatus per name, in order
+    """
+    distributions = metadata.packages_distributions()
+    results = []
+    for name in names:
+        if find_spec(name) is None:
+            results.append(PackageStatus(name, False))
+        else:
+            results.append(PackageStatus(name, True, package_version(name, distributions)))
+    return results
+
+
+def format_command(status: CommandStatus) -> str:
+    """Report line of a command check, as printed by verify_setup.sh."""
+    if not status.installed:
+        return f"{RED}✗{NC} {status.name} is NOT installed"
+    line = f"{GREEN}✓{NC} {status.name} is installed"
+    if status.error:
+        line += f"\n  Version: unknown ({status.error})"
+    elif status.version:
+        line += f"\n  Version: {status.version}"
+    return line
+
+
+def format_package(status: PackageStatus) -> str:
+    """Report line of a package check, as printed by verify_setup.sh."""
+    if status.installed:
+        line = f"{GREEN}✓{NC} Python package '{status.name}' is installed"
+        if status.version:
+            line += f"\n  Version: {status.version}"
+        return line
+    return f"{RED}✗{NC} Python package '{status.name}' is NOT installed"
+
+
+def verify(
+    command_sections: List[Tuple[str, List[str]]] = COMMAND_SECTIONS,
+    package_sections: List[Tuple[str, List[str]]] = PACKAGE_SECTIONS,
+    timeouts: Optional[Dict[str, float]] = None
+) -> Dict[str, Any]:
+    """
+    Check every command and package.
+
+    The version probes of all commands are started first and run while the
+    packages are resolved, so the whole check takes about as long as the
+    slowest probe.
+
+    Args:
+        command_sections: (heading, commands) pairs
+        package_sections: (heading, import names) pairs
+        timeouts: Per-command probe timeouts (VERSION_TIMEOUTS by default)
+
+    Returns:
+        Report with the number of "issues" (missing commands and packages),
+        the elapsed "seconds" and the checked "sections", each a dict with
+        its "heading" and "checks" (CommandStatus or PackageStatus)
+    """
+    start = time.perf_counter()
+    commands = [name for _, names in command_sections for name in names]
+    with ThreadPoolExecutor(max_workers=max(1, len(commands))) as executor:
+        pending = [(heading, start_command_checks(names, executor, timeouts))
+                   for heading, names in command_sections]
+        sections: List[Dict[str, Any]] = [
+            {"heading": heading, "checks": check_packages(names)}
+            for heading, names in package_sections
+        ]
+        sections[:0] = [
+            {"heading": heading,
+             "checks": [item.result() if isinstance(item, Future) else item for item in items]}
+            for heading, items in pending
+        ]
+
+    issues = sum(not check.installed for section in sections for check in section["checks"])
+    return {"issues": issues, "seconds": time.perf_counter() - start, "sections": sections}
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """The report sections in verify_setup.sh's format."""
+    lines = []
+    for section in report["sections"]:
+        lines.append(section["heading"])
+        lines.append("-" * 54)
+        for check in section["checks"]:
+            lines.append(format_command(check) if isinstance(check, CommandStatus) else format_package(check))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def report_to_json(report: Dict[str, Any]) -> Dict[str, Any]:
+    """The report as JSON-serializable data."""
+    def check_to_json(check: Any) -> Dict[str, Any]:
+        if isinstance(check, CommandStatus):
+            return {"type": "command", "name": check.name, "installed": check.installed,
+                    "path": check.path, "version": check.version, "error": check.error,
+                    "seconds": round(check.seconds, 3)}
+        return {"type": "package", "name": check.name, "installed": check.installed,
+                "version": check.version}
+
+    return {
+        "issues": report["issues"],
+        "seconds": round(report["seconds"], 3),
+        "python": sys.executable,
+        "sections": [
+            {"heading": section["heading"], "checks": [check_to_json(check) for check in section["checks"]]}
+            for section in report["sections"]
+        ],
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Check the devcontainer's tools and Python packages")
+    parser.add_argument(
+        'packages',
+        nargs='*',
+        help="import names to check instead of the default sections"
+    )
+    parser.add_argument(
+        '--command',
+        action='append',
+        default=[],
+        help="command to check instead of the default sections (repeatable)"
+    )
+    parser.add_argument(
+        '--json',
+        metavar='PATH',
+        help="also write the report as JSON to PATH ('-' prints only the JSON)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Print the verification report.
+
+    Returns:
+        The number of missing commands and packages (the exit status, as
+        verify_setup.sh counts issues)
+    """
+    args = parse_args(argv)
+    if args.packages or args.command:
+        command_sections = [("Checking Commands...", args.command)] if args.command else []
+        package_sections = [("Checking Python Packages...", args.packages)] if args.packages else []
+    else:
+        command_sections, package_sections = COMMAND_SECTIONS, PACKAGE_SECTIONS
+
+    report = verify(command_sections, package_sections)
+    data = json.dumps(report_to_json(report), indent=2)
+    if args.json == '-':
+        print(data)
+        return report["issues"]
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            f.write(data + "\n")
+    print(format_report(report))
+    return report["issues"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,11 @@
 Tests for authentication check script.
 """
 
+import json
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 import pytest
@@ -12,10 +15,30 @@ import pytest
 sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
 
 from check_authentication import (
+    probe_azure_auth,
     check_azure_auth,
     check_github_auth,
-    check_git_config
+    check_git_config,
+    collect_auth_results,
+    run_checks,
+    AuthResults
 )
+from credential_files import parse_gitconfig
+from git_config import parse_config_list, read_git_config
+from probe_cache import ProbeCache, fingerprint
+import post_auth_setup
+
+
+@pytest.fixture
+def isolated_home(tmp_path, monkeypatch):
+    """Point the credential file lookups at an empty home directory."""
+    home = tmp_path / 'home'
+    home.mkdir()
+    monkeypatch.setenv('HOME', str(home))
+    for var in ['AZURE_CONFIG_DIR', 'GH_CONFIG_DIR', 'XDG_CONFIG_HOME', 'GIT_CONFIG_GLOBAL',
+                'GH_TOKEN', 'GITHUB_TOKEN', 'GH_ENTERPRISE_TOKEN', 'GITHUB_ENTERPRISE_TOKEN']:
+        monkeypatch.delenv(var, raising=False)
+    return home
 
 
 class TestAzureAuth:
@@ -118,34 +141,23 @@ class TestGitConfig:
     @patch('subprocess.run')
     def test_git_config_success(self, mock_run):
         """Test successful Git configuration."""
-        def run_side_effect(*args, **kwargs):
-            command = args[0]
-            if 'user.name' in command:
-                return MagicMock(returncode=0, stdout='Test User\n')
-            elif 'user.email' in command:
-                return MagicMock(returncode=0, stdout='test@example.com\n')
-            return MagicMock(returncode=0, stdout='')
-        
-        mock_run.side_effect = run_side_effect
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='user.name\nTest User\0user.email\ntest@example.com\0core.editor\nvim\0'
+        )
         
         is_configured, message = check_git_config()
         
         assert is_configured is True
         assert "Test User" in message
         assert "test@example.com" in message
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ['git', 'config', '--global', '--list', '-z']
     
     @patch('subprocess.run')
     def test_git_config_missing_email(self, mock_run):
         """Test Git configuration with missing email."""
-        def run_side_effect(*args, **kwargs):
-            command = args[0]
-            if 'user.name' in command:
-                return MagicMock(returncode=0, stdout='Test User\n')
-            elif 'user.email' in command:
-                return MagicMock(returncode=1, stdout='')
-            return MagicMock(returncode=0, stdout='')
-        
-        mock_run.side_effect = run_side_effect
+        mock_run.return_value = MagicMock(returncode=0, stdout='user.name\nTest User\0')
         
         is_configured, message = check_git_config()
         
@@ -173,6 +185,384 @@ class TestGitConfig:
         assert "not installed" in message
 
 
+class TestFastProbes:
+    """Tests for the in-process credential file probes."""
+    
+    @patch('subprocess.run')
+    def test_azure_fast_reads_profile(self, mock_run, isolated_home):
+        """Test that the Azure profile is read without running az."""
+        azure_dir = isolated_home / '.azure'
+        azure_dir.mkdir()
+        (azure_dir / 'azureProfile.json').write_text(
+            '\ufeff{"subscriptions": [{"isDefault": true, "user": {"name": "test@example.com"}}]}',
+            encoding='utf-8'
+        )
+        
+        is_auth, message = check_azure_auth(fast=True)
+        
+        assert is_auth is True
+        assert "test@example.com" in message
+        mock_run.assert_not_called()
+    
+    @patch('subprocess.run')
+    def test_azure_fast_logged_out(self, mock_run, isolated_home):
+        """Test that an empty subscription list means not authenticated."""
+        azure_dir = isolated_home / '.azure'
+        azure_dir.mkdir()
+        (azure_dir / 'azureProfile.json').write_text('{"subscriptions": []}')
+        
+        is_auth, message = check_azure_auth(fast=True)
+        
+        assert is_auth is False
+        assert "Not authenticated" in message
+        mock_run.assert_not_called()
+    
+    @patch('subprocess.run')
+    def test_azure_fast_falls_back_without_profile(self, mock_run, isolated_home):
+        """Test that a missing profile falls back to the az CLI."""
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='{"user": {"name": "cli@example.com"}}'
+        )
+        
+        is_auth, message = check_azure_auth(fast=True)
+        
+        assert is_auth is True
+        assert "cli@example.com" in message
+        mock_run.assert_called_once()
+    
+    @patch('subprocess.run')
+    def test_azure_fast_falls_back_on_malformed_user(self, mock_run, isolated_home):
+        """Test that a null or non-object user falls back to the az CLI."""
+        azure_dir = isolated_home / '.azure'
+        azure_dir.mkdir()
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='{"user": {"name": "cli@example.com"}}'
+        )
+        
+        for user in ('null', '"test@example.com"', '{"name": null}'):
+            (azure_dir / 'azureProfile.json').write_text(
+                f'{{"subscriptions": [{{"isDefault": true, "user": {user}}}]}}'
+            )
+            is_auth, message = check_azure_auth(fast=True)
+            assert is_auth is True
+            assert "cli@example.com" in message
+        
+        assert mock_run.call_count == 3
+    
+    @patch('subprocess.run')
+    def test_github_fast_reads_hosts(self, mock_run, isolated_home):
+        """Test that gh hosts.yml is read without running gh."""
+        pytest.importorskip('yaml')
+        gh_dir = isolated_home / '.config' / 'gh'
+        gh_dir.mkdir(parents=True)
+        (gh_dir / 'hosts.yml').write_text(
+            'github.com:\n    user: testuser\n    oauth_token: gho_test\n    git_protocol: https\n'
+        )
+        
+        is_auth, message = check_github_auth(fast=True)
+        
+        assert is_auth is True
+        assert "testuser" in message
+        mock_run.assert_not_called()
+    
+    @patch('subprocess.run')
+    def test_github_fast_falls_back_for_keyring(self, mock_run, isolated_home):
+        """Test that a token kept in the keyring falls back to the gh CLI."""
+        pytest.importorskip('yaml')
+        gh_dir = isolated_home / '.config' / 'gh'
+        gh_dir.mkdir(parents=True)
+        (gh_dir / 'hosts.yml').write_text('github.com:\n    user: testuser\n')
+        mock_run.return_value = MagicMock(
+            returncode=0,
+            stdout='Logged in to github.com account testuser (keyring)',
+            stderr=''
+        )
+        
+        is_auth, _ = check_github_auth(fast=True)
+        
+        assert is_auth is True
+        mock_run.assert_called_once()
+    
+    @patch('subprocess.run')
+    def test_git_fast_reads_gitconfig(self, mock_run, isolated_home):
+        """Test that ~/.gitconfig is read without running git."""
+        (isolated_home / '.gitconfig').write_text(
+            '[user]\n\tname = "Test User"\n\temail = test@example.com ; work\n'
+        )
+        
+        is_configured, message = check_git_config(fast=True)
+        
+        assert is_configured is True
+        assert message == "Configured as: Test User <test@example.com>"
+        mock_run.assert_not_called()
+    
+    @patch('subprocess.run')
+    def test_git_fast_falls_back_for_includes(self, mock_run, isolated_home):
+        """Test that a gitconfig with includes falls back to git."""
+        (isolated_home / '.gitconfig').write_text('[include]\n\tpath = ~/.gitconfig.local\n')
+        mock_run.return_value = MagicMock(returncode=1, stdout='')
+        
+        is_configured, _ = check_git_config(fast=True)
+        
+        assert is_configured is False
+        assert mock_run.called
+    
+    def test_parse_gitconfig_subsections(self):
+        """Test gitconfig parsing of subsections and boolean keys."""
+        config = parse_gitconfig('[remote "origin"]\n\turl = git@github.com:o/r.git\n[core]\n\tbare\n')
+        
+        assert config == {
+            'remote.origin.url': ['git@github.com:o/r.git'],
+            'core.bare': ['true'],
+        }
+
+
+class TestRunChecks:
+    """Tests for the concurrent check engine."""
+    
+    def test_run_checks_preserves_order(self):
+        """Test that results come back in the order the checks were declared."""
+        def slow():
+            time.sleep(0.05)
+            return True, "slow"
+        
+        def fast():
+            return False, "fast"
+        
+        results = run_checks({"Slow": slow, "Fast": fast})
+        
+        assert list(results) == ["Slow", "Fast"]
+        assert results["Slow"] == (True, "slow")
+        assert results["Fast"] == (False, "fast")
+    
+    def test_run_checks_runs_concurrently(self):
+        """Test that all checks are started before any of them finishes."""
+        barrier = threading.Barrier(3, timeout=2)
+        
+        def check():
+            barrier.wait()
+            return True, "ok"
+        
+        results = run_checks({"A": check, "B": check, "C": check})
+        
+        assert all(is_ok for is_ok, _ in results.values())
+    
+    def test_run_checks_timeout(self):
+        """Test that a hanging check is reported as timed out."""
+        release = threading.Event()
+        
+        def hang():
+            release.wait(2)
+            return True, "late"
+        
+        start = time.monotonic()
+        results = run_checks({"Hang": hang, "Quick": lambda: (True, "ok")}, timeout=0.1)
+        elapsed = time.monotonic() - start
+        release.set()
+        
+        assert results["Hang"] == (False, "Authentication check timed out")
+        assert results["Quick"] == (True, "ok")
+        assert elapsed < 1
+    
+    def test_run_checks_exception(self):
+        """Test that an exception in one check does not affect the others."""
+        def broken():
+            raise RuntimeError("boom")
+        
+        results = run_checks({"Broken": broken, "Quick": lambda: (True, "ok")})
+        
+        assert results["Broken"][0] is False
+        assert "boom" in results["Broken"][1]
+        assert results["Quick"] == (True, "ok")
+
+
+class TestGitConfigReader:
+    """Tests for the batched Git config reader."""
+    
+    def test_parse_config_list(self):
+        """Test parsing of NUL-delimited config output."""
+        config = parse_config_list(
+            'user.name\nTest User\0credential.helper\ncache\0credential.helper\nstore\0'
+            'core.bare\0alias.lg\nlog --graph\n--oneline\0'
+        )
+        
+        assert config.value('user.name') == 'Test User'
+        assert config['credential.helper'] == ['cache', 'store']
+        assert config.value('credential.helper') == 'store'
+        assert config.value('core.bare') == 'true'
+        assert config.value('alias.lg') == 'log --graph\n--oneline'
+        assert config.value('user.signingkey', 'none') == 'none'
+    
+    def test_subsection_names_are_case_sensitive(self):
+        """Test that only section and key names are case-insensitive."""
+        config = parse_config_list(
+            'credential.https://Example.com.helper\nstore\0branch.Main.remote\norigin\0'
+        )
+        
+        assert config.value('Credential.https://Example.com.Helper') == 'store'
+        assert config.value('credential.https://example.com.helper', 'none') == 'none'
+        assert config.value('BRANCH.Main.Remote') == 'origin'
+        assert config.value('branch.main.remote', 'none') == 'none'
+        assert parse_gitconfig('[Branch "Main"]\n\tRemote = origin\n') == {'branch.Main.remote': ['origin']}
+    
+    @patch('subprocess.run')
+    def test_read_git_config_missing_file(self, mock_run):
+        """Test that a missing config file yields an empty config."""
+        mock_run.return_value = MagicMock(returncode=128, stdout='')
+        
+        assert read_git_config('global') == {}
+
+
+@pytest.mark.usefixtures('isolated_home')
+class TestProbeCache:
+    """Tests for the on-disk probe result cache."""
+    
+    def test_cached_result_is_reused(self, tmp_path):
+        """Test that a second call is served from the cache."""
+        probe = MagicMock(return_value=(True, "Authenticated as: test@example.com"))
+        
+        ProbeCache(cache_dir=tmp_path, ttl=60).cached('azure', probe)()
+        result = ProbeCache(cache_dir=tmp_path, ttl=60).cached('azure', probe)()
+        
+        assert result == (True, "Authenticated as: test@example.com")
+        probe.assert_called_once()
+    
+    def test_refresh_bypasses_cache(self, tmp_path):
+        """Test that refresh runs the probe even with a valid entry."""
+        probe = MagicMock(return_value=(True, "ok"))
+        
+        ProbeCache(cache_dir=tmp_path, ttl=60).cached('azure', probe)()
+        ProbeCache(cache_dir=tmp_path, ttl=60, refresh=True).cached('azure', probe)()
+        
+        assert probe.call_count == 2
+    
+    def test_expired_entry_is_ignored(self, tmp_path):
+        """Test that entries older than the TTL are not reused."""
+        probe = MagicMock(return_value=(True, "ok"))
+        cache = ProbeCache(cache_dir=tmp_path, ttl=60)
+        
+        with patch('probe_cache.time.time', return_value=1000.0):
+            cache.cached('github', probe)()
+        with patch('probe_cache.time.time', return_value=1100.0):
+            cache.cached('github', probe)()
+        
+        assert probe.call_count == 2
+    
+    def test_credential_change_invalidates(self, tmp_path, isolated_home):
+        """Test that touching a credential file invalidates the entry."""
+        probe = MagicMock(return_value=(False, "Not authenticated"))
+        cache = ProbeCache(cache_dir=tmp_path, ttl=60)
+        
+        cache.cached('azure', probe)()
+        azure_dir = isolated_home / '.azure'
+        azure_dir.mkdir()
+        (azure_dir / 'azureProfile.json').write_text('{"subscriptions": []}')
+        cache.cached('azure', probe)()
+        
+        assert probe.call_count == 2
+    
+    @patch('subprocess.run')
+    def test_transient_failures_are_not_cached(self, mock_run, tmp_path):
+        """Test that a timeout is retried on the next check while a logout is cached."""
+        mock_run.side_effect = [
+            subprocess.TimeoutExpired('az', 10),
+            MagicMock(returncode=1, stdout="", stderr="Please run 'az login'"),
+        ]
+        
+        first = ProbeCache(cache_dir=tmp_path, ttl=60).cached('azure', probe_azure_auth)()
+        second = ProbeCache(cache_dir=tmp_path, ttl=60).cached('azure', probe_azure_auth)()
+        third = ProbeCache(cache_dir=tmp_path, ttl=60).cached('azure', probe_azure_auth)()
+        
+        assert first[1] == "Authentication check timed out"
+        assert second[1] == third[1] == "Not authenticated. Run 'az login' to authenticate."
+        assert mock_run.call_count == 2
+        assert AuthResults({"Azure CLI": first}).azure_account == {}
+    
+    @patch('subprocess.run')
+    def test_fast_and_cli_results_are_cached_separately(self, mock_run, tmp_path, isolated_home):
+        """Test that a fast probe result is not served to a CLI check."""
+        pytest.importorskip('yaml')
+        gh_dir = isolated_home / '.config' / 'gh'
+        gh_dir.mkdir(parents=True)
+        (gh_dir / 'hosts.yml').write_text('github.com:\n    user: testuser\n    oauth_token: gho_test\n')
+        mock_run.return_value = MagicMock(returncode=1, stdout='', stderr='The token is invalid')
+        
+        fast = collect_auth_results(ProbeCache(cache_dir=tmp_path, ttl=60), fast=True)
+        cli = collect_auth_results(ProbeCache(cache_dir=tmp_path, ttl=60))
+        
+        assert fast.statuses["GitHub CLI"][0] is True
+        assert cli.statuses["GitHub CLI"][0] is False
+        assert {'github', 'github-fast'} <= set(json.loads(ProbeCache(cache_dir=tmp_path).path.read_text()))
+        assert fingerprint('github-fast') == fingerprint('github') != []
+    
+    def test_zero_ttl_disables_cache(self, tmp_path):
+        """Test that a TTL of zero never reads or writes the cache."""
+        probe = MagicMock(return_value=(True, "ok"))
+        cache = ProbeCache(cache_dir=tmp_path, ttl=0)
+        
+        cache.cached('git', probe)()
+        cache.cached('git', probe)()
+        
+        assert probe.call_count == 2
+        assert not cache.path.exists()
+
+
+class TestAuthResults:
+    """Tests for the shared authentication results object."""
+    
+    @patch('subprocess.run')
+    def test_collect_auth_results_keeps_details(self, mock_run):
+        """Test that identity data fetched by the probes is kept."""
+        def run_side_effect(command, **kwargs):
+            if command[0] == 'az':
+                return MagicMock(
+                    returncode=0,
+                    stdout='{"id": "sub-1", "name": "Dev", "user": {"name": "test@example.com"}}'
+                )
+            if command[0] == 'gh':
+                return MagicMock(
+                    returncode=0,
+                    stdout='',
+                    stderr='✓ Logged in to github.com account testuser (keyring)'
+                )
+            return MagicMock(returncode=0, stdout='user.name\nTest User\0user.email\ntest@example.com\0')
+        
+        mock_run.side_effect = run_side_effect
+        
+        auth = collect_auth_results()
+        
+        assert auth.all_passed is True
+        assert list(auth.statuses) == ["Azure CLI", "GitHub CLI", "Git Configuration"]
+        assert auth.azure_account['id'] == 'sub-1'
+        assert auth.github_login == 'testuser'
+    
+    def test_auth_results_accepts_plain_status(self):
+        """Test that timed out checks without details are handled."""
+        auth = AuthResults({"Azure CLI": (False, "Authentication check timed out")})
+        
+        assert auth.all_passed is False
+        assert auth.azure_account == {}
+        assert auth.github_login is None
+    
+    @patch('subprocess.run')
+    def test_setup_reuses_probe_results(self, mock_run):
+        """Test that setup tasks reuse identity data instead of calling the CLIs."""
+        auth = AuthResults({
+            "Azure CLI": (True, "Authenticated as: test@example.com", {"id": "sub-1", "name": "Dev"}),
+            "GitHub CLI": (True, "Authenticated", {"login": "testuser"}),
+        })
+        mock_run.return_value = MagicMock(returncode=0, stdout='[]', stderr='')
+        
+        assert post_auth_setup.setup_github_config(auth) is True
+        mock_run.assert_not_called()
+        
+        assert post_auth_setup.setup_azure_resources(auth) is True
+        commands = [call[0][0] for call in mock_run.call_args_list]
+        assert ['az', 'account', 'show', '--output', 'table'] not in commands
+
+
 class TestAuthenticationIntegration:
     """Integration tests for authentication checks."""
     
@@ -0,0 +1,395 @@
+"""
+Tests for the Azure AI example helpers.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+
+# Add examples directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'examples'))
+
+import azure_clients
+from azure_ai_async_example import analyze_bulk_async, analyze_sentiment_async, make_async_analyze_batch
+from azure_bulk_sentiment import (
+    MAX_DOCUMENT_CHARS,
+    RateLimiter,
+    analyze_bulk,
+    make_analyze_batch
+)
+from result_writers import CSV_FIELDS, get_writer
+
+
+def fake_sentiment(text):
+    """Deterministic stand-in for the service's sentiment model."""
+    if "love" in text:
+        return "positive", {"positive": 0.9, "neutral": 0.05, "negative": 0.05}
+    if "disappointed" in text:
+        return "negative", {"positive": 0.05, "neutral": 0.05, "negative": 0.9}
+    return "neutral", {"positive": 0.1, "neutral": 0.8, "negative": 0.1}
+
+
+class StubTextAnalyticsHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Text Analytics v3.1 sentiment endpoint."""
+    
+    requests = []
+    
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        type(self).requests.append(body["documents"])
+        documents = []
+        for doc in body["documents"]:
+            sentiment, scores = fake_sentiment(doc["text"])
+            documents.append({
+                "id": doc["id"], "sentiment": sentiment, "confidenceScores": scores,
+                "sentences": [], "warnings": []
+            })
+        payload = json.dumps({"documents": documents, "errors": [], "modelVersion": "stub"}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    """Run the stub Text Analytics endpoint on a local port."""
+    StubTextAnalyticsHandler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubTextAnalyticsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+@pytest.fixture
+def fresh_factory():
+    """Start every test with no shared Azure objects."""
+    azure_clients.reset()
+    yield
+    azure_clients.reset()
+
+
+@pytest.mark.usefixtures('fresh_factory')
+class TestAzureClients:
+    """Tests for the shared Azure client factory."""
+    
+    def test_client_is_reused_per_endpoint(self):
+        """Test that one client is built per endpoint and key."""
+        pytest.importorskip('azure.ai.textanalytics')
+        endpoint = "https://example.cognitiveservices.azure.com/"
+        
+        first = azure_clients.get_text_analytics_client(endpoint, "key")
+        second = azure_clients.get_text_analytics_client(endpoint, "key")
+        other = azure_clients.get_text_analytics_client("https://other.cognitiveservices.azure.com/", "key")
+        
+        assert first is second
+        assert other is not first
+    
+    def test_transport_is_shared(self):
+        """Test that all clients share one pooled transport."""
+        pytest.importorskip('azure.core')
+        pytest.importorskip('requests')
+        
+        assert azure_clients.get_transport() is azure_clients.get_transport()
+    
+    def test_credential_is_shared(self):
+        """Test that the credential chain is only built once."""
+        pytest.importorskip('azure.identity')
+        
+        assert azure_clients.get_credential() is azure_clients.get_credential()
+    
+    def test_chat_models_are_registered_per_deployment(self, monkeypatch):
+        """Test the AzureChatOpenAI registry and its shared HTTP client."""
+        pytest.importorskip('httpx')
+        pytest.importorskip('langchain_openai')
+        monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+        monkeypatch.setenv("AZURE_OPENAI_API_KEY", "key")
+        
+        first = azure_clients.get_azure_chat_model("gpt-4", "2024-02-01")
+        second = azure_clients.get_azure_chat_model("gpt-4", "2024-02-01")
+        other = azure_clients.get_azure_chat_model("gpt-4", "2024-06-01")
+        tuned = azure_clients.get_azure_chat_model("gpt-4", "2024-02-01", stop=["\n"])
+        
+        assert first is second
+        assert other is not first
+        assert tuned is not first
+        assert tuned is azure_clients.get_azure_chat_model("gpt-4", "2024-02-01", stop=["\n"])
+        assert first.http_client is other.http_client is azure_clients.get_http_client()
+    
+    def test_warm_up_uses_shared_pool(self, stub_server):
+        """Test that warm-up reaches the endpoint through the shared client."""
+        pytest.importorskip('httpx')
+        
+        elapsed = azure_clients.warm_up_azure_openai(stub_server)
+        
+        assert elapsed is not None and elapsed >= 0
+        assert azure_clients.get_http_client() is azure_clients.get_http_client()
+    
+    def test_warm_up_without_endpoint(self, monkeypatch):
+        """Test that warm-up is skipped when no endpoint is configured."""
+        monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+        
+        assert azure_clients.warm_up_azure_openai() is None
+
+
+
+def fake_analyze_batch(texts):
+    """AnalyzeBatch stand-in with random latency to shuffle completion order."""
+    time.sleep(random.uniform(0, 0.01))
+    results = []
+    for text in texts:
+        sentiment, scores = fake_sentiment(text)
+        results.append({"sentiment": sentiment, "text": text, **scores})
+    return results
+
+
+class TestBulkSentiment:
+    """Tests for the chunked bulk sentiment pipeline."""
+    
+    def test_results_keep_input_order(self):
+        """Test that results come back in input order despite concurrency."""
+        documents = [f"document {i} {'love' if i % 3 == 0 else ''}" for i in range(95)]
+        
+        results = list(analyze_bulk(documents, fake_analyze_batch, concurrency=8))
+        
+        assert [result["index"] for result in results] == list(range(95))
+        assert [result["text"] for result in results] == documents
+    
+    def test_requests_respect_service_limits(self):
+        """Test request sizes and per-document truncation."""
+        sizes = []
+        
+        def analyze(texts):
+            sizes.append(len(texts))
+            assert all(len(text) <= MAX_DOCUMENT_CHARS for text in texts)
+            return fake_analyze_batch(texts)
+        
+        documents = ["short"] * 24 + ["x" * (MAX_DOCUMENT_CHARS + 10)]
+        results = list(analyze_bulk(documents, analyze))
+        
+        assert sorted(sizes) == [5, 10, 10]
+        assert results[-1]["truncated"] is True
+        assert "truncated" not in results[0]
+    
+    def test_failed_request_only_affects_its_documents(self):
+        """Test that one failing request yields errors for its documents only."""
+        def analyze(texts):
+            if "boom" in texts:
+                raise RuntimeError("429 Too Many Requests")
+            return fake_analyze_batch(texts)
+        
+        documents = ["fine"] * 10 + ["boom"] + ["fine"] * 9 + ["fine"] * 5
+        results = list(analyze_bulk(documents, analyze))
+        
+        errors = [result["index"] for result in results if "error" in result]
+        assert errors == list(range(10, 20))
+    
+    def test_input_is_consumed_lazily(self):
+        """Test that the pipeline does not read the whole input up front."""
+        pulled = []
+        
+        def documents():
+            for i in range(10000):
+                pulled.append(i)
+                yield f"document {i}"
+        
+        results = analyze_bulk(documents(), fake_analyze_batch, concurrency=2)
+        next(results)
+        
+        assert len(pulled) <= 10 * 2 * 2 + 10
+    
+    def test_rate_limiter(self):
+        """Test that the token bucket spaces out requests."""
+        limiter = RateLimiter(rate=20, burst=1)
+        
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        
+        assert time.monotonic() - start >= 0.15
+    
+    def test_stub_server_round_trip(self, stub_server):
+        """Test the pipeline against a local stub Text Analytics endpoint."""
+        pytest.importorskip('azure.ai.textanalytics')
+        from azure.ai.textanalytics import TextAnalyticsClient
+        from azure.core.credentials import AzureKeyCredential
+        
+        client = TextAnalyticsClient(stub_server, AzureKeyCredential("stub"), api_version="v3.1")
+        documents = ["I love it"] * 7 + ["I'm disappointed"] * 7 + ["It is a table"] * 7
+        
+        results = list(analyze_bulk(documents, make_analyze_batch(client), concurrency=3))
+        
+        assert [result["sentiment"] for result in results] == (
+            ["positive"] * 7 + ["negative"] * 7 + ["neutral"] * 7
+        )
+        assert sorted(len(batch) for batch in StubTextAnalyticsHandler.requests) == [1, 10, 10]
+
+
+
+class TestAsyncSentiment:
+    """Tests for the asyncio sentiment path."""
+    
+    def test_fan_out_is_limited_and_ordered(self):
+        """Test the semaphore limit and in-order results."""
+        state = {"active": 0, "max_active": 0}
+        
+        async def analyze(texts):
+            state["active"] += 1
+            state["max_active"] = max(state["max_active"], state["active"])
+            await asyncio.sleep(random.uniform(0, 0.01))
+            state["active"] -= 1
+            return fake_analyze_batch(texts)
+        
+        async def collect():
+            documents = [f"document {i}" for i in range(73)]
+            return [r async for r in analyze_bulk_async(documents, analyze, concurrency=3)]
+        
+        results = asyncio.run(collect())
+        
+        assert [result["index"] for result in results] == list(range(73))
+        assert state["max_active"] <= 3
+    
+    def test_failed_request_is_isolated(self):
+        """Test that an exception only fails its own documents."""
+        async def analyze(texts):
+            if "boom" in texts:
+                raise RuntimeError("service unavailable")
+            return fake_analyze_batch(texts)
+        
+        async def collect():
+            documents = ["boom"] + ["fine"] * 19
+            return [r async for r in analyze_bulk_async(documents, analyze)]
+        
+        results = asyncio.run(collect())
+        
+        assert all("error" in result for result in results[:10])
+        assert not any("error" in result for result in results[10:])
+    
+    def test_document_errors_and_truncation(self):
+        """Test that the aio analyzer keeps per-document errors and flags truncation."""
+        class FakeClient:
+            async def analyze_sentiment(self, documents, **kwargs):
+                scores = SimpleNamespace(positive=0.9, neutral=0.1, negative=0.0)
+                return [
+                    SimpleNamespace(is_error=True, error="InvalidDocument") if not doc["text"]
+                    else SimpleNamespace(is_error=False, sentiment="positive", confidence_scores=scores)
+                    for doc in documents
+                ]
+        
+        async def collect():
+            documents = ["great", "", "x" * (MAX_DOCUMENT_CHARS + 1)]
+            analyze = make_async_analyze_batch(FakeClient())
+            return [r async for r in analyze_bulk_async(documents, analyze)]
+        
+        good, bad, long = asyncio.run(collect())
+        
+        assert good == {"sentiment": "positive", "positive": 0.9, "neutral": 0.1, "negative": 0.0, "index": 0}
+        assert bad == {"error": "InvalidDocument", "index": 1}
+        assert long["truncated"] is True
+    
+    def test_stub_server_round_trip(self, stub_server):
+        """Test the aio client path against the local stub endpoint."""
+        pytest.importorskip('aiohttp')
+        pytest.importorskip('azure.ai.textanalytics.aio')
+        
+        async def collect():
+            documents = ["I love it", "I'm disappointed", "It is a table"] * 5
+            return [r async for r in analyze_sentiment_async(stub_server, documents, key="stub",
+                                                             api_version="v3.1")]
+        
+        results = asyncio.run(collect())
+        
+        assert [result["sentiment"] for result in results[:3]] == ["positive", "negative", "neutral"]
+        assert len(results) == 15
+
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts write calls."""
+    
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+    
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+SAMPLE_RESULTS = [
+    {"index": 0, "text": "I love it", "sentiment": "positive",
+     "positive": 0.9, "neutral": 0.05, "negative": 0.05},
+    {"index": 1, "error": "InvalidDocument"},
+]
+
+
+class TestResultWriters:
+    """Tests for the buffered result writers."""
+    
+    def test_human_format(self):
+        """Test the human layout of analyze_sentiment()."""
+        stream = io.StringIO()
+        with get_writer("human", stream) as writer:
+            for result in SAMPLE_RESULTS:
+                writer.write(result)
+        
+        output = stream.getvalue()
+        assert output.startswith("Sentiment Analysis Results:\n" + "-" * 50)
+        assert "\nText 1: I love it...\nSentiment: positive\n" in output
+        assert "  Positive: 0.90\n" in output
+        assert "\nText 2: Error - InvalidDocument\n" in output
+    
+    def test_ndjson_format(self):
+        """Test one JSON object per line."""
+        stream = io.StringIO()
+        with get_writer("ndjson", stream) as writer:
+            for result in SAMPLE_RESULTS:
+                writer.write(result)
+        
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == SAMPLE_RESULTS
+    
+    def test_csv_format(self):
+        """Test the CSV header and fixed columns."""
+        stream = io.StringIO()
+        with get_writer("csv", stream) as writer:
+            for result in SAMPLE_RESULTS:
+                writer.write(result)
+        
+        rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+        assert list(rows[0]) == list(CSV_FIELDS)
+        assert rows[0]["sentiment"] == "positive"
+        assert rows[1]["error"] == "InvalidDocument"
+    
+    def test_writes_are_batched(self):
+        """Test that results reach the stream once per batch."""
+        stream = CountingStream()
+        with get_writer("ndjson", stream, flush_every=1000) as writer:
+            for index in range(10000):
+                writer.write({"index": index, "sentiment": "neutral"})
+        
+        assert stream.writes == 10
+        assert len(stream.getvalue().splitlines()) == 10000
+    
+    def test_unknown_format(self):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError, match="Unknown output format"):
+            get_writer("xml")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,326 @@
+"""
+Tests for the LangChain example helpers.
+"""
+
+import asyncio
+import io
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+
+# Add examples directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'examples'))
+
+from agent_executor import (
+    DEFAULT_TOOLS,
+    AgentExecutor,
+    ScriptedChatModel,
+    ScriptedReply,
+    Tool,
+    calculate,
+    safe_eval
+)
+from chain_runner import (
+    arun_chain_batch,
+    astream_chain,
+    read_inputs,
+    run_chain_batch,
+    stream_chain
+)
+
+
+class FakeChain:
+    """Stand-in for an LCEL Runnable producing a joke string."""
+
+    def __init__(self, first_token_delay=0.0, fail_topics=(), delay=0.0):
+        self.first_token_delay = first_token_delay
+        self.fail_topics = set(fail_topics)
+        self.delay = delay
+        self.batch_calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def tokens(self, inputs):
+        return ["A ", inputs["adjective"], " joke ", "about ", inputs["topic"]]
+
+    def invoke(self, inputs):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if inputs["topic"] in self.fail_topics:
+                raise ValueError(f"cannot joke about {inputs['topic']}")
+            return "".join(self.tokens(inputs))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def stream(self, inputs):
+        time.sleep(self.first_token_delay)
+        yield from self.tokens(inputs)
+
+    async def astream(self, inputs):
+        await asyncio.sleep(self.first_token_delay)
+        for token in self.tokens(inputs):
+            yield token
+
+    def batch(self, inputs, config=None, return_exceptions=False):
+        max_concurrency = (config or {}).get("max_concurrency") or len(inputs)
+        self.batch_calls.append((len(inputs), max_concurrency))
+
+        def call(item):
+            try:
+                return self.invoke(item)
+            except Exception as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            return list(executor.map(call, inputs))
+
+    async def abatch(self, inputs, config=None, return_exceptions=False):
+        return await asyncio.to_thread(self.batch, inputs, config, return_exceptions)
+
+
+INPUTS = {"adjective": "funny", "topic": "programming"}
+
+
+class TestStreaming:
+    """Tests for streaming chain output."""
+
+    def test_stream_writes_tokens_and_times_them(self):
+        """Test token output, time-to-first-token and total latency."""
+        written = []
+        timing = stream_chain(FakeChain(first_token_delay=0.05), INPUTS, write=written.append)
+
+        assert written == ["A ", "funny", " joke ", "about ", "programming"]
+        assert timing["output"] == "A funny joke about programming"
+        assert timing["chunks"] == 5
+        assert 0.05 <= timing["ttft"] <= timing["total"]
+
+    def test_stdout_is_flushed_per_token(self, monkeypatch):
+        """Test that the default writer flushes stdout after every chunk."""
+        events = []
+
+        class Stdout:
+            def write(self, chunk):
+                events.append(("write", chunk))
+
+            def flush(self):
+                events.append(("flush", None))
+
+        monkeypatch.setattr(sys, 'stdout', Stdout())
+        stream_chain(FakeChain(), INPUTS)
+
+        assert [kind for kind, _ in events] == ["write", "flush"] * 5
+
+    def test_astream(self):
+        """Test the async streaming path."""
+        written = []
+        timing = asyncio.run(astream_chain(FakeChain(first_token_delay=0.02), INPUTS,
+                                           write=written.append))
+
+        assert "".join(written) == timing["output"] == "A funny joke about programming"
+        assert 0.02 <= timing["ttft"] <= timing["total"]
+
+
+class TestChainBatch:
+    """Tests for the batch runner."""
+
+    def make_inputs(self, count, fail_every=0):
+        return [{"adjective": "dry", "topic": "fail" if fail_every and i % fail_every == 0 else f"topic {i}"}
+                for i in range(count)]
+
+    def test_read_inputs(self):
+        """Test JSONL input parsing."""
+        stream = io.StringIO('{"adjective": "dry", "topic": "tax"}\n\n{"adjective": "odd", "topic": "cats"}\n')
+
+        assert list(read_inputs(stream)) == [
+            {"adjective": "dry", "topic": "tax"},
+            {"adjective": "odd", "topic": "cats"},
+        ]
+
+    def test_malformed_lines_are_recorded(self):
+        """Test that unreadable input lines become error results in place."""
+        stream = io.StringIO('{"adjective": "dry", "topic": "tax"}\n{not json\n[1, 2]\n'
+                             '{"adjective": "odd", "topic": "cats"}\n')
+        results = list(run_chain_batch(FakeChain(), read_inputs(stream)))
+
+        assert [result["index"] for result in results] == [0, 1, 2, 3]
+        assert results[0]["output"] == "A dry joke about tax"
+        assert results[1]["error"].startswith("ValueError: line 2: invalid JSON")
+        assert results[2]["error"] == "ValueError: line 3: expected a JSON object"
+        assert results[3]["output"] == "A odd joke about cats"
+
+        results = asyncio.run(arun_chain_batch(FakeChain(), read_inputs(io.StringIO('oops\n'))))
+        assert results == [{"index": 0, "input": None,
+                            "error": "ValueError: line 1: invalid JSON: Expecting value"}]
+
+    def test_errors_do_not_abort_batch(self):
+        """Test per-item error collection and result order."""
+        chain = FakeChain(fail_topics={"fail"})
+        results = list(run_chain_batch(chain, self.make_inputs(20, fail_every=5), max_concurrency=4))
+
+        assert [result["index"] for result in results] == list(range(20))
+        failed = [result["index"] for result in results if "error" in result]
+        assert failed == [0, 5, 10, 15]
+        assert results[0]["error"] == "ValueError: cannot joke about fail"
+        assert results[1]["output"] == "A dry joke about topic 1"
+
+    def test_max_concurrency_and_windows(self):
+        """Test that the concurrency limit is passed and inputs are windowed."""
+        chain = FakeChain(delay=0.01)
+        results = list(run_chain_batch(chain, iter(self.make_inputs(25)), max_concurrency=3, window=10))
+
+        assert len(results) == 25
+        assert chain.batch_calls == [(10, 3), (10, 3), (5, 3)]
+        assert 1 < chain.max_active <= 3
+
+    def test_abatch(self):
+        """Test the async batch path."""
+        chain = FakeChain(fail_topics={"fail"})
+        results = asyncio.run(arun_chain_batch(chain, self.make_inputs(12, fail_every=4), window=5))
+
+        assert [result["index"] for result in results] == list(range(12))
+        assert sum("error" in result for result in results) == 3
+        assert json.dumps(results)
+
+
+class TestSafeEval:
+    """Tests for the AST arithmetic evaluator."""
+
+    @pytest.mark.parametrize("expression,expected", [
+        ("25 * 4 + 10", 110),
+        ("(1 + 2) * 3 / 4", 2.25),
+        ("2 ** 10", 1024),
+        ("-7 // 2", -4),
+        ("17 % 5", 2),
+        ("sqrt(16) + abs(-2)", 6.0),
+        ("max(1, 2, 3) * pi", pytest.approx(9.42477796)),
+    ])
+    def test_arithmetic(self, expression, expected):
+        """Test supported operators and functions."""
+        assert safe_eval(expression) == expected
+
+    @pytest.mark.parametrize("expression", [
+        "__import__('os').system('true')",
+        "open('/etc/passwd')",
+        "(1).__class__",
+        "[1, 2]",
+        "x + 1",
+        "'a' * 3",
+        "True + 1",
+        "lambda: 1",
+        "9 ** 9 ** 9",
+        "1e308 * 10",
+        "1 +",
+        "1" * 2000,
+    ])
+    def test_rejects_unsafe_or_huge_input(self, expression):
+        """Test that only bounded arithmetic is accepted."""
+        with pytest.raises(ValueError):
+            safe_eval(expression)
+
+    def test_calculate_formats_integers(self):
+        """Test the calculator tool output."""
+        assert calculate("10 / 2") == "5"
+        assert calculate("1 / 4") == "0.25"
+
+
+def slow_tool(name, seconds, log):
+    """Tool sleeping for a while and logging its start and end."""
+    def func(**args):
+        log.append(("start", name))
+        time.sleep(seconds)
+        log.append(("end", name))
+        return f"{name} done"
+    return Tool(name, func, f"Sleeps {seconds}s")
+
+
+def call(name, call_id, **args):
+    return {"name": name, "args": args, "id": call_id}
+
+
+class TestAgentExecutor:
+    """Tests for the tool-calling agent loop."""
+
+    def test_independent_tool_calls_run_concurrently(self):
+        """Test concurrent dispatch and in-order results."""
+        log = []
+        tools = [slow_tool("search", 0.2, log), slow_tool("weather", 0.2, log)]
+        llm = ScriptedChatModel([
+            ScriptedReply(tool_calls=[call("search", "1"), call("weather", "2")]),
+            ScriptedReply("All done"),
+        ])
+
+        start = time.perf_counter()
+        result = AgentExecutor(llm, tools, max_workers=2).invoke("plan my day")
+        elapsed = time.perf_counter() - start
+
+        assert result["output"] == "All done"
+        assert [c["result"] for c in result["steps"][0]] == ["search done", "weather done"]
+        assert elapsed < 0.35
+        assert log[:2] == [("start", "search"), ("start", "weather")]
+
+    def test_tool_results_are_sent_back_to_model(self):
+        """Test the conversation passed to the model."""
+        llm = ScriptedChatModel([
+            ScriptedReply(tool_calls=[call("calculator", "a", expression="25 * 4 + 10")]),
+            lambda messages: ScriptedReply(f"The answer is {messages[-1]['content']}"),
+        ])
+
+        result = AgentExecutor(llm).invoke("What is 25 * 4 + 10?")
+
+        assert result["output"] == "The answer is 110"
+        assert llm.calls[1][-1] == {"role": "tool", "content": "110", "tool_call_id": "a"}
+
+    def test_tool_errors_are_reported_to_model(self):
+        """Test that failing and unknown tools do not abort the run."""
+        llm = ScriptedChatModel([
+            ScriptedReply(tool_calls=[call("calculator", "a", expression="1 / 0"),
+                                      call("missing", "b")]),
+            ScriptedReply("Could not compute"),
+        ])
+        agent = AgentExecutor(llm)
+
+        result = agent.invoke("What is 1 / 0?")
+
+        assert result["steps"][0][0]["result"] == "Error: ZeroDivisionError: division by zero"
+        assert result["steps"][0][1]["result"] == "Error: unknown tool missing"
+        assert agent.stats.summary()["calculator"]["errors"] == 1
+
+    def test_per_tool_latency(self):
+        """Test latency accounting per tool."""
+        log = []
+        llm = ScriptedChatModel([
+            ScriptedReply(tool_calls=[call("search", "1"), call("search", "2")]),
+            ScriptedReply(tool_calls=[call("calculator", "3", expression="1 + 1")]),
+            ScriptedReply("done"),
+        ])
+        agent = AgentExecutor(llm, [slow_tool("search", 0.05, log), *DEFAULT_TOOLS])
+
+        agent.invoke("go")
+        stats = agent.stats.summary()
+
+        assert stats["search"]["calls"] == 2
+        assert stats["search"]["mean_ms"] >= 50
+        assert stats["calculator"]["calls"] == 1
+
+    def test_iteration_limit(self):
+        """Test that a model looping on tools is stopped."""
+        loop = ScriptedReply(tool_calls=[call("current_time", "t")])
+        agent = AgentExecutor(ScriptedChatModel([loop] * 10), max_iterations=3)
+
+        with pytest.raises(RuntimeError, match="3 iterations"):
+            agent.invoke("what time is it, forever")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
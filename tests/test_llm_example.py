@@ -0,0 +1,364 @@
+"""
+Tests for the LLM example helpers.
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+import pytest
+
+# Add examples directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'examples'))
+
+from llm_example import LLMClient, LLMError, run_llm_command
+import llm_example
+from llm_batch import read_prompts, run_batch
+from llm_cache import MemoryBackend, ResponseCache, SQLiteBackend, cache_key
+
+
+class StubModel:
+    """Stand-in for an llm model object."""
+    
+    def __init__(self):
+        self.prompts = []
+    
+    def prompt(self, prompt, system=None, **options):
+        self.prompts.append((prompt, system))
+        return MagicMock(text=MagicMock(return_value=f"reply: {prompt}\n"))
+
+
+class SlowModel:
+    """Model whose calls take a while; records how many run at once."""
+    
+    def __init__(self, delay):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+    
+    def prompt(self, prompt, system=None, **options):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            return MagicMock(text=MagicMock(return_value=prompt))
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestLLMClient:
+    """Tests for the in-process and CLI client modes."""
+    
+    def test_python_mode_loads_model_once(self):
+        """Test that the model object is loaded once and reused."""
+        model = StubModel()
+        loader = MagicMock(return_value=model)
+        client = LLMClient("stub", mode="python", model_loader=loader)
+        
+        assert client.prompt("one") == "reply: one"
+        assert client.prompt("two", system="Be brief") == "reply: two"
+        
+        loader.assert_called_once_with("stub")
+        assert model.prompts == [("one", None), ("two", "Be brief")]
+    
+    def test_python_mode_wraps_errors(self):
+        """Test that model errors are raised as LLMError."""
+        def broken_loader(name):
+            raise RuntimeError("No key found")
+        
+        client = LLMClient(mode="python", model_loader=broken_loader)
+        
+        with pytest.raises(LLMError, match="No key found"):
+            client.prompt("hello")
+    
+    def test_python_mode_timeout(self):
+        """Test that a hanging in-process call is bounded by the timeout."""
+        client = LLMClient(mode="python", timeout=0.1, model_loader=lambda name: SlowModel(2))
+        
+        start = time.monotonic()
+        with pytest.raises(LLMError, match="Timed out after 0.1s"):
+            client.prompt("hello")
+        assert time.monotonic() - start < 1
+    
+    @patch('subprocess.run')
+    def test_cli_mode_builds_command(self, mock_run):
+        """Test the CLI fallback command line."""
+        mock_run.return_value = MagicMock(returncode=0, stdout="answer\n", stderr="")
+        client = LLMClient("gpt-4", mode="cli")
+        
+        assert client.prompt("hello", system="Be brief") == "answer"
+        assert mock_run.call_args[0][0] == ["llm", "-m", "gpt-4", "-s", "Be brief", "hello"]
+    
+    @patch('subprocess.run')
+    def test_run_llm_command_reports_errors(self, mock_run):
+        """Test that run_llm_command keeps returning error strings."""
+        mock_run.side_effect = FileNotFoundError()
+        
+        with patch.dict(llm_example._clients, {None: LLMClient(mode="cli")}):
+            result = run_llm_command("hello")
+        
+        assert result.startswith("Error: LLM command not found")
+
+
+
+class FlakyClient:
+    """Client that fails the first attempts of selected prompts."""
+    
+    def __init__(self, failures=None, delay=0.0):
+        self.failures = dict(failures or {})
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+    
+    def prompt(self, prompt, system=None):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            with self.lock:
+                if self.failures.get(prompt, 0) > 0:
+                    self.failures[prompt] -= 1
+                    raise LLMError("rate limited")
+            return prompt.upper()
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestBatchRunner:
+    """Tests for the batch prompt runner."""
+    
+    def test_read_prompts(self):
+        """Test that strings and objects are both accepted."""
+        source = io.StringIO('"first"\n\n{"id": "b", "prompt": "second", "system": "Be brief"}\n')
+        
+        assert list(read_prompts(source)) == [
+            {"id": 1, "prompt": "first", "system": None},
+            {"id": "b", "prompt": "second", "system": "Be brief"},
+        ]
+    
+    def test_run_batch_streams_results(self):
+        """Test that every prompt gets exactly one result line."""
+        prompts = ({"id": i, "prompt": f"p{i}", "system": None} for i in range(50))
+        sink = io.StringIO()
+        client = FlakyClient(delay=0.01)
+        
+        stats = run_batch(prompts, sink, client=client, concurrency=4)
+        
+        results = [json.loads(line) for line in sink.getvalue().splitlines()]
+        assert sorted(result["id"] for result in results) == list(range(50))
+        assert all(result["response"] == f"P{result['id']}" for result in results)
+        assert stats.succeeded == 50 and stats.failed == 0
+        assert client.max_active <= 4
+    
+    def test_run_batch_reads_lazily(self):
+        """Test that prompts are pulled from the iterable only as needed."""
+        pulled = []
+        
+        def prompts():
+            for i in range(1000):
+                pulled.append(i)
+                yield {"id": i, "prompt": "p", "system": None}
+        
+        sink = io.StringIO()
+        client = FlakyClient()
+        original_write = sink.write
+        max_ahead = []
+        
+        def write(text):
+            max_ahead.append(len(pulled) - sink.getvalue().count("\n"))
+            return original_write(text)
+        
+        sink.write = write
+        run_batch(prompts(), sink, client=client, concurrency=2)
+        
+        assert max(max_ahead) <= 2 * 2 + 1
+    
+    def test_run_batch_retries_then_fails(self):
+        """Test retry with backoff and failure after the last attempt."""
+        sink = io.StringIO()
+        client = FlakyClient(failures={"flaky": 1, "broken": 10})
+        prompts = [
+            {"id": "flaky", "prompt": "flaky", "system": None},
+            {"id": "broken", "prompt": "broken", "system": None},
+        ]
+        
+        stats = run_batch(prompts, sink, client=client, retries=2, backoff=0.001)
+        
+        results = {r["id"]: r for r in map(json.loads, sink.getvalue().splitlines())}
+        assert results["flaky"]["response"] == "FLAKY"
+        assert results["flaky"]["attempts"] == 2
+        assert results["broken"]["error"] == "rate limited"
+        assert results["broken"]["attempts"] == 3
+        assert stats.failed == 1 and stats.retries == 3
+    
+    def test_run_batch_timeout(self):
+        """Test that a hanging prompt is reported as timed out."""
+        sink = io.StringIO()
+        client = LLMClient(mode="python", timeout=0.1, model_loader=lambda name: SlowModel(2))
+        
+        start = time.monotonic()
+        stats = run_batch([{"id": 1, "prompt": "slow", "system": None}], sink,
+                          client=client, retries=0)
+        
+        assert time.monotonic() - start < 1
+        assert stats.failed == 1
+        assert "Timed out" in json.loads(sink.getvalue())["error"]
+    
+    def test_timed_out_calls_count_against_concurrency(self):
+        """Test that retries do not start calls while abandoned ones still run."""
+        model = SlowModel(0.3)
+        client = LLMClient(mode="python", timeout=0.1, max_calls=2,
+                           model_loader=lambda name: model)
+        prompts = [{"id": i, "prompt": f"p{i}", "system": None} for i in range(4)]
+        
+        stats = run_batch(prompts, io.StringIO(), client=client, concurrency=2,
+                          retries=2, backoff=0.001)
+        time.sleep(0.4)
+        
+        assert stats.failed == 4
+        assert model.max_active <= 2
+    
+    def test_bad_input_lines_are_reported(self):
+        """Test that unreadable lines fail on their own without aborting the run."""
+        source = io.StringIO('"first"\n{oops\n{"id": "x"}\n"last"\n')
+        sink = io.StringIO()
+        
+        stats = run_batch(read_prompts(source), sink, client=FlakyClient())
+        
+        results = {r["id"]: r for r in map(json.loads, sink.getvalue().splitlines())}
+        assert results[1]["response"] == "FIRST"
+        assert results[2]["error"].startswith("Invalid JSON on line 2")
+        assert results[3]["error"] == "No prompt on line 3"
+        assert results[4]["response"] == "LAST"
+        assert stats.succeeded == 2 and stats.failed == 2
+
+
+
+class TestResponseCache:
+    """Tests for the content-addressed response cache."""
+    
+    def test_key_covers_all_fields(self):
+        """Test that every request field changes the key."""
+        base = cache_key("gpt-4", "Be brief", "hello", 0.7)
+        
+        assert base == cache_key("gpt-4", "Be brief", "hello", 0.7)
+        assert base != cache_key("gpt-3.5", "Be brief", "hello", 0.7)
+        assert base != cache_key("gpt-4", None, "hello", 0.7)
+        assert base != cache_key("gpt-4", "Be brief", "hello!", 0.7)
+        assert base != cache_key("gpt-4", "Be brief", "hello", 0.0)
+    
+    def test_memory_backend_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        backend = MemoryBackend(max_entries=2)
+        backend.set("a", "1")
+        backend.set("b", "2")
+        backend.get("a")
+        backend.set("c", "3")
+        
+        assert backend.get("a") == "1"
+        assert backend.get("b") is None
+        assert backend.get("c") == "3"
+    
+    def test_memory_backend_size_eviction(self):
+        """Test that the total size limit is enforced."""
+        backend = MemoryBackend(max_bytes=10)
+        backend.set("a", "x" * 6)
+        backend.set("b", "y" * 6)
+        
+        assert backend.get("a") is None
+        assert backend.get("b") == "y" * 6
+    
+    def test_sqlite_backend_persists_and_evicts(self, tmp_path):
+        """Test persistence across instances and LRU eviction on disk."""
+        path = tmp_path / 'responses.sqlite'
+        backend = SQLiteBackend(path, max_entries=2)
+        backend.set("a", "1")
+        time.sleep(0.01)
+        backend.set("b", "2")
+        time.sleep(0.01)
+        backend.get("a")
+        time.sleep(0.01)
+        backend.set("c", "3")
+        backend.close()
+        
+        reopened = SQLiteBackend(path, max_entries=2)
+        assert reopened.get("a") == "1"
+        assert reopened.get("b") is None
+        assert reopened.get("c") == "3"
+        assert len(reopened) == 2
+        reopened.close()
+    
+    def test_sqlite_eviction_keeps_running_totals(self, tmp_path):
+        """Test count and size limits with replaced entries and a reopened file."""
+        path = tmp_path / 'responses.sqlite'
+        backend = SQLiteBackend(path, max_entries=100, max_bytes=50)
+        for index in range(10):
+            backend.set(f"k{index}", "x" * 10)
+        backend.set("k9", "y" * 20)
+        
+        assert len(backend) == 4
+        assert backend.get("k5") is None
+        assert backend.get("k6") == "x" * 10
+        assert (backend._count, backend._size) == (4, 50)
+        backend.close()
+        
+        reopened = SQLiteBackend(path, max_entries=2, max_bytes=50)
+        reopened.set("new", "z")
+        assert len(reopened) == 2
+        assert reopened.get("k9") is None
+        assert reopened.get("k6") == "x" * 10
+        assert (reopened._count, reopened._size) == (2, 11)
+        reopened.close()
+    
+    def test_default_model_is_resolved_for_the_key(self):
+        """Test that responses of the old default model are not reused."""
+        cache = ResponseCache()
+        models = iter([MagicMock(model_id="gpt-4o"), MagicMock(model_id="claude-3")])
+        
+        def loader(name):
+            model = next(models)
+            model.prompt.return_value.text.return_value = model.model_id
+            return model
+        
+        assert LLMClient(mode="python", model_loader=loader, cache=cache).prompt("hi") == "gpt-4o"
+        assert LLMClient(mode="python", model_loader=loader, cache=cache).prompt("hi") == "claude-3"
+    
+    @patch('subprocess.run')
+    def test_cli_default_model_is_resolved_once(self, mock_run):
+        """Test that cli mode asks llm for the default model id once."""
+        mock_run.side_effect = [
+            MagicMock(returncode=0, stdout="gpt-4o-mini\n", stderr=""),
+            MagicMock(returncode=0, stdout="answer\n", stderr=""),
+        ]
+        client = LLMClient(mode="cli", cache=ResponseCache())
+        
+        assert client.prompt("hello") == client.prompt("hello") == "answer"
+        assert mock_run.call_args_list[0][0][0] == ["llm", "models", "default"]
+        assert mock_run.call_count == 2
+    
+    def test_client_skips_provider_on_hit(self):
+        """Test that a cached response does not reach the model."""
+        model = StubModel()
+        cache = ResponseCache()
+        client = LLMClient("stub", mode="python", model_loader=lambda name: model, cache=cache)
+        
+        first = client.prompt("hello", system="Be brief", temperature=0.2)
+        second = client.prompt("hello", system="Be brief", temperature=0.2)
+        client.prompt("hello", system="Be brief", temperature=0.9)
+        
+        assert first == second == "reply: hello"
+        assert len(model.prompts) == 2
+        assert cache.stats() == {"hits": 1, "misses": 2, "hit_rate": 0.333, "entries": 2}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,221 @@
+"""
+Tests for post-authentication setup helpers.
+"""
+
+import asyncio
+import json
+import sys
+import time
+import threading
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+from task_scheduler import Task, run_tasks
+from post_auth_setup import format_table, run_command, setup_azure_resources
+from command_runner import run_command_async, run_commands
+
+
+SUBSCRIPTIONS = [
+    {
+        "cloudName": "AzureCloud", "environmentName": "AzureCloud", "homeTenantId": "tenant-1",
+        "id": "sub-1", "isDefault": False, "name": "Production", "state": "Enabled",
+        "tenantId": "tenant-1"
+    },
+    {
+        "cloudName": "AzureCloud", "environmentName": "AzureCloud", "homeTenantId": "tenant-1",
+        "id": "sub-2", "isDefault": True, "name": "Development", "state": "Enabled",
+        "tenantId": "tenant-1"
+    },
+]
+
+
+class TestTaskScheduler:
+    """Tests for the dependency-aware task scheduler."""
+    
+    def test_independent_tasks_run_concurrently(self):
+        """Test that tasks without dependencies are started together."""
+        barrier = threading.Barrier(3, timeout=2)
+        
+        def task():
+            barrier.wait()
+            return True
+        
+        results = run_tasks([Task("A", task), Task("B", task), Task("C", task)])
+        
+        assert [result.name for result in results] == ["A", "B", "C"]
+        assert all(result.ok for result in results)
+    
+    def test_dependencies_run_first(self):
+        """Test that a task only starts after its dependencies finished."""
+        order = []
+        
+        def record(name):
+            def task():
+                order.append(name)
+                return True
+            return task
+        
+        run_tasks([
+            Task("Data Download", record("Data Download"), depends_on=["Workspace"]),
+            Task("Workspace", record("Workspace")),
+        ])
+        
+        assert order == ["Workspace", "Data Download"]
+    
+    def test_failed_dependency_skips_dependents(self):
+        """Test that dependents of a failed task are skipped, transitively."""
+        ran = []
+        
+        def task():
+            ran.append(True)
+            return True
+        
+        results = run_tasks([
+            Task("Workspace", lambda: False),
+            Task("Data Download", task, depends_on=["Workspace"]),
+            Task("Training", task, depends_on=["Data Download"]),
+        ])
+        
+        assert not ran
+        assert [result.ok for result in results] == [False, False, False]
+        assert results[1].skipped and results[2].skipped
+        assert "Workspace" in results[1].error
+    
+    def test_exception_is_reported(self, capsys):
+        """Test that an exception fails only the raising task."""
+        def broken():
+            raise RuntimeError("boom")
+        
+        results = run_tasks([Task("Broken", broken), Task("Fine", lambda: True)])
+        
+        assert results[0].ok is False
+        assert results[0].error == "boom"
+        assert results[1].ok is True
+        assert "[Broken] ❌ Error in Broken: boom" in capsys.readouterr().out
+    
+    def test_task_output_is_prefixed(self, capsys):
+        """Test that task output is emitted line by line with the task name."""
+        def task(label):
+            print(f"hello from {label}")
+            return True
+        
+        run_tasks([Task("One", task)], args=("one",))
+        
+        assert "[One] hello from one" in capsys.readouterr().out
+    
+    def test_invalid_graph(self):
+        """Test that unknown dependencies and cycles are rejected."""
+        with pytest.raises(ValueError):
+            run_tasks([Task("A", lambda: True, depends_on=["Missing"])])
+        with pytest.raises(ValueError):
+            run_tasks([
+                Task("A", lambda: True, depends_on=["B"]),
+                Task("B", lambda: True, depends_on=["A"]),
+            ])
+
+
+
+class TestAzureResources:
+    """Tests for the Azure resources setup task."""
+    
+    @patch('subprocess.run')
+    def test_single_az_invocation(self, mock_run, capsys):
+        """Test that both subscription views come from one az call."""
+        mock_run.return_value = MagicMock(returncode=0, stdout=json.dumps(SUBSCRIPTIONS), stderr='')
+        
+        assert setup_azure_resources() is True
+        
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0] == ['az', 'account', 'list', '--output', 'json']
+        output = capsys.readouterr().out
+        assert "Production" in output
+        current_view = output.split("Showing current Azure subscription")[1]
+        assert "Development" in current_view
+        assert "Production" not in current_view
+    
+    @patch('subprocess.run')
+    def test_list_failure(self, mock_run):
+        """Test that a failing az account list fails the task."""
+        mock_run.return_value = MagicMock(returncode=1, stdout='', stderr='Please run az login')
+        
+        assert setup_azure_resources() is False
+    
+    def test_format_table(self):
+        """Test table rendering with aligned columns."""
+        table = format_table(
+            [{"name": "Dev", "user": {"name": "a@b.c"}}, {"name": "Production"}],
+            [("Name", "name"), ("User", "user.name")]
+        )
+        
+        assert table.splitlines() == [
+            "Name        User",
+            "----------  -----",
+            "Dev         a@b.c",
+            "Production",
+        ]
+
+
+
+class TestCommandRunner:
+    """Tests for the streaming command runner."""
+    
+    def test_output_is_streamed(self, capsys):
+        """Test that stdout lines are printed as the command produces them."""
+        script = "import sys; print('first'); sys.stdout.flush(); print('second')"
+        
+        assert run_command([sys.executable, '-c', script], "Streaming") is True
+        
+        output = capsys.readouterr().out
+        assert "│ first" in output
+        assert "│ second" in output
+        assert "✅ Success" in output
+    
+    def test_tail_is_bounded(self):
+        """Test that only the last lines of output are kept."""
+        script = "import sys\nfor i in range(1000): print(i); print(i, file=sys.stderr)\nsys.exit(2)"
+        
+        result = asyncio.run(run_command_async(
+            [sys.executable, '-c', script], "Noisy", tail_lines=5, echo=False
+        ))
+        
+        assert result.ok is False
+        assert result.returncode == 2
+        assert result.stdout_tail == ['995', '996', '997', '998', '999']
+        assert result.stderr_tail == ['995', '996', '997', '998', '999']
+    
+    def test_timeout_kills_command(self):
+        """Test that a command exceeding its timeout is killed."""
+        result = asyncio.run(run_command_async(
+            [sys.executable, '-c', 'import time; time.sleep(10)'], "Sleeping",
+            timeout=0.5, echo=False
+        ))
+        
+        assert result.timed_out is True
+        assert result.ok is False
+        assert result.elapsed < 5
+    
+    def test_missing_command(self, capsys):
+        """Test that a missing executable is reported as an error."""
+        assert run_command(['definitely-not-a-command-le2'], "Missing") is False
+        assert "❌ Error" in capsys.readouterr().out
+    
+    def test_run_commands_shares_limit(self):
+        """Test that the shared limit caps how many commands run at once."""
+        command = [sys.executable, '-c', 'import time; time.sleep(0.3)']
+        
+        start = time.monotonic()
+        results = asyncio.run(run_commands(
+            [(command, f"Sleep {i}") for i in range(4)], limit=2, echo=False
+        ))
+        elapsed = time.monotonic() - start
+        
+        assert all(result.ok for result in results)
+        assert elapsed >= 0.6
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
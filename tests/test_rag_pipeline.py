@@ -0,0 +1,505 @@
+"""
+Tests for the RAG indexing pipeline.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+import pytest
+
+# Add examples directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'examples'))
+
+from embedding_batches import BatchedEmbeddings, estimate_tokens
+
+from rag_pipeline import (
+    CachedEmbeddings,
+    Chunk,
+    EmbeddingCache,
+    FakeEmbeddings,
+    content_hash,
+    file_hash,
+    iter_chunks,
+    iter_split,
+    load_chunks,
+    load_manifest,
+    plan_ingest,
+    save_manifest,
+    split_text
+)
+
+
+def make_text(paragraphs, words=40):
+    """Build a document with distinct paragraphs."""
+    return "\n\n".join(
+        " ".join(f"p{p}w{w}" for w in range(words)) for p in range(paragraphs)
+    )
+
+
+class TestSplitText:
+    """Tests for the chunk splitter."""
+
+    def test_chunks_cover_text(self):
+        """Test offsets and sizes of the chunks."""
+        text = make_text(20)
+        chunks = split_text(text, chunk_size=300, overlap=30)
+
+        assert chunks[0][0] == 0
+        assert all(len(piece) <= 300 for _, piece in chunks)
+        assert all(text[start:start + len(piece)] == piece for start, piece in chunks)
+        assert chunks[-1][0] + len(chunks[-1][1]) == len(text)
+
+    def test_prefers_paragraph_boundaries(self):
+        """Test that chunks end at paragraph breaks when possible."""
+        chunks = split_text(make_text(10, words=20), chunk_size=400, overlap=0)
+
+        assert all(piece.endswith("\n\n") for _, piece in chunks[:-1])
+
+
+class TestStreamingSplit:
+    """Tests for the incremental splitter."""
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64, 1000, 100000])
+    def test_matches_whole_text_split(self, block_size):
+        """Test that block boundaries do not change the chunks."""
+        rng = random.Random(block_size)
+        text = "".join(rng.choice(["word ", "longerword ", "\n", "\n\n", "x"]) for _ in range(5000))
+        blocks = [text[i:i + block_size] for i in range(0, len(text), block_size)]
+
+        streamed = list(iter_split(blocks, chunk_size=200, overlap=20))
+
+        assert streamed == split_text(text, chunk_size=200, overlap=20)
+        assert all(text[start:start + len(piece)] == piece for start, piece in streamed)
+
+    def test_consumes_input_lazily(self):
+        """Test that the first chunk is produced from a bounded prefix."""
+        consumed = []
+
+        def endless_blocks():
+            while True:
+                consumed.append(1)
+                yield "lorem ipsum dolor sit amet\n" * 10
+
+        first_start, first_piece = next(iter_split(endless_blocks(), chunk_size=500, overlap=50))
+
+        assert first_start == 0 and len(first_piece) <= 500
+        assert len(consumed) <= 3
+
+    def test_file_chunks_and_hash(self, tmp_path):
+        """Test reading a file in blocks."""
+        path = tmp_path / 'doc.txt'
+        text = make_text(50)
+        path.write_text(text, encoding='utf-8')
+
+        chunks = list(iter_chunks(path, "doc", chunk_size=300, overlap=30))
+
+        assert [(chunk.start, chunk.text) for chunk in chunks] == split_text(text, 300, 30)
+        assert {chunk.source for chunk in chunks} == {"doc"}
+        assert file_hash(path, block_size=100) == content_hash(text)
+
+
+class TestFakeEmbeddings:
+    """Tests for the deterministic embedding model."""
+
+    def test_deterministic(self):
+        """Test that equal texts get equal unit vectors."""
+        model = FakeEmbeddings(dimensions=16)
+        first, second, other = model.embed_documents(["a", "a", "b"])
+
+        assert first == second != other
+        assert len(first) == 16
+        assert sum(value * value for value in first) == pytest.approx(1.0)
+
+
+class TestCachedEmbeddings:
+    """Tests for the persistent embedding cache."""
+
+    def test_rerun_embeds_only_changed_chunks(self, tmp_path):
+        """Test that a second run only embeds new texts."""
+        model = FakeEmbeddings()
+        cache = EmbeddingCache(tmp_path / 'embeddings.sqlite')
+        embeddings = CachedEmbeddings(model, cache, "fake")
+
+        first = embeddings.embed_documents(["one", "two", "three"])
+        second = embeddings.embed_documents(["one", "two", "changed"])
+
+        assert model.embedded == 4
+        assert second[0] == pytest.approx(first[0], abs=1e-6)
+        assert second[1] == pytest.approx(first[1], abs=1e-6)
+        assert embeddings.hits == 2
+        cache.close()
+
+    def test_cache_persists_between_runs(self, tmp_path):
+        """Test that vectors survive reopening the cache."""
+        path = tmp_path / 'embeddings.sqlite'
+        cache = EmbeddingCache(path)
+        CachedEmbeddings(FakeEmbeddings(), cache, "fake").embed_documents(["persisted"])
+        cache.close()
+
+        model = FakeEmbeddings()
+        cache = EmbeddingCache(path)
+        vector = CachedEmbeddings(model, cache, "fake").embed_documents(["persisted"])[0]
+
+        assert model.embedded == 0
+        assert vector == pytest.approx(model.embed_query("persisted"), abs=1e-6)
+        cache.close()
+
+    def test_models_do_not_share_vectors(self, tmp_path):
+        """Test that the cache is namespaced by model."""
+        cache = EmbeddingCache(tmp_path / 'embeddings.sqlite')
+        CachedEmbeddings(FakeEmbeddings(), cache, "model-a").embed_documents(["text"])
+
+        model = FakeEmbeddings()
+        CachedEmbeddings(model, cache, "model-b").embed_documents(["text"])
+
+        assert model.embedded == 1
+        cache.close()
+
+
+class ProviderError(Exception):
+    """Stand-in for an HTTP error raised by an embeddings client."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class ScriptedEmbeddings(FakeEmbeddings):
+    """FakeEmbeddings recording requests and failing on demand."""
+
+    def __init__(self, payload_limit=None, rate_limits=0, delay=0.0):
+        super().__init__(dimensions=8)
+        self.payload_limit = payload_limit
+        self.rate_limits = rate_limits
+        self.delay = delay
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        with self._lock:
+            self.requests.append(list(texts))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            throttled = self.rate_limits > 0
+            self.rate_limits -= throttled
+        try:
+            time.sleep(self.delay)
+            if throttled:
+                raise ProviderError(429)
+            if self.payload_limit and sum(len(text.split()) for text in texts) > self.payload_limit:
+                raise ProviderError(413)
+            return super().embed_documents(texts)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def word_count(text):
+    return len(text.split())
+
+
+class TestBatchedEmbeddings:
+    """Tests for token-budgeted, adaptive embedding batches."""
+
+    TEXTS = [" ".join(["word"] * (5 + i % 7)) + f" {i}" for i in range(200)]
+
+    def test_batches_respect_budget_and_order(self):
+        """Test request sizes and result order."""
+        model = ScriptedEmbeddings()
+        batcher = BatchedEmbeddings(model, max_tokens=50, max_items=8, count_tokens=word_count)
+
+        vectors = batcher.embed_documents(self.TEXTS)
+
+        assert vectors == FakeEmbeddings(dimensions=8).embed_documents(self.TEXTS)
+        assert all(sum(map(word_count, request)) <= 50 for request in model.requests)
+        assert all(len(request) <= 8 for request in model.requests)
+        assert batcher.metrics.chunks == 200
+        assert batcher.metrics.tokens == sum(map(word_count, self.TEXTS))
+
+    def test_requests_run_concurrently(self):
+        """Test that up to `concurrency` requests are in flight."""
+        model = ScriptedEmbeddings(delay=0.01)
+        batcher = BatchedEmbeddings(model, max_tokens=40, concurrency=4, count_tokens=word_count)
+
+        batcher.embed_documents(self.TEXTS)
+
+        assert 1 < model.max_active <= 4
+
+    def test_rate_limit_shrinks_budget_and_backs_off(self):
+        """Test recovery from 429 responses."""
+        model = ScriptedEmbeddings(rate_limits=2)
+        sleeps = []
+        batcher = BatchedEmbeddings(model, max_tokens=4000, concurrency=1, backoff=0.5,
+                                    count_tokens=word_count, sleep=sleeps.append)
+
+        vectors = batcher.embed_documents(self.TEXTS)
+
+        assert None not in vectors
+        assert sleeps == [0.5, 1.0]
+        assert batcher.budget < 4000
+        assert batcher.metrics.rate_limited == 2
+
+    def test_payload_error_splits_batches(self):
+        """Test that 413 responses shrink batches until they fit."""
+        model = ScriptedEmbeddings(payload_limit=30)
+        batcher = BatchedEmbeddings(model, max_tokens=100000, max_items=1000, concurrency=1,
+                                    count_tokens=word_count)
+
+        vectors = batcher.embed_documents(self.TEXTS)
+
+        assert vectors == FakeEmbeddings(dimensions=8).embed_documents(self.TEXTS)
+        assert batcher.metrics.payload_errors > 0
+        assert batcher.budget <= 30
+
+    def test_budget_recovers_after_rate_limits(self):
+        """Test that the budget grows back to max_tokens once requests succeed."""
+        model = ScriptedEmbeddings(rate_limits=2)
+        batcher = BatchedEmbeddings(model, max_tokens=1000, concurrency=1, count_tokens=word_count,
+                                    sleep=lambda delay: None)
+        texts = self.TEXTS * 10
+
+        batcher.embed_documents(texts)
+        sizes = [sum(map(word_count, request)) for request in model.requests]
+
+        assert max(sizes[2:6]) < 300
+        assert batcher.budget == 1000
+        assert max(sizes[-5:]) > 900
+
+    def test_payload_limit_caps_growth(self):
+        """Test that the budget does not grow back past a payload error."""
+        model = ScriptedEmbeddings(payload_limit=300)
+        batcher = BatchedEmbeddings(model, max_tokens=1000, concurrency=1, count_tokens=word_count)
+
+        batcher.embed_documents(self.TEXTS * 10)
+
+        assert batcher.metrics.payload_errors == 2
+        assert batcher.budget <= 300
+
+    def test_retry_budget_is_per_batch(self):
+        """Test that concurrent 429 waves do not share one retry budget."""
+        model = ScriptedEmbeddings(rate_limits=8, delay=0.02)
+        batcher = BatchedEmbeddings(model, max_tokens=40, concurrency=4, retries=5,
+                                    count_tokens=word_count, sleep=lambda delay: None)
+
+        vectors = batcher.embed_documents(self.TEXTS)
+
+        assert None not in vectors
+        assert batcher.metrics.rate_limited == 8
+
+    def test_persistent_rate_limit_raises(self):
+        """Test giving up after too many rate limits of one batch."""
+        model = ScriptedEmbeddings(rate_limits=100)
+        batcher = BatchedEmbeddings(model, retries=3, concurrency=2,
+                                    count_tokens=word_count, sleep=lambda delay: None)
+
+        with pytest.raises(ProviderError):
+            batcher.embed_documents(self.TEXTS)
+
+    def test_throughput_metrics(self):
+        """Test chunks/sec and tokens/sec reporting."""
+        batcher = BatchedEmbeddings(ScriptedEmbeddings(delay=0.005), count_tokens=word_count)
+        batcher.embed_documents(self.TEXTS)
+        summary = batcher.metrics.summary()
+
+        assert summary["chunks"] == 200
+        assert summary["chunks_per_sec"] > 0
+        assert summary["tokens_per_sec"] > summary["chunks_per_sec"]
+
+    def test_estimate_tokens(self):
+        """Test the token estimate."""
+        assert estimate_tokens("") >= 1
+        assert estimate_tokens("hello world " * 100) > estimate_tokens("hello world")
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """A small knowledge base directory."""
+    root = tmp_path / 'docs'
+    (root / 'nested').mkdir(parents=True)
+    (root / 'a.md').write_text(make_text(5), encoding='utf-8')
+    (root / 'b.txt').write_text(make_text(3), encoding='utf-8')
+    (root / 'nested' / 'c.md').write_text(make_text(4), encoding='utf-8')
+    (root / 'image.png').write_bytes(b'\x89PNG')
+    return root
+
+
+class TestIngestPlan:
+    """Tests for manifest-based change detection."""
+
+    def test_first_run_indexes_everything(self, corpus):
+        """Test that all text files are new on the first run."""
+        plan = plan_ingest([corpus], {})
+
+        assert plan.counts == {"new": 3, "changed": 0, "unchanged": 0, "removed": 0}
+        assert plan.stale_ids == []
+        assert sorted(path.name for path in plan.to_index) == ['a.md', 'b.txt', 'c.md']
+
+    def test_unchanged_files_are_skipped(self, corpus):
+        """Test that a second run has nothing to do."""
+        first = plan_ingest([corpus], {})
+        second = plan_ingest([corpus], first.files)
+
+        assert second.counts["unchanged"] == 3
+        assert second.to_index == [] and second.stale_ids == []
+
+    def test_touched_file_with_same_content_is_unchanged(self, corpus):
+        """Test that an mtime change alone does not re-index a file."""
+        first = plan_ingest([corpus], {})
+        stat = (corpus / 'a.md').stat()
+        os.utime(corpus / 'a.md', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        second = plan_ingest([corpus], first.files)
+
+        assert second.counts["unchanged"] == 3
+        assert second.to_index == []
+        assert second.files[str((corpus / 'a.md').resolve())]['mtime'] == stat.st_mtime_ns + 10**9
+
+    def test_changed_and_removed_files(self, corpus):
+        """Test re-indexing of changed files and deletion of removed ones."""
+        first = plan_ingest([corpus], {})
+        a_key = str((corpus / 'a.md').resolve())
+        b_key = str((corpus / 'b.txt').resolve())
+        first.files[a_key]['chunks'] = ['a1', 'a2']
+        first.files[b_key]['chunks'] = ['b1']
+        (corpus / 'a.md').write_text(make_text(6), encoding='utf-8')
+        (corpus / 'b.txt').unlink()
+
+        second = plan_ingest([corpus], first.files)
+
+        assert second.counts == {"new": 0, "changed": 1, "unchanged": 1, "removed": 1}
+        assert sorted(second.stale_ids) == ['a1', 'a2', 'b1']
+        assert second.to_index == [corpus / 'a.md']
+        assert b_key not in second.files
+
+    def test_manifest_round_trip(self, corpus, tmp_path):
+        """Test that the manifest is saved and reloaded."""
+        plan = plan_ingest([corpus], {})
+        save_manifest(tmp_path / 'index', plan.files)
+
+        assert load_manifest(tmp_path / 'index') == plan.files
+        assert load_manifest(tmp_path / 'missing') == {}
+
+
+class TestFaissIndex:
+    """Tests for the on-disk FAISS index."""
+
+    @pytest.fixture(autouse=True)
+    def require_faiss(self):
+        pytest.importorskip('faiss')
+        pytest.importorskip('langchain_community.vectorstores')
+
+    def test_index_is_updated_in_place(self, tmp_path):
+        """Test add/keep/remove counts across runs."""
+        from rag_pipeline import update_index
+
+        doc = tmp_path / 'doc.txt'
+        doc.write_text(make_text(30), encoding='utf-8')
+        model = FakeEmbeddings()
+        cache = EmbeddingCache(tmp_path / 'embeddings.sqlite')
+        embeddings = CachedEmbeddings(model, cache, "fake")
+        index_dir = tmp_path / 'index'
+
+        chunks = load_chunks([doc], chunk_size=300, overlap=0)
+        first = update_index(chunks, embeddings, index_dir)
+        rerun = update_index(chunks, embeddings, index_dir)
+        changed = update_index(chunks[:-1] + [Chunk(str(doc), 10**6, "new text")],
+                               embeddings, index_dir)
+
+        assert first["added"] == len(chunks)
+        assert rerun == {**rerun, "added": 0, "removed": 0, "kept": len(chunks)}
+        assert (changed["added"], changed["removed"]) == (1, 1)
+        assert model.embedded == len(chunks) + 1
+        assert changed["store"].similarity_search("new text", k=1)[0].page_content == "new text"
+        cache.close()
+
+    def test_reloaded_index_answers_queries(self, corpus, tmp_path, caplog):
+        """Test that stores built from and reloaded with our wrappers can be searched."""
+        from rag_pipeline import ingest, load_index
+
+        cache = EmbeddingCache(tmp_path / 'embeddings.sqlite')
+        embeddings = CachedEmbeddings(FakeEmbeddings(), cache, "fake")
+        index_dir = tmp_path / 'index'
+        query = next(iter_chunks(corpus / 'b.txt', chunk_size=300)).text
+
+        ingest([corpus], embeddings, index_dir, chunk_size=300)
+        store = load_index(index_dir, embeddings)
+
+        assert store.similarity_search(query, k=1)[0].page_content == query
+        assert "embedding_function" not in caplog.text
+        cache.close()
+
+    def test_ingest_deletes_vectors_of_removed_files(self, corpus, tmp_path):
+        """Test incremental ingestion against the real index."""
+        from rag_pipeline import ingest
+
+        model = FakeEmbeddings()
+        cache = EmbeddingCache(tmp_path / 'embeddings.sqlite')
+        embeddings = CachedEmbeddings(model, cache, "fake")
+        index_dir = tmp_path / 'index'
+
+        first = ingest([corpus], embeddings, index_dir, chunk_size=300)
+        (corpus / 'b.txt').unlink()
+        second = ingest([corpus], embeddings, index_dir, chunk_size=300)
+        third = ingest([corpus], embeddings, index_dir, chunk_size=300)
+
+        assert first["new"] == 3
+        assert second["removed"] == 1 and second["chunks_added"] == 0
+        store = second["store"]
+        assert len(store.index_to_docstore_id) == first["chunks_added"] - second["chunks_removed"]
+        assert third["unchanged"] == 2 and third["chunks_removed"] == 0
+        cache.close()
+
+    def test_index_without_manifest_is_rebuilt(self, corpus, tmp_path):
+        """Test recovery when the manifest is lost but the index remains."""
+        from rag_pipeline import MANIFEST_NAME, ingest
+
+        model = FakeEmbeddings()
+        cache = EmbeddingCache(tmp_path / 'embeddings.sqlite')
+        embeddings = CachedEmbeddings(model, cache, "fake")
+        index_dir = tmp_path / 'index'
+
+        first = ingest([corpus], embeddings, index_dir, chunk_size=300)
+        embedded = model.embedded
+        (index_dir / MANIFEST_NAME).unlink()
+        (corpus / 'b.txt').unlink()
+        second = ingest([corpus], embeddings, index_dir, chunk_size=300)
+        third = ingest([corpus], embeddings, index_dir, chunk_size=300)
+
+        assert second["new"] == 2 and second["chunks_removed"] == first["chunks_added"]
+        assert len(second["store"].index_to_docstore_id) == second["chunks_added"]
+        assert third["unchanged"] == 2 and third["chunks_added"] == third["chunks_removed"] == 0
+        assert model.embedded == embedded
+        cache.close()
+
+    def test_manifest_behind_index(self, corpus, tmp_path):
+        """Test recovery from a run interrupted between saving the index and the manifest."""
+        from rag_pipeline import ingest, load_manifest, save_manifest
+
+        cache = EmbeddingCache(tmp_path / 'embeddings.sqlite')
+        embeddings = CachedEmbeddings(FakeEmbeddings(), cache, "fake")
+        index_dir = tmp_path / 'index'
+
+        ingest([corpus], embeddings, index_dir, chunk_size=300)
+        old_manifest = load_manifest(index_dir)
+        (corpus / 'a.md').write_text(make_text(7), encoding='utf-8')
+        (corpus / 'b.txt').unlink()
+        (corpus / 'd.md').write_text(make_text(2), encoding='utf-8')
+        ingest([corpus], embeddings, index_dir, chunk_size=300)
+        save_manifest(index_dir, old_manifest)
+
+        rerun = ingest([corpus], embeddings, index_dir, chunk_size=300)
+        final = ingest([corpus], embeddings, index_dir, chunk_size=300)
+
+        expected = sum(len(entry['chunks']) for entry in load_manifest(index_dir).values())
+        assert len(rerun["store"].index_to_docstore_id) == expected
+        assert final["unchanged"] == 3 and final["chunks_added"] == final["chunks_removed"] == 0
+        cache.close()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
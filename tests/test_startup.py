@@ -0,0 +1,38 @@
+"""
+Tests for the startup time of the example entry points.
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Add benchmarks directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'benchmarks'))
+
+from bench_startup import ENTRY_POINTS, import_time, measure
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       812 |       1530 |   result_writers
+import time:       371 |      24839 | azure_ai_example
+"""
+
+
+def test_import_time_parses_top_level_module():
+    """Test reading the cumulative time of the entry point, not a nested import."""
+    assert import_time(IMPORTTIME_OUTPUT, 'azure_ai_example') == pytest.approx(24.839)
+    assert import_time(IMPORTTIME_OUTPUT, 'result_writers') is None
+
+
+@pytest.mark.parametrize("entry_point", sorted(ENTRY_POINTS))
+def test_entry_point_imports_no_heavy_sdk(entry_point):
+    """Test that importing an entry point leaves the SDKs to the code paths using them."""
+    elapsed, heavy = measure(entry_point)
+
+    assert elapsed is not None, f"{entry_point} failed to import"
+    assert heavy == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,177 @@
+"""
+Tests for the environment verification script.
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+import pytest
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+
+import verify_environment
+from verify_environment import (
+    CommandStatus,
+    PackageStatus,
+    check_commands,
+    check_packages,
+    find_spec,
+    format_command,
+    format_package,
+    main,
+    package_version,
+    verify
+)
+
+
+@pytest.fixture
+def fake_tools(tmp_path, monkeypatch):
+    """A PATH holding only stub CLIs; returns a function adding one."""
+    monkeypatch.setenv('PATH', str(tmp_path))
+
+    def add(name, script):
+        tool = tmp_path / name
+        tool.write_text(f"#!{sys.executable}\nimport sys, time\n{script}\n")
+        tool.chmod(0o755)
+        return str(tool)
+
+    return add
+
+
+@pytest.fixture
+def namespace_package(tmp_path, monkeypatch):
+    """A namespace package 'nsdemo' with a subpackage that fails on import."""
+    package = tmp_path / 'nsdemo' / 'tools'
+    package.mkdir(parents=True)
+    (package / '__init__.py').write_text("raise RuntimeError('imported')\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield 'nsdemo.tools'
+    for name in ('nsdemo', 'nsdemo.tools'):
+        sys.modules.pop(name, None)
+
+
+class TestPackageChecks:
+    """Tests for resolving packages without importing them."""
+
+    def test_finds_packages_without_importing_them(self, namespace_package):
+        """Test that neither the package nor its parent is imported."""
+        assert find_spec(namespace_package) is not None
+        assert 'nsdemo' not in sys.modules
+        assert 'nsdemo.tools' not in sys.modules
+
+    def test_missing_packages(self, namespace_package):
+        """Test missing top-level and nested names."""
+        assert find_spec('no_such_package_le2') is None
+        assert find_spec('nsdemo.missing') is None
+        assert find_spec('json.missing') is None
+
+    def test_versions_from_metadata(self):
+        """Test versions of a distribution and of a standard library module."""
+        assert package_version('pytest') == pytest.__version__
+        assert package_version('json') is None
+
+    def test_namespace_package_prefers_matching_distribution(self, monkeypatch):
+        """Test that azure.identity maps to azure-identity, not another azure-* package."""
+        versions = {'azure-core': '1.30.0', 'azure-identity': '1.15.0', 'PyYAML': '6.0.1'}
+        monkeypatch.setattr(verify_environment.metadata, 'version', lambda dist: versions[dist])
+        distributions = {'azure': ['azure-core', 'azure-identity'], 'yaml': ['PyYAML']}
+
+        assert package_version('azure.identity', distributions) == '1.15.0'
+        assert package_version('yaml', distributions) == '6.0.1'
+
+    def test_report_lines(self):
+        """Test the verify_setup.sh report format."""
+        installed = format_package(PackageStatus('pytest', True, '8.0.0'))
+        missing = format_package(PackageStatus('numpy', False))
+
+        assert installed == "\033[0;32m✓\033[0m Python package 'pytest' is installed\n  Version: 8.0.0"
+        assert missing == "\033[0;31m✗\033[0m Python package 'numpy' is NOT installed"
+
+    def test_exit_status_counts_missing_packages(self, capsys):
+        """Test that main() returns the number of missing packages."""
+        assert [status.installed for status in check_packages(['json', 'no_such_package_le2'])] == [True, False]
+        assert main(['json', 'pytest', 'no_such_package_le2', 'no.such.module']) == 2
+        assert "Python package 'no.such.module' is NOT installed" in capsys.readouterr().out
+
+
+
+class TestCommandChecks:
+    """Tests for the concurrent command probes."""
+
+    def test_probes_run_concurrently(self, fake_tools):
+        """Test that three slow probes take about as long as one."""
+        for name in ('slow1', 'slow2', 'slow3'):
+            fake_tools(name, f"time.sleep(0.4); print('{name} 1.0')")
+
+        start = time.perf_counter()
+        results = check_commands(['slow1', 'slow2', 'slow3'])
+        elapsed = time.perf_counter() - start
+
+        assert [status.version for status in results] == ['slow1 1.0', 'slow2 1.0', 'slow3 1.0']
+        assert elapsed < 1.0
+
+    def test_per_tool_timeout(self, fake_tools):
+        """Test that a hanging probe is abandoned after its own timeout."""
+        fake_tools('hangs', "time.sleep(30)")
+        fake_tools('quick', "print('quick 2.0')")
+
+        start = time.perf_counter()
+        hangs, quick = check_commands(['hangs', 'quick'], timeouts={'hangs': 0.3})
+
+        assert time.perf_counter() - start < 5
+        assert hangs.installed and hangs.error == "timed out after 0.3s"
+        assert quick.version == 'quick 2.0'
+        assert format_command(hangs).endswith("Version: unknown (timed out after 0.3s)")
+
+    def test_missing_command_and_stderr_version(self, fake_tools):
+        """Test a command not on PATH and one printing its version on stderr."""
+        fake_tools('noisy', "print('noisy 3.1\\nbuild 42', file=sys.stderr)")
+
+        missing, noisy = check_commands(['not-installed', 'noisy'])
+
+        assert not missing.installed
+        assert format_command(missing) == "\033[0;31m✗\033[0m not-installed is NOT installed"
+        assert noisy.version == 'noisy 3.1'
+        assert format_command(noisy) == "\033[0;32m✓\033[0m noisy is installed\n  Version: noisy 3.1"
+
+
+class TestReport:
+    """Tests for the combined human and JSON report."""
+
+    def test_verify_counts_issues_in_section_order(self, fake_tools):
+        """Test that commands come first and issues cover both kinds."""
+        fake_tools('tool', "print('tool 1.0')")
+
+        report = verify([("Tools", ['tool', 'absent'])], [("Packages", ['json', 'no_such_package_le2'])])
+
+        assert [section["heading"] for section in report["sections"]] == ["Tools", "Packages"]
+        assert report["issues"] == 2
+        assert isinstance(report["sections"][0]["checks"][0], CommandStatus)
+
+    def test_json_report(self, fake_tools, tmp_path, capsys):
+        """Test that --json writes the report next to the human output."""
+        fake_tools('tool', "print('tool 1.0')")
+        path = tmp_path / 'report.json'
+
+        issues = main(['--command', 'tool', '--command', 'absent', 'json', '--json', str(path)])
+
+        data = json.loads(path.read_text())
+        assert issues == data["issues"] == 1
+        tool, absent = data["sections"][0]["checks"]
+        assert tool == {"type": "command", "name": "tool", "installed": True, "path": tool["path"],
+                        "version": "tool 1.0", "error": None, "seconds": tool["seconds"]}
+        assert absent["installed"] is False
+        assert data["sections"][1]["checks"] == [
+            {"type": "package", "name": "json", "installed": True, "version": None}]
+        assert "✓\033[0m tool is installed" in capsys.readouterr().out
+
+    def test_json_to_stdout(self, fake_tools, capsys):
+        """Test that --json - prints only the JSON report."""
+        assert main(['json', '--json', '-']) == 0
+        assert json.loads(capsys.readouterr().out)["sections"][0]["heading"] == "Checking Python Packages..."
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -14,7 +14,9 @@ GREEN='\033[0;32m'
 YELLOW='\033[1;33m'
 NC='\033[0m' # No Color
 
-# Function to check command existence
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# Function to check command existence (used when python is missing)
 check_command() {
     if command -v "$1" &> /dev/null; then
         echo -e "${GREEN}✓${NC} $1 is installed"
@@ -28,72 +30,28 @@ check_command() {
     fi
 }
 
-# Function to check Python package
-check_python_package() {
-    if python -c "import $1" &> /dev/null; then
-        echo -e "${GREEN}✓${NC} Python package '$1' is installed"
-        return 0
-    else
-        echo -e "${RED}✗${NC} Python package '$1' is NOT installed"
-        return 1
-    fi
-}
-
 # Counter for issues
 issues=0
 
-echo "Checking Base System..."
-echo "------------------------------------------------------"
-check_command "python" "version" || ((issues++))
-check_command "pip" "version" || ((issues++))
-check_command "dotnet" "version" || ((issues++))
-check_command "git" "version" || ((issues++))
-echo ""
-
-echo "Checking Azure Tools..."
-echo "------------------------------------------------------"
-check_command "az" "version" || ((issues++))
-echo ""
-
-echo "Checking AI/LLM Tools..."
-echo "------------------------------------------------------"
-check_command "llm" "version" || ((issues++))
-check_command "fabric" "version" || ((issues++))
-echo ""
-
-echo "Checking Python AI Libraries..."
-echo "------------------------------------------------------"
-check_python_package "openai" || ((issues++))
-check_python_package "anthropic" || ((issues++))
-check_python_package "langchain" || ((issues++))
-check_python_package "azure.ai.ml" || ((issues++))
-check_python_package "azure.ai.textanalytics" || ((issues++))
-check_python_package "azure.identity" || ((issues++))
-echo ""
-
-echo "Checking Data Science Libraries..."
-echo "------------------------------------------------------"
-check_python_package "numpy" || ((issues++))
-check_python_package "pandas" || ((issues++))
-check_python_package "sklearn" || ((issues++))
-check_python_package "matplotlib" || ((issues++))
-check_python_package "jupyter" || ((issues++))
-echo ""
-
-echo "Checking Development Tools..."
-echo "------------------------------------------------------"
-check_python_package "black" || ((issues++))
-check_python_package "pylint" || ((issues++))
-check_python_package "pytest" || ((issues++))
-check_python_package "mypy" || ((issues++))
-echo ""
-
-echo "Checking Additional Utilities..."
-echo "------------------------------------------------------"
-check_python_package "requests" || ((issues++))
-check_python_package "dotenv" || ((issues++))
-check_python_package "yaml" || ((issues++))
-echo ""
+# The verifier looks commands up on PATH and runs their version probes
+# concurrently, resolves Python packages without importing them, and exits
+# with the number of missing tools and packages. A JSON copy of the report
+# is written to workspace/.cache/verify_environment.json.
+if command -v python &> /dev/null; then
+    mkdir -p "$SCRIPT_DIR/workspace/.cache"
+    python "$SCRIPT_DIR/scripts/verify_environment.py" \
+        --json "$SCRIPT_DIR/workspace/.cache/verify_environment.json"
+    issues=$((issues + $?))
+else
+    echo "Checking Base System..."
+    echo "------------------------------------------------------"
+    for tool in python pip dotnet git az llm fabric; do
+        check_command "$tool" "version" || ((issues++))
+    done
+    echo -e "${RED}✗${NC} Python packages cannot be checked without python"
+    ((issues++))
+    echo ""
+fi
 
 echo "======================================================"
 if [ $issues -eq 0 ]; then